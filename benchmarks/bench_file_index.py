@@ -0,0 +1,52 @@
+"""Benchmark: cold walk vs FileIndex restart on an unchanged tree.
+
+Usage:
+    python benchmarks/bench_file_index.py [N_DIRS] [FILES_PER_DIR]
+"""
+
+from pathlib import Path
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from ctx_ui.config import AppConfig
+from ctx_ui.context.file_index import FileIndex
+from ctx_ui.context.indexer import list_repo_files
+from ctx_ui.storage.store import MetadataStore
+
+
+def main():
+    n_dirs = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    files_per_dir = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    config = AppConfig()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / 'repo'
+        for i in range(n_dirs):
+            d = root / f'pkg{i % 50}' / f'mod{i}'
+            d.mkdir(parents=True)
+            for j in range(files_per_dir):
+                (d / f'f{j}.py').write_text('')
+        past = time.time() - 60
+        for dirpath, _, _ in os.walk(root):
+            os.utime(dirpath, (past, past))
+        db = Path(tmp) / 'index.db'
+
+        def timed(label, fn):
+            start = time.perf_counter()
+            result = fn()
+            print(f'{label:>28}: {time.perf_counter() - start:7.3f}s  ({len(result):,} files)')
+
+        args = (root, config.index_include, config.index_exclude)
+        timed('list_repo_files (full walk)', lambda: list_repo_files(*args))
+        timed('FileIndex first scan', lambda: FileIndex(*args, MetadataStore(db)).scan())
+        index = FileIndex(*args, MetadataStore(db))
+        timed('FileIndex restart', index.scan)
+        timed('FileIndex rescan', index.scan)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""Micro-benchmark: rendering a huge file via full read vs memory-mapped head/tail excerpt.
+
+Usage:
+    python benchmarks/bench_head_tail.py [SIZE_MB]
+"""
+
+from pathlib import Path
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from ctx_ui.prompts import generators
+
+
+def make_log(path: Path, size: int):
+    """Write a log-like file of about ``size`` bytes."""
+    line = b'2024-01-01T00:00:00Z INFO request handled path=/api/items status=200 duration_ms=12\n'
+    block = line * 10_000
+    with open(path, 'wb') as f:
+        for _ in range(max(1, size // len(block))):
+            f.write(block)
+
+
+def run(path: Path, stream_min_bytes: int):
+    generators.STREAM_MIN_BYTES = stream_min_bytes
+    tracemalloc.start()
+    start = time.perf_counter()
+    block = generators._render_file_block(path.name, path)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return block, elapsed, peak
+
+
+def main():
+    size = int(float(sys.argv[1]) * 1_000_000) if len(sys.argv) > 1 else 300_000_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'huge.log'
+        make_log(path, size)
+        print(f'{path.stat().st_size / 1e6:.0f} MB file')
+
+        excerpt, elapsed, peak = run(path, 0)
+        print(f'{"mmap excerpt":>14}: {elapsed:6.2f}s  peak {peak / 1e6:8.1f} MB')
+        full, elapsed, peak = run(path, 10 ** 15)
+        print(f'{"full read":>14}: {elapsed:6.2f}s  peak {peak / 1e6:8.1f} MB')
+        assert excerpt == full, 'excerpt differs from the full read'
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Micro-benchmark: ImportGraph build, N-hop queries and incremental updates.
+
+Usage:
+    python benchmarks/bench_import_graph.py [N_MODULES]
+"""
+
+from pathlib import Path
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from ctx_ui.context.imports import ImportGraph
+from ctx_ui.context.changes import ChangeBatch
+
+PACKAGES = 100
+IMPORTS_PER_MODULE = 8
+
+
+def make_repo(root: Path, n: int, seed: int = 0) -> list:
+    """Write ``n`` modules in ``src/app/pkgNN`` packages importing each other."""
+    rng = random.Random(seed)
+    per_package = max(1, n // PACKAGES)
+    modules = [(i // per_package, i) for i in range(n)]
+    paths = [Path('src/app/__init__.py')]
+    (root / 'src/app').mkdir(parents=True)
+    (root / paths[0]).write_text('')
+    for package in range(PACKAGES):
+        (root / f'src/app/pkg{package:02d}').mkdir()
+        (root / f'src/app/pkg{package:02d}/__init__.py').write_text('')
+        paths.append(Path(f'src/app/pkg{package:02d}/__init__.py'))
+    for package, i in modules:
+        lines = ['"""Module docstring."""', 'import os', 'from typing import List']
+        for _ in range(IMPORTS_PER_MODULE):
+            other_package, other = rng.choice(modules)
+            if other_package == package:
+                lines.append(f'from .m{other} import thing')
+            elif rng.random() < 0.5:
+                lines.append(f'from ..pkg{other_package:02d}.m{other} import thing')
+            else:
+                lines.append(f'from app.pkg{other_package:02d} import m{other}')
+        lines += [f'def f{k}():\n    return {k}\n' for k in range(20)]
+        path = Path(f'src/app/pkg{package:02d}/m{i}.py')
+        (root / path).write_text('\n'.join(lines))
+        paths.append(path)
+    return paths
+
+
+def timed(label: str, fn, runs: int = 1):
+    start = time.perf_counter()
+    for _ in range(runs):
+        result = fn()
+    print(f'{label:>32}: {(time.perf_counter() - start) / runs * 1000:9.2f} ms')
+    return result
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        paths = make_repo(root, n)
+        past = time.time() - 60
+        for path in paths:
+            os.utime(root / path, (past, past))
+
+        graph = ImportGraph(root)
+        timed(f'build ({n:,} modules)', lambda: graph.apply(paths, []))
+        start = [paths[-1]]
+        for hops in (1, 2, 3):
+            found = timed(f'{hops}-hop dependencies', lambda: graph.dependencies(start, hops), runs=20)
+            print(f'{"":>34}{len(found)} files')
+
+        timed('unchanged modified batch', lambda: graph.apply_batch(ChangeBatch([(paths[-1].as_posix(), 'modified')])), runs=20)
+        (root / paths[-1]).write_text('from ..pkg00.m0 import thing\n')
+        timed('edited module', lambda: graph.apply_batch(ChangeBatch([(paths[-1].as_posix(), 'modified')])))
+        new = Path('src/app/pkg00/fresh.py')
+        (root / new).write_text('from . import m0\n')
+        timed('added module', lambda: graph.apply([new], []))
+        timed('removed module', lambda: graph.apply([], [paths[-2]]))
+
+
+if __name__ == '__main__':
+    main()
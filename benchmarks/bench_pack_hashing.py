@@ -0,0 +1,59 @@
+"""Micro-benchmark: ContextPack.build_from_paths with the stat-cached FileHasher.
+
+Usage:
+    python benchmarks/bench_pack_hashing.py [N_FILES] [N_CHANGED]
+"""
+
+from pathlib import Path
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from ctx_ui.context.hashing import FileHasher
+from ctx_ui.models.context_pack import ContextPack
+from ctx_ui.storage.blobs import BlobStore
+
+
+def timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f'{label:>36}: {(time.perf_counter() - start) * 1000:9.1f} ms')
+    return result
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    changed = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / 'repo'
+        paths = [f'pkg{i % 40}/module_{i}.py' for i in range(n)]
+        past = time.time() - 60
+        for rel in paths:
+            (root / rel).parent.mkdir(parents=True, exist_ok=True)
+            (root / rel).write_text(''.join(f'value_{i} = {rng.random()!r}\n' for i in range(rng.randint(50, 2000))))
+            os.utime(root / rel, (past, past))
+        total = sum((root / rel).stat().st_size for rel in paths)
+        print(f'{n:,} files, {total / 1e6:.1f} MB')
+
+        hasher = FileHasher()
+        timed('cold build', lambda: ContextPack.build_from_paths(root, paths, hasher=hasher))
+        timed('warm build', lambda: ContextPack.build_from_paths(root, paths, hasher=hasher))
+        for rel in rng.sample(paths, changed):
+            (root / rel).write_text('changed = True\n')
+            os.utime(root / rel, (past + 1, past + 1))
+        timed(f'build with {changed} changed files', lambda: ContextPack.build_from_paths(root, paths, hasher=hasher))
+        timed('serial, uncached (old behaviour)', lambda: ContextPack.build_from_paths(root, paths, hasher=FileHasher(max_entries=0, workers=1)))
+
+        store = BlobStore(Path(tmp) / 'blobs')
+        hasher = FileHasher()
+        timed('cold build into blob store', lambda: ContextPack.build_from_paths(root, paths, store, hasher))
+        timed('warm build into blob store', lambda: ContextPack.build_from_paths(root, paths, store, hasher))
+
+
+if __name__ == '__main__':
+    main()
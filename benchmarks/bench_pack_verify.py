@@ -0,0 +1,66 @@
+"""Micro-benchmark: ContextPack.verify_many over hundreds of saved packs.
+
+Usage:
+    python benchmarks/bench_pack_verify.py [N_FILES] [N_PACKS] [FILES_PER_PACK]
+"""
+
+from pathlib import Path
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from ctx_ui.context.hashing import FileHasher
+from ctx_ui.models.context_pack import FRESH, ContextPack
+
+
+def timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = (time.perf_counter() - start) * 1000
+    fresh = sum(s.status == FRESH for statuses in result for s in statuses)
+    total = sum(len(statuses) for statuses in result)
+    print(f'{label:>40}: {elapsed:9.1f} ms  ({fresh}/{total} fresh)')
+    return result
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    n_packs = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    per_pack = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        paths = [f'pkg{i % 40}/module_{i}.py' for i in range(n)]
+        past = time.time() - 60
+        for rel in paths:
+            (root / rel).parent.mkdir(parents=True, exist_ok=True)
+            (root / rel).write_text(''.join(f'value_{i} = {rng.random()!r}\n' for i in range(rng.randint(50, 2000))))
+            os.utime(root / rel, (past, past))
+        subprocess.run(['git', 'init', '-q'], cwd=root, check=True)
+        subprocess.run(['git', 'add', '.'], cwd=root, check=True)
+        subprocess.run(['git', '-c', 'user.name=b', '-c', 'user.email=b@b', 'commit', '-q', '-m', 'init'], cwd=root, check=True)
+
+        hasher = FileHasher()
+        packs = [
+            ContextPack.build_from_paths(root, rng.sample(paths, per_pack), hasher=hasher, use_git=True)
+            for _ in range(n_packs)
+        ]
+        print(f'{n_packs} packs of {per_pack} files over {n:,} files')
+
+        timed('stat fast path', lambda: ContextPack.verify_many(packs, root, FileHasher()))
+        for rel in paths:
+            os.utime(root / rel, (past + 1, past + 1))
+        timed('all touched: hash every file', lambda: ContextPack.verify_many(packs, root, FileHasher()))
+        timed('all touched: git, stale index stat', lambda: ContextPack.verify_many(packs, root, FileHasher(), use_git=True))
+        # What any ``git status`` does, e.g. right after a checkout
+        subprocess.run(['git', 'update-index', '-q', '--refresh'], cwd=root, check=True)
+        timed('all touched: git, refreshed index', lambda: ContextPack.verify_many(packs, root, FileHasher(), use_git=True))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Benchmark: serial vs threaded list_repo_files on a synthetic deep tree.
+
+Usage:
+    python benchmarks/bench_parallel_scan.py [FANOUT] [DEPTH] [FILES_PER_DIR] [WORKERS]
+"""
+
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from ctx_ui.config import AppConfig
+from ctx_ui.context.indexer import list_repo_files
+
+
+def make_tree(root: Path, fanout: int, depth: int, files_per_dir: int) -> int:
+    """Create a synthetic tree and return the number of files written."""
+    count = 0
+    level = [root]
+    for _ in range(depth):
+        next_level = []
+        for d in level:
+            for i in range(fanout):
+                sub = d / f'd{i}'
+                sub.mkdir()
+                for j in range(files_per_dir):
+                    (sub / f'f{j}.py').write_text('')
+                    count += 1
+                next_level.append(sub)
+        level = next_level
+    return count
+
+
+def main():
+    args = [int(a) for a in sys.argv[1:]]
+    fanout, depth, files_per_dir, workers = args + [4, 6, 5, 8][len(args):]
+    config = AppConfig()
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        count = make_tree(root, fanout, depth, files_per_dir)
+        print(f'{count:,} files, fanout={fanout} depth={depth}')
+
+        results = {}
+        for name, n in [('serial', 0), (f'parallel x{workers}', workers)]:
+            start = time.perf_counter()
+            result = list_repo_files(root, config.index_include, config.index_exclude, workers=n)
+            results[name] = result
+            print(f'{name:>14}: {time.perf_counter() - start:7.3f}s  ({len(result):,} files)')
+
+        assert len(set(map(tuple, results.values()))) == 1, 'scans disagree'
+        print('Note: local page-cached disks favour serial; the pool pays off when stat latency dominates.')
+
+
+if __name__ == '__main__':
+    main()
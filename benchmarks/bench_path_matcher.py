@@ -0,0 +1,63 @@
+"""Micro-benchmark: compiled PathFilter vs per-pattern fnmatch loops.
+
+Usage:
+    python benchmarks/bench_path_matcher.py [N_PATHS]
+"""
+
+from pathlib import Path
+import fnmatch
+import random
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from ctx_ui.config import AppConfig
+from ctx_ui.context.matcher import PathFilter
+
+
+def make_paths(n: int, seed: int = 0) -> list:
+    """Generate synthetic repository-relative paths."""
+    rng = random.Random(seed)
+    tops = ['src', 'tests', 'docs', 'node_modules', '.git', 'build', 'packages', '.venv']
+    exts = ['.py', '.js', '.ts', '.md', '.json', '.pyc', '.png', '.txt', '.lock']
+    paths = []
+    for i in range(n):
+        depth = rng.randint(0, 5)
+        parts = [rng.choice(tops)] + [f'd{rng.randint(0, 40)}' for _ in range(depth)]
+        parts.append(f'file{i % 1000}{rng.choice(exts)}')
+        paths.append('/'.join(parts))
+    return paths
+
+
+def fnmatch_loop(paths, include, exclude) -> int:
+    kept = 0
+    for p in paths:
+        if any(fnmatch.fnmatch(p, ex) for ex in exclude):
+            continue
+        if not include or any(fnmatch.fnmatch(p, inc) for inc in include):
+            kept += 1
+    return kept
+
+
+def compiled(paths, include, exclude) -> int:
+    path_filter = PathFilter(include, exclude)
+    is_included = path_filter.is_included
+    return sum(1 for p in paths if is_included(p))
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    config = AppConfig()
+    paths = make_paths(n)
+    print(f'{n:,} paths, {len(config.index_include)} include / {len(config.index_exclude)} exclude patterns')
+
+    for name, fn in [('fnmatch loop', fnmatch_loop), ('compiled PathFilter', compiled)]:
+        start = time.perf_counter()
+        kept = fn(paths, config.index_include, config.index_exclude)
+        elapsed = time.perf_counter() - start
+        print(f'{name:>22}: {elapsed:7.3f}s  ({n / elapsed / 1e6:5.2f} M paths/s, kept {kept:,})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""Micro-benchmark: trigram PathSearchIndex build and query latency.
+
+Usage:
+    python benchmarks/bench_path_search.py [N_PATHS]
+"""
+
+from pathlib import Path
+import random
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from ctx_ui.context.search import PathSearchIndex
+
+WORDS = [
+    'src', 'lib', 'core', 'utils', 'api', 'models', 'views', 'tests', 'components',
+    'services', 'handlers', 'config', 'db', 'auth', 'user', 'payment', 'order',
+    'main', 'app', 'index', 'helpers', 'client', 'server', 'router',
+]
+QUERIES = ['main_views', 'payment order', 'auth/user_helpers.py', 'paymnt', 'mainview', 'ma']
+
+
+def make_paths(n: int, seed: int = 0) -> list:
+    """Generate distinct synthetic repository-relative paths."""
+    rng = random.Random(seed)
+    paths = set()
+    while len(paths) < n:
+        dirs = '/'.join(rng.choice(WORDS) for _ in range(rng.randint(1, 5)))
+        name = '_'.join(rng.choice(WORDS) for _ in range(rng.randint(1, 3)))
+        paths.add(Path(dirs) / f"{name}{rng.choice(['.py', '.ts', '.js', '.md'])}")
+    return list(paths)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    paths = make_paths(n)
+
+    start = time.perf_counter()
+    index = PathSearchIndex(paths)
+    print(f'{n:,} paths indexed in {time.perf_counter() - start:.2f}s')
+
+    for query in QUERIES:
+        runs = 20
+        start = time.perf_counter()
+        for _ in range(runs):
+            results = index.search(query)
+        elapsed = (time.perf_counter() - start) / runs
+        top = results[0].as_posix() if results else '-'
+        print(f'{query!r:>24}: {elapsed * 1000:7.2f} ms  ({len(results)} results, top {top})')
+
+
+if __name__ == '__main__':
+    main()
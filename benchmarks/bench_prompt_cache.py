@@ -0,0 +1,54 @@
+"""Micro-benchmark: ChatGPT prompt regeneration with and without the file cache.
+
+Usage:
+    python benchmarks/bench_prompt_cache.py [N_FILES]
+"""
+
+from pathlib import Path
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from ctx_ui.prompts.file_cache import RenderedFileCache
+from ctx_ui.prompts.generators import generate_chatgpt_prompt_text
+
+
+def make_repo(root: Path, n: int) -> set:
+    """Write ``n`` Python files of a few hundred lines each."""
+    old = time.time() - 60
+    selected = set()
+    for i in range(n):
+        rel = f'pkg{i % 10}/module_{i}.py'
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(''.join(f'def func_{j}(x):\n    return x * {j}  # TOKEN = nope\n' for j in range(300)))
+        os.utime(path, (old, old))
+        selected.add(rel)
+    return selected
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        selected = make_repo(root, n)
+        cache = RenderedFileCache()
+
+        start = time.perf_counter()
+        generate_chatgpt_prompt_text('warm up', selected, root)
+        uncached = time.perf_counter() - start
+
+        generate_chatgpt_prompt_text('fill', selected, root, file_cache=cache)
+        start = time.perf_counter()
+        generate_chatgpt_prompt_text('changed query', selected, root, file_cache=cache)
+        cached = time.perf_counter() - start
+
+    print(f'{n} files: uncached {uncached * 1000:8.1f} ms, cached {cached * 1000:6.1f} ms '
+          f'({cache.total_bytes / 1e6:.1f} MB cached)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""Micro-benchmark: serial vs thread-pool file rendering in the ChatGPT generator.
+
+A per-read delay can be added to mimic network file systems, where the
+thread pool pays off; on a warm local disk rendering is CPU-bound.
+
+Usage:
+    python benchmarks/bench_prompt_render.py [N_FILES] [READ_LATENCY_MS]
+"""
+
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from ctx_ui.prompts.generators import generate_chatgpt_prompt_text
+
+
+def make_repo(root: Path, n: int) -> set:
+    """Write ``n`` Python files of a few hundred lines each."""
+    selected = set()
+    for i in range(n):
+        rel = f'pkg{i % 10}/module_{i}.py'
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(''.join(f'def func_{j}(x):\n    return x * {j}\n' for j in range(300)))
+        selected.add(rel)
+    return selected
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    latency = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.005
+
+    read_text = Path.read_text
+
+    def slow_read_text(self, *args, **kwargs):
+        time.sleep(latency)
+        return read_text(self, *args, **kwargs)
+
+    Path.read_text = slow_read_text
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        selected = make_repo(root, n)
+        print(f'{n} files, {latency * 1000:.1f} ms simulated read latency')
+
+        expected = None
+        for workers in (0, 4, 8, 16):
+            start = time.perf_counter()
+            text = generate_chatgpt_prompt_text('q', selected, root, workers=workers)
+            elapsed = time.perf_counter() - start
+            expected = expected or text
+            assert text == expected, 'output differs from the serial path'
+            print(f'{"serial" if workers == 0 else f"{workers} workers":>12}: {elapsed * 1000:8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
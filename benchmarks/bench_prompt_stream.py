@@ -0,0 +1,67 @@
+"""Micro-benchmark: peak memory of building the ChatGPT prompt as a string vs
+streaming it to a file.
+
+Usage:
+    python benchmarks/bench_prompt_stream.py [N_FILES] [LINES_PER_FILE]
+"""
+
+from pathlib import Path
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from ctx_ui.prompts.generators import generate_chatgpt_prompt_text, iter_chatgpt_prompt, write_prompt
+
+
+def make_repo(root: Path, n: int, lines: int) -> set:
+    """Write ``n`` Python files just under the truncation limit."""
+    selected = set()
+    body = ''.join(f'def func_{j}(x):\n    return x * {j}\n' for j in range(lines // 2))
+    for i in range(n):
+        rel = f'pkg{i % 10}/module_{i}.py'
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(body)
+        selected.add(rel)
+    return selected
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    lines = int(sys.argv[2]) if len(sys.argv) > 2 else 780
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        selected = make_repo(root / 'repo', n, lines)
+        out_path = root / 'prompt.md'
+
+        def build_string():
+            out_path.write_text(generate_chatgpt_prompt_text('q', selected, root / 'repo', workers=4))
+
+        def stream():
+            with open(out_path, 'w') as out:
+                write_prompt(out, iter_chatgpt_prompt('q', selected, root / 'repo', workers=4))
+
+        size = None
+        for name, fn in [('string', build_string), ('stream', stream)]:
+            elapsed, peak = measure(fn)
+            size = out_path.stat().st_size
+            print(f'{name:7s} {elapsed * 1000:8.1f} ms  peak {peak / 1e6:7.1f} MB')
+        print(f'prompt size: {size / 1e6:.1f} MB from {n} files')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""Micro-benchmark: redaction throughput of the shared engine vs the old per-line loop.
+
+Usage:
+    python benchmarks/bench_redaction.py [SIZE_MB]
+"""
+
+from pathlib import Path
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from ctx_ui.reflection.checks import SecretsScanner
+from ctx_ui.reflection.redaction import redact_secrets
+
+
+def legacy_redact(content: str) -> str:
+    """The former per-line loop (without the scanner patterns)."""
+    redacted_lines = []
+    in_pem_block = False
+    for line in content.split('\n'):
+        if '-----BEGIN' in line:
+            in_pem_block = True
+            redacted_lines.append('[REDACTED]')
+            continue
+        if '-----END' in line:
+            in_pem_block = False
+            redacted_lines.append('[REDACTED]')
+            continue
+        if in_pem_block:
+            redacted_lines.append('[REDACTED]')
+            continue
+        if re.search(r'(API_KEY|SECRET|TOKEN)\s*=', line, re.IGNORECASE):
+            redacted_lines.append('[REDACTED]')
+            continue
+        if re.match(r'^[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+$', line.strip()):
+            redacted_lines.append('[REDACTED]')
+            continue
+        redacted_lines.append(line)
+    return '\n'.join(redacted_lines)
+
+
+def make_text(size: int, non_ascii: bool, seed: int = 0) -> str:
+    """Source-like text with an occasional secret."""
+    rng = random.Random(seed)
+    lines = [
+        'def handler(request, token_store):',
+        '    """Return the user record for a request."""',
+        '    user = token_store.lookup(request.headers.get("Authorization"))',
+        '    if user is None:',
+        '        raise PermissionError("missing credentials")',
+        '    return {"id": user.id, "name": user.name}',
+        '',
+        '# ----------------------------------------------------------------',
+    ]
+    secrets = ['API_KEY = "abc"', 'password: hunter2hunter2', 'eyJhbGci.eyJzdWIi.SflKxwRJ']
+    out, total = [], 0
+    while total < size:
+        line = rng.choice(secrets) if rng.random() < 0.002 else rng.choice(lines)
+        if non_ascii and rng.random() < 0.05:
+            line += '  # ✓ géré'
+        out.append(line)
+        total += len(line) + 1
+    return '\n'.join(out)
+
+
+def main():
+    size = int(float(sys.argv[1]) * 1_000_000) if len(sys.argv) > 1 else 8_000_000
+    scanner = SecretsScanner()
+    for label, non_ascii in [('ascii', False), ('non-ascii', True)]:
+        text = make_text(size, non_ascii)
+        runs = [
+            ('legacy line loop', legacy_redact),
+            ('legacy loop + scanner', lambda t: (legacy_redact(t), [p.findall(t) for p in scanner.PATTERNS.values()])),
+            ('shared engine', redact_secrets),
+        ]
+        print(f'{label}: {len(text) / 1e6:.1f} MB')
+        for name, fn in runs:
+            start = time.perf_counter()
+            fn(text)
+            elapsed = time.perf_counter() - start
+            print(f'{name:>24}: {len(text) / elapsed / 1e6:7.1f} MB/s')
+
+
+if __name__ == '__main__':
+    main()
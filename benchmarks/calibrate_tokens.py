@@ -0,0 +1,98 @@
+"""Offline calibration of the local token estimator against a BPE tokenizer.
+
+Fits ``TOKEN_WEIGHTS`` by least squares on half of the text files found
+under the given directories and reports the error on the other half. Needs
+``tiktoken`` with the encoding's data file available locally; the app itself
+never loads a tokenizer.
+
+Usage:
+    python benchmarks/calibrate_tokens.py [ENCODING] DIR [DIR ...]
+"""
+
+from pathlib import Path
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from ctx_ui.prompts.tokens import TOKEN_WEIGHTS, estimate_tokens, token_features
+
+SUFFIXES = ('.py', '.md', '.rst', '.txt', '.json', '.js', '.ts', '.html', '.css', '.yaml', '.toml', '.cfg')
+
+
+def load_samples(dirs, limit=3000, max_chars=400000):
+    """Read up to ``limit`` random text files below ``dirs``."""
+    paths = [
+        os.path.join(dirpath, name)
+        for d in dirs
+        for dirpath, _, names in os.walk(d)
+        for name in names
+        if name.endswith(SUFFIXES)
+    ]
+    random.Random(1).shuffle(paths)
+    samples = []
+    for path in paths[:limit]:
+        try:
+            text = Path(path).read_text(encoding='utf-8')
+        except (OSError, UnicodeDecodeError):
+            continue
+        if text and len(text) <= max_chars:
+            samples.append(text)
+    return samples
+
+
+def least_squares(rows, targets):
+    """Solve the normal equations of a small linear fit without intercept."""
+    k = len(rows[0])
+    a = [[sum(r[i] * r[j] for r in rows) for j in range(k)] for i in range(k)]
+    b = [sum(r[i] * t for r, t in zip(rows, targets)) for i in range(k)]
+    for i in range(k):
+        for j in range(i + 1, k):
+            f = a[j][i] / a[i][i]
+            a[j] = [x - f * y for x, y in zip(a[j], a[i])]
+            b[j] -= f * b[i]
+    w = [0.0] * k
+    for i in reversed(range(k)):
+        w[i] = (b[i] - sum(a[i][c] * w[c] for c in range(i + 1, k))) / a[i][i]
+    return w
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def main():
+    import tiktoken
+
+    args = sys.argv[1:]
+    encoding = 'cl100k_base'
+    if args and not os.path.isdir(args[0]):
+        encoding = args.pop(0)
+    enc = tiktoken.get_encoding(encoding)
+    samples = load_samples(args or ['.'])
+    counts = [len(enc.encode(text, disallowed_special=())) for text in samples]
+    half = len(samples) // 2
+
+    weights = least_squares([token_features(t) for t in samples[:half]], counts[:half])
+    print(f'{len(samples)} files, encoding {encoding}')
+    print(f'fitted weights:  ({", ".join(f"{w:.4g}" for w in weights)})')
+    print(f'current weights: {TOKEN_WEIGHTS}')
+
+    held_out = [(t, c) for t, c in zip(samples[half:], counts[half:]) if c >= 200]
+    estimator_errors = [abs(estimate_tokens(t) - c) / c for t, c in held_out]
+    chars_errors = [abs(len(t) / 4 - c) / c for t, c in held_out]
+    print(f'estimator error: median {percentile(estimator_errors, 0.5):.1%}, p95 {percentile(estimator_errors, 0.95):.1%}')
+    print(f'chars / 4 error: median {percentile(chars_errors, 0.5):.1%}, p95 {percentile(chars_errors, 0.95):.1%}')
+
+    text = ''.join(samples[:300])
+    start = time.perf_counter()
+    estimate_tokens(text)
+    elapsed = time.perf_counter() - start
+    print(f'estimator speed: {len(text) / elapsed / 1e6:.1f} MB/s')
+
+
+if __name__ == '__main__':
+    main()
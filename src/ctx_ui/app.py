@@ -8,7 +8,18 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from ctx_ui.config import AppState, AppConfig
+from ctx_ui.context.binary import BinaryDetector
+from ctx_ui.context.changes import ChangeBatch
+from ctx_ui.context.gitignore import GitIgnore
+from ctx_ui.context.imports import ImportGraph
+from ctx_ui.context.live_index import LiveIndex
+from ctx_ui.context.search import PathSearchIndex
+from ctx_ui.context.symbols import SymbolIndex
+from ctx_ui.prompts.file_cache import RenderedFileCache
+from ctx_ui.prompts.store import PromptStore
+from ctx_ui.ui.prompt_routes import register_prompt_routes
 from ctx_ui.ui.views.main_view import main_page
+from ctx_ui.watcher.broadcast import ChangeHub
 from ctx_ui.watcher.repo_watcher import RepoWatcher
 
 
@@ -24,31 +35,44 @@ def main():
     config = AppConfig()
     config.repo_root = Path.cwd()
     
-    state = AppState(config=config)
+    # One gitignore engine shared by the indexer and the watcher
+    gitignore = GitIgnore(config.repo_root) if config.index_respect_gitignore else None
+    # One binary detector shared by the indexer and the prompt generators
+    binary_detector = BinaryDetector()
+    live_index = LiveIndex.from_config(config, gitignore=gitignore, binary_detector=binary_detector)
+    search_index = PathSearchIndex.from_live_index(live_index)
+    import_graph = ImportGraph.from_live_index(live_index)
+    change_hub = ChangeHub()
+    file_cache = RenderedFileCache(config.prompt_cache_max_bytes)
+    prompt_store = PromptStore(max_prompts=config.prompt_store_max, preview_chars=config.prompt_preview_chars)
+    state = AppState(
+        config=config,
+        live_index=live_index,
+        change_hub=change_hub,
+        search_index=search_index,
+        file_cache=file_cache,
+        binary_detector=binary_detector,
+        prompt_store=prompt_store,
+        symbol_index=SymbolIndex(),
+        import_graph=import_graph
+    )
     
     # Initialize file watcher
-    def on_file_change(file_path: Path, event_type: str):
-        """Handle file system changes - this will be connected to UI refresh."""
-        # Store the last change event in app storage
-        if not hasattr(app.storage.general, 'file_changes'):
-            app.storage.general['file_changes'] = []
-        
-        rel_path = file_path.relative_to(config.repo_root)
-        app.storage.general['file_changes'].append({
-            'path': str(rel_path),
-            'type': event_type,
-            'timestamp': __import__('time').time()
-        })
-        
-        # Keep only last 100 changes
-        if len(app.storage.general['file_changes']) > 100:
-            app.storage.general['file_changes'] = app.storage.general['file_changes'][-100:]
+    def on_file_changes(batch: ChangeBatch):
+        """Apply a coalesced batch to the index, then push it to every client."""
+        live_index.apply_batch(batch)
+        import_graph.apply_batch(batch)
+        file_cache.invalidate_batch(batch)
+        change_hub.publish(batch)
     
     # Start watching the repository
     watcher = RepoWatcher(
         repo_path=config.repo_root,
-        on_change=on_file_change,
-        exclude_patterns=config.index_exclude
+        on_batch=on_file_changes,
+        exclude_patterns=config.index_exclude,
+        gitignore=gitignore,
+        debounce_seconds=config.watch_debounce_seconds,
+        max_pending=config.watch_max_pending
     )
     watcher.start()
     
@@ -57,10 +81,13 @@ def main():
         """Cleanup on shutdown."""
         if watcher:
             watcher.stop()
+        prompt_store.close()
     
     app.on_shutdown(shutdown)
     
     # Setup routes
+    register_prompt_routes(prompt_store)
+    
     @ui.page('/')
     def index():
         main_page(state)
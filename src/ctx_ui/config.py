@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
 from pathlib import Path
-from typing import List
+from typing import Any, List, Optional
+import hashlib
 import os
 
 
@@ -18,6 +19,37 @@ class AppConfig(BaseModel):
         'dist/**',
         'build/**'
     ])
+    # Honour nested .gitignore files; optionally list files via `git ls-files`
+    index_respect_gitignore: bool = True
+    index_use_git: bool = False
+    # Leave out files whose content looks binary (only names without a known text suffix are opened)
+    index_skip_binary: bool = True
+    # Threads used to scan the repository; 0 keeps the serial walker
+    index_scan_workers: int = Field(default_factory=lambda: int(os.getenv('CTX_INDEX_SCAN_WORKERS', '0')))
+    # Watcher events are merged per path for this long before delivery;
+    # more pending paths than watch_max_pending collapse into a full rescan
+    watch_debounce_seconds: float = 0.3
+    watch_max_pending: int = 10000
+    # Persistent caches live outside the observed repo, which stays read-only
+    cache_dir: Path = Field(default_factory=lambda: Path(os.getenv('CTX_CACHE_DIR', Path.home() / '.cache' / 'ctx_ui')))
+    # Rendered file blocks kept between prompt generations
+    prompt_cache_max_bytes: int = 64 * 1024 * 1024
+    # Threads reading selected files while a prompt is generated
+    prompt_render_workers: int = 8
+    # Estimated token limit for the whole ChatGPT prompt; 0 keeps fixed per-file truncation
+    prompt_token_budget: int = Field(default_factory=lambda: int(os.getenv('CTX_PROMPT_TOKEN_BUDGET', '0')))
+    # Outline files over the size/line limits (signatures and docstrings) instead of cutting out their middle
+    prompt_outline_large_files: bool = True
+    # Generated prompts kept on disk for copy/download, and characters shown in the output preview
+    prompt_store_max: int = 20
+    prompt_preview_chars: int = 20000
+    # Import hops followed by "Add dependencies" in the selected files list
+    dependency_hops: int = 1
+
+    def index_db_path(self) -> Path:
+        """Path of the metadata database for the current repository."""
+        key = hashlib.sha1(str(Path(self.repo_root).resolve()).encode()).hexdigest()[:16]
+        return self.cache_dir / f'index-{key}.db'
 
 
 class AppState(BaseModel):
@@ -25,6 +57,14 @@ class AppState(BaseModel):
     config: AppConfig = Field(default_factory=AppConfig)
     current_task: str = ''
     selected_files: List[str] = Field(default_factory=list)
+    live_index: Optional[Any] = None
+    change_hub: Optional[Any] = None
+    search_index: Optional[Any] = None
+    file_cache: Optional[Any] = None
+    binary_detector: Optional[Any] = None
+    prompt_store: Optional[Any] = None
+    symbol_index: Optional[Any] = None
+    import_graph: Optional[Any] = None
     
     class Config:
         arbitrary_types_allowed = True
@@ -0,0 +1,100 @@
+"""Content-sniffing binary file detection with a per-path verdict cache."""
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Tuple
+import codecs
+import os
+import threading
+
+
+# Bytes read from the start of a file to decide
+SNIFF_BYTES = 8192
+
+# Suffixes trusted to be text when listing files, so the indexer only opens
+# files whose name says nothing about their content
+TEXT_SUFFIXES = frozenset({
+    '.py', '.pyi', '.js', '.jsx', '.ts', '.tsx', '.mjs', '.cjs', '.md', '.rst', '.txt',
+    '.json', '.yaml', '.yml', '.toml', '.ini', '.cfg', '.html', '.css', '.scss',
+    '.sh', '.sql', '.xml', '.csv', '.go', '.rs', '.java', '.kt', '.c', '.h', '.cpp',
+    '.hpp', '.cs', '.rb', '.php', '.swift',
+})
+
+_BOMS = (
+    codecs.BOM_UTF8, codecs.BOM_UTF32_LE, codecs.BOM_UTF32_BE,
+    codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE,
+)
+
+# C0 controls that do not occur in text (tab, newlines, form feed, backspace
+# and escape do), plus DEL
+_CONTROL_BYTES = bytes(sorted(set(range(32)) - {8, 9, 10, 12, 13, 27})) + b'\x7f'
+
+
+def has_text_suffix(name: str) -> bool:
+    """Whether a file name has a suffix in ``TEXT_SUFFIXES``."""
+    return os.path.splitext(name)[1].lower() in TEXT_SUFFIXES
+
+
+def is_binary_data(data: bytes) -> bool:
+    """Classify a file prefix as binary.
+
+    Text with a Unicode BOM is never binary. Otherwise any NUL byte makes it
+    binary, as in git. Valid UTF-8 is binary only if it is mostly control
+    characters; anything else (e.g. Latin-1 text or compressed data) is
+    binary once more than 5% of its bytes are control characters.
+    """
+    if not data or data.startswith(_BOMS):
+        return False
+    if b'\0' in data:
+        return True
+    controls = len(data) - len(data.translate(None, _CONTROL_BYTES))
+    try:
+        data.decode('utf-8')
+        is_utf8 = True
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off by the prefix still counts as UTF-8
+        is_utf8 = e.end == len(data) and e.reason == 'unexpected end of data'
+    return controls / len(data) > (0.3 if is_utf8 else 0.05)
+
+
+class BinaryDetector:
+    """Sniff files for binary content, caching verdicts by path, mtime and size.
+
+    Only the first ``SNIFF_BYTES`` of a file are read. Up to ``max_entries``
+    verdicts are kept, least recently used first out.
+    """
+
+    def __init__(self, max_entries: int = 100000):
+        self.max_entries = max_entries
+        self._cache: 'OrderedDict[str, Tuple[int, int, bool]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def is_binary(self, path: Path) -> bool:
+        """Whether a file looks binary; unreadable files are reported as text."""
+        key = os.fspath(path)
+        try:
+            st = os.stat(key)
+        except OSError:
+            return False
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+                self._cache.move_to_end(key)
+                return cached[2]
+
+        try:
+            with open(key, 'rb') as f:
+                verdict = is_binary_data(f.read(SNIFF_BYTES))
+        except OSError:
+            return False
+
+        with self._lock:
+            self._cache[key] = (st.st_mtime_ns, st.st_size, verdict)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return verdict
+
+    def is_binary_listed(self, path: Path) -> bool:
+        """Like ``is_binary`` but trusts ``TEXT_SUFFIXES``, for listing many files."""
+        return not has_text_suffix(os.fspath(path)) and self.is_binary(path)
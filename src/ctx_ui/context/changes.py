@@ -0,0 +1,14 @@
+"""Change batches passed from the watcher to the indexes and caches."""
+
+from typing import List, NamedTuple, Tuple
+
+
+class ChangeBatch(NamedTuple):
+    """Net changes collected during one debounce window.
+
+    ``changes`` holds ``(relative_path, event_type)`` pairs ordered by each
+    path's latest event. When ``overflow`` is set the individual changes were
+    dropped and consumers should rescan instead.
+    """
+    changes: List[Tuple[str, str]]
+    overflow: bool = False
@@ -0,0 +1,178 @@
+"""Persistent file index with incremental rescans driven by directory mtimes."""
+
+from pathlib import Path
+from operator import attrgetter
+from typing import Any, Dict, List, Optional
+import os
+import threading
+import time
+from .binary import BinaryDetector
+from .gitignore import GitIgnore, git_ls_files
+from .indexer import walk_tree
+from .matcher import PathFilter
+from ..storage.store import MetadataStore
+
+
+# Directories modified this close to a scan may change again within the same
+# mtime tick, so their listing is saved but re-read on the next scan.
+RACY_MTIME_NS = 2_000_000_000
+
+
+class FileIndex:
+    """Repository file listing backed by a directory snapshot in MetadataStore.
+
+    A directory's entries only change when its own mtime changes, so a rescan
+    costs one ``stat`` per directory and re-reads only directories whose mtime
+    differs from the snapshot. Per-file size and mtime are not recorded,
+    since checking them would cost a ``stat`` per file on every rescan; rows
+    of deleted files are dropped from the ``files`` table.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        include: List[str],
+        exclude: List[str],
+        store: Optional[MetadataStore] = None,
+        workers: int = 0,
+        gitignore: Optional[GitIgnore] = None,
+        use_git: bool = False,
+        binary_detector: Optional[BinaryDetector] = None
+    ):
+        self.root = root
+        self.path_filter = PathFilter(include, exclude)
+        self.store = store
+        self.workers = workers
+        self.gitignore = gitignore
+        self.use_git = use_git
+        self.binary_detector = binary_detector
+        self._snapshot: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(
+        cls,
+        config,
+        store: Optional[MetadataStore] = None,
+        gitignore: Optional[GitIgnore] = None,
+        binary_detector: Optional[BinaryDetector] = None
+    ) -> 'FileIndex':
+        """Create an index for ``config.repo_root`` persisted under the cache dir."""
+        if store is None:
+            store = MetadataStore(config.index_db_path())
+        if gitignore is None and config.index_respect_gitignore:
+            gitignore = GitIgnore(config.repo_root)
+        if not config.index_skip_binary:
+            binary_detector = None
+        elif binary_detector is None:
+            binary_detector = BinaryDetector()
+        return cls(
+            config.repo_root,
+            config.index_include,
+            config.index_exclude,
+            store,
+            config.index_scan_workers,
+            gitignore,
+            config.index_use_git,
+            binary_detector
+        )
+
+    def _is_ignored(self, rel: str, is_dir: bool) -> bool:
+        return self.gitignore is not None and self.gitignore.is_ignored_entry(rel, is_dir)
+
+    def is_binary(self, rel: str) -> bool:
+        """Whether a file is left out of the index for looking binary."""
+        return self.binary_detector is not None and self.binary_detector.is_binary_listed(self.root / rel)
+
+    def _read_dir(self, abs_dir: Path, mtime_ns: int) -> Dict[str, Any]:
+        """List a directory's file and subdirectory names."""
+        files, dirs = [], []
+        try:
+            with os.scandir(abs_dir) as it:
+                entries = list(it)
+        except OSError:
+            entries = []
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    dirs.append(entry.name)
+                elif entry.is_file():
+                    files.append(entry.name)
+            except OSError:
+                continue
+        return {'mtime_ns': mtime_ns, 'files': files, 'dirs': dirs}
+
+    def scan(self) -> List[Path]:
+        """Return sorted relative paths of included files, rescanning incrementally."""
+        if self.use_git:
+            rel_files = git_ls_files(self.root)
+            if rel_files is not None:
+                paths = [
+                    Path(rel) for rel in rel_files
+                    if self.path_filter.is_included(rel) and not self.is_binary(rel)
+                ]
+                return sorted(paths, key=attrgetter('parts'))
+
+        with self._lock:
+            if self.gitignore is not None:
+                self.gitignore.refresh()
+            ignore_gen = self.gitignore.generation if self.gitignore is not None else 0
+            if self._snapshot is None:
+                self._snapshot = self.store.load_directory_snapshot() if self.store else {}
+            previous = self._snapshot
+            current: Dict[str, Dict[str, Any]] = {}
+            changed: Dict[str, Dict[str, Any]] = {}
+            removed_files: List[str] = []
+            racy_after = time.time_ns() - RACY_MTIME_NS
+
+            def scan_dir(rel_dir: str):
+                abs_dir = self.root / rel_dir if rel_dir else self.root
+                prefix = f'{rel_dir}/' if rel_dir else ''
+                try:
+                    mtime_ns = os.stat(abs_dir).st_mtime_ns
+                except OSError:
+                    return [], []
+
+                cached = previous.get(rel_dir)
+                if cached is not None and cached['mtime_ns'] == mtime_ns:
+                    listing = cached
+                else:
+                    listing = self._read_dir(abs_dir, mtime_ns)
+                    if mtime_ns >= racy_after:
+                        listing['mtime_ns'] = 0
+                    changed[rel_dir] = listing
+                    if cached is not None:
+                        gone = set(cached['files']) - set(listing['files'])
+                        removed_files.extend(prefix + name for name in gone)
+                current[rel_dir] = listing
+
+                # Included paths are cached on the in-memory listing for later rescans
+                paths = listing.get('paths')
+                if paths is None or listing.get('ignore_gen') != ignore_gen:
+                    paths = listing['paths'] = [
+                        Path(prefix + name) for name in listing['files']
+                        if self.path_filter.is_included(prefix + name)
+                        and not self._is_ignored(prefix + name, is_dir=False)
+                        and not self.is_binary(prefix + name)
+                    ]
+                    listing['ignore_gen'] = ignore_gen
+                subdirs = [
+                    prefix + name for name in listing['dirs']
+                    if not self.path_filter.prunes_dir(prefix + name)
+                    and not self._is_ignored(prefix + name, is_dir=True)
+                ]
+                return paths, subdirs
+
+            paths = walk_tree(scan_dir, self.workers)
+
+            removed_dirs = [d for d in previous if d not in current]
+            for rel_dir in removed_dirs:
+                prefix = f'{rel_dir}/' if rel_dir else ''
+                removed_files.extend(prefix + name for name in previous[rel_dir]['files'])
+            self._snapshot = current
+
+            if self.store and (changed or removed_dirs):
+                self.store.save_index_changes(changed, removed_dirs, removed_files)
+
+        # Sorting by the cached parts tuples avoids slow Path comparisons
+        return sorted(paths, key=attrgetter('parts'))
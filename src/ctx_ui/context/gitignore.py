@@ -0,0 +1,202 @@
+"""Gitignore engine - nested ignore files compiled once and cached by mtime."""
+
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import os
+import re
+import subprocess
+import threading
+from .matcher import translate_glob
+
+
+class IgnoreFile:
+    """Rules of a single ignore file, compiled into two alternation regexes.
+
+    Rules are joined in reverse order so the first alternative that matches is
+    the last matching rule in the file, which is the one git applies.
+    """
+
+    def __init__(self, base: str, lines: List[str]):
+        self.base = base
+        self.rules: List[Tuple[str, bool, bool]] = []  # (pattern, negated, dir_only)
+        for line in lines:
+            rule = self._parse(line)
+            if rule is not None:
+                self.rules.append(rule)
+        self._file_regex, self._file_rules = self._compile(include_dir_only=False)
+        self._dir_regex, self._dir_rules = self._compile(include_dir_only=True)
+
+    @staticmethod
+    def _parse(line: str) -> Optional[Tuple[str, bool, bool]]:
+        """Parse one line into ``(pattern, negated, dir_only)`` or None."""
+        line = line.rstrip('\n').rstrip('\r')
+        if not line or line.startswith('#'):
+            return None
+        # Trailing spaces are ignored unless escaped
+        stripped = line.rstrip(' ')
+        if stripped.endswith('\\') and stripped != line:
+            stripped = stripped[:-1] + ' '
+        line = stripped
+        negated = line.startswith('!')
+        if negated:
+            line = line[1:]
+        elif line.startswith('\\!') or line.startswith('\\#'):
+            line = line[1:]
+        dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        if not line:
+            return None
+        return line, negated, dir_only
+
+    def _compile(self, include_dir_only: bool):
+        rules = [r for r in reversed(self.rules) if include_dir_only or not r[2]]
+        if not rules:
+            return None, rules
+        source = '|'.join(f'({translate_glob(pattern)})' for pattern, _, _ in rules)
+        return re.compile(rf'(?s:{source})\Z'), rules
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """Return True if ignored, False if re-included by ``!``, None if unmatched.
+
+        Args:
+            rel_path: Path relative to the directory holding this ignore file
+            is_dir: Whether the path is a directory (enables ``dir/`` rules)
+        """
+        regex, rules = (self._dir_regex, self._dir_rules) if is_dir else (self._file_regex, self._file_rules)
+        if regex is None:
+            return None
+        m = regex.match(rel_path)
+        if m is None:
+            return None
+        for idx, group in enumerate(m.groups()):
+            if group is not None:
+                return not rules[idx][1]
+        return None
+
+
+class GitIgnore:
+    """Evaluate nested ``.gitignore`` files plus ``.git/info/exclude``.
+
+    Each ignore file is compiled once and cached together with its mtime.
+    Lookups trust the cache; ``refresh()`` re-stats cached files and
+    ``invalidate()`` drops one directory, bumping ``generation`` whenever
+    rules change so callers can drop results derived from old rules.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.generation = 0
+        self._cache: Dict[str, Tuple[int, Optional[IgnoreFile]]] = {}
+        self._lock = threading.Lock()
+
+    def _ignore_path(self, rel_dir: str) -> Path:
+        return self.root / rel_dir / '.gitignore' if rel_dir else self.root / '.gitignore'
+
+    @staticmethod
+    def _mtime(path: Path) -> int:
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return -1
+
+    def _load(self, path: Path, base: str) -> Tuple[int, Optional[IgnoreFile]]:
+        mtime = self._mtime(path)
+        if mtime < 0:
+            return mtime, None
+        try:
+            lines = path.read_text(errors='ignore').splitlines()
+        except OSError:
+            return -1, None
+        return mtime, IgnoreFile(base, lines)
+
+    def _rules(self, rel_dir: str) -> Optional[IgnoreFile]:
+        """Return the compiled ``.gitignore`` of a directory, loading it once."""
+        entry = self._cache.get(rel_dir)
+        if entry is None:
+            with self._lock:
+                entry = self._cache.get(rel_dir)
+                if entry is None:
+                    entry = self._cache[rel_dir] = self._load(self._ignore_path(rel_dir), rel_dir)
+        return entry[1]
+
+    def _info_exclude(self) -> Optional[IgnoreFile]:
+        entry = self._cache.get('.git/info/exclude')
+        if entry is None:
+            entry = self._cache['.git/info/exclude'] = self._load(self.root / '.git' / 'info' / 'exclude', '')
+        return entry[1]
+
+    def refresh(self) -> bool:
+        """Re-stat cached ignore files and drop changed ones. Returns True if any changed."""
+        with self._lock:
+            stale = []
+            for key, (mtime, _) in self._cache.items():
+                path = self.root / key if key == '.git/info/exclude' else self._ignore_path(key)
+                if self._mtime(path) != mtime:
+                    stale.append(key)
+            for key in stale:
+                del self._cache[key]
+            if stale:
+                self.generation += 1
+            return bool(stale)
+
+    def invalidate(self, rel_dir: str = ''):
+        """Drop the cached rules of one directory after its ignore file changed."""
+        with self._lock:
+            self._cache.pop(rel_dir, None)
+            self.generation += 1
+
+    def is_ignored_entry(self, rel_path: str, is_dir: bool = False) -> bool:
+        """Check a path whose parent directories are known not to be ignored."""
+        parts = rel_path.split('/')
+        if parts[-1] == '.git':
+            return True
+        # Deeper ignore files take precedence over shallower ones
+        for depth in range(len(parts) - 1, -1, -1):
+            base = '/'.join(parts[:depth])
+            rules = self._rules(base)
+            if rules is not None:
+                result = rules.match('/'.join(parts[depth:]), is_dir)
+                if result is not None:
+                    return result
+        rules = self._info_exclude()
+        if rules is not None:
+            result = rules.match(rel_path, is_dir)
+            if result is not None:
+                return result
+        return False
+
+    def is_ignored(self, rel_path: str, is_dir: bool = False) -> bool:
+        """Check a path, including whether any parent directory is ignored."""
+        rel_path = str(rel_path).replace(os.sep, '/')
+        parts = rel_path.split('/')
+        for depth in range(1, len(parts)):
+            if self.is_ignored_entry('/'.join(parts[:depth]), is_dir=True):
+                return True
+        return self.is_ignored_entry(rel_path, is_dir)
+
+
+def git_ls_files(root: Path) -> Optional[List[str]]:
+    """List tracked and untracked, non-ignored files with one git call.
+
+    Returns None when ``root`` is not a git work tree or git is unavailable.
+    """
+    try:
+        result = subprocess.run(
+            ['git', 'ls-files', '-c', '-d', '-o', '--exclude-standard', '-t', '-z'],
+            cwd=root,
+            capture_output=True,
+            check=True
+        )
+    except Exception:
+        return None
+
+    # -t tags each entry; tracked files deleted from the work tree appear
+    # once as cached ('H') and once as removed ('R')
+    entries = [e for e in result.stdout.decode('utf-8', errors='surrogateescape').split('\0') if e]
+    removed = {e[2:] for e in entries if e.startswith('R ')}
+    files = []
+    for entry in entries:
+        tag, path = entry[0], entry[2:]
+        if tag != 'R' and path not in removed:
+            files.append(path)
+    return list(dict.fromkeys(files))
@@ -0,0 +1,133 @@
+"""Streaming SHA-256 file hashing with hashes cached by inode, size and mtime."""
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, NamedTuple, Optional, Tuple
+import hashlib
+import os
+import threading
+import time
+from .file_index import RACY_MTIME_NS
+
+# Bytes read per chunk; large enough that hashlib releases the GIL while hashing
+HASH_CHUNK_BYTES = 1024 * 1024
+
+
+def hash_file(path, chunk_size: int = HASH_CHUNK_BYTES) -> str:
+    """``sha256:`` hash of a file's bytes, read in fixed-size chunks.
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return f'sha256:{digest.hexdigest()}'
+
+
+class HashResult(NamedTuple):
+    """Hash of one file; ``digest`` is None and ``error`` says why if it could not be read.
+
+    ``stat`` is the stat the hash is known to match, None for files
+    modified too recently for their stat to vouch for their content.
+    """
+    digest: Optional[str]
+    stat: Optional[os.stat_result]
+    error: Optional[OSError] = None
+
+
+class FileHasher:
+    """Hash files, reusing known hashes while ``(inode, size, mtime_ns)`` is unchanged.
+
+    Files modified within ``RACY_MTIME_NS`` of hashing may change again
+    inside the same mtime tick, so their hashes are not cached. Up to
+    ``max_entries`` hashes are kept, least recently used first out.
+    """
+
+    def __init__(self, max_entries: int = 100000, workers: int = 8):
+        self.max_entries = max_entries
+        self.workers = workers
+        self._cache: 'OrderedDict[str, Tuple[Tuple[int, int, int], str]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _lookup(self, key: str) -> Tuple[os.stat_result, Optional[str]]:
+        """Stat a file and return it with its cached hash, if still valid.
+
+        Raises:
+            OSError: If the file cannot be stat'ed
+        """
+        st = os.stat(key)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] == (st.st_ino, st.st_size, st.st_mtime_ns):
+                self._cache.move_to_end(key)
+                return st, cached[1]
+        return st, None
+
+    def _store(self, key: str, st: os.stat_result, digest: str) -> bool:
+        """Cache a hash computed after ``st`` was taken; False if the file was not stable."""
+        if st.st_mtime_ns >= time.time_ns() - RACY_MTIME_NS:
+            return False
+        try:
+            # A file changed while it was read must not be cached under its old stat
+            after = os.stat(key)
+            if (after.st_ino, after.st_size, after.st_mtime_ns) != (st.st_ino, st.st_size, st.st_mtime_ns):
+                return False
+        except OSError:
+            return False
+        with self._lock:
+            self._cache[key] = ((st.st_ino, st.st_size, st.st_mtime_ns), digest)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return True
+
+    def hash(self, path, hash_fn: Callable[[str], str] = hash_file) -> Optional[str]:
+        """Hash of one file, or None if it cannot be read."""
+        return self.hash_many([path], hash_fn)[0]
+
+    def hash_many(self, paths: Iterable, hash_fn: Callable[[str], str] = hash_file) -> List[Optional[str]]:
+        """Hashes of files in order, None for unreadable ones.
+
+        Cached hashes cost one ``stat``; the rest are computed with
+        ``hash_fn`` (which must return the ``sha256:`` hash of the bytes,
+        such as ``BlobStore.put_file``) on up to ``workers`` threads.
+        """
+        return [result.digest for result in self.hash_many_with_stats(paths, hash_fn)]
+
+    def hash_many_with_stats(self, paths: Iterable, hash_fn: Callable[[str], str] = hash_file) -> List[HashResult]:
+        """Like ``hash_many``, returning a ``HashResult`` with stat or error per file."""
+        keys = [os.fspath(p) for p in paths]
+        results: List[HashResult] = [HashResult(None, None)] * len(keys)
+        misses = []
+        for i, key in enumerate(keys):
+            try:
+                st, digest = self._lookup(key)
+            except OSError as e:
+                results[i] = HashResult(None, None, e)
+                continue
+            if digest is not None:
+                results[i] = HashResult(digest, st)
+            else:
+                misses.append((i, key, st))
+
+        def compute(miss) -> HashResult:
+            _, key, st = miss
+            try:
+                digest = hash_fn(key)
+            except OSError as e:
+                return HashResult(None, None, e)
+            return HashResult(digest, st if self._store(key, st, digest) else None)
+
+        if len(misses) > 1 and self.workers > 1:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(misses))) as executor:
+                computed = list(executor.map(compute, misses))
+        else:
+            computed = [compute(miss) for miss in misses]
+        for (i, _, _), result in zip(misses, computed):
+            results[i] = result
+        return results
@@ -0,0 +1,142 @@
+"""Read the first and last lines of large files without loading them whole."""
+
+from pathlib import Path
+from typing import NamedTuple, Optional, Tuple
+import locale
+import mmap
+import re
+
+
+# Bytes counted per step when scanning for line breaks
+COUNT_CHUNK = 1024 * 1024
+
+# Text kept around the cuts so multi-line rules see what follows the head
+# and precedes the tail
+CONTEXT_BYTES = 64 * 1024
+
+_BREAK = re.compile(rb'\r\n|\r|\n')
+
+
+class HeadTail(NamedTuple):
+    """Excerpt of a file with text-mode (universal newline) line semantics.
+
+    ``line_count`` and ``text_bytes`` describe the whole file as
+    ``read_text().split('\\n')`` and its UTF-8 size would; ``head`` and
+    ``tail`` hold decoded text with ``\\n`` line breaks. ``after_head``
+    holds the lines following the head (starting with its line break) and
+    ``before_tail`` the lines preceding the tail, each up to
+    ``CONTEXT_BYTES``. ``in_block`` tells whether ``before_tail`` starts
+    inside a block opened by the last marker line before it.
+    """
+    line_count: int
+    text_bytes: int
+    head: str
+    tail: str
+    after_head: str
+    before_tail: str
+    in_block: bool
+
+
+def count_line_breaks(mm) -> tuple:
+    """Count universal line breaks in a buffer, chunk by chunk.
+
+    Returns:
+        (line_breaks, crlf_pairs)
+    """
+    lf = cr = crlf = 0
+    size = len(mm)
+    for offset in range(0, size, COUNT_CHUNK):
+        chunk = mm[offset:offset + COUNT_CHUNK]
+        lf += chunk.count(b'\n')
+        n_cr = chunk.count(b'\r')
+        if n_cr:
+            cr += n_cr
+            crlf += chunk.count(b'\r\n')
+            end = offset + len(chunk)
+            if chunk.endswith(b'\r') and end < size and mm[end:end + 1] == b'\n':
+                crlf += 1
+    return lf + cr - crlf, crlf
+
+
+def _head_end(mm, lines: int) -> int:
+    """Offset of the break ending line ``lines`` (1-based)."""
+    for i, match in enumerate(_BREAK.finditer(mm), 1):
+        if i == lines:
+            return match.start()
+    return len(mm)
+
+
+def _tail_start(mm, lines: int) -> int:
+    """Offset just after the break preceding the last ``lines`` lines."""
+    end = len(mm)
+    for _ in range(lines):
+        pos = max(mm.rfind(b'\n', 0, end), mm.rfind(b'\r', 0, end))
+        if pos < 0:
+            return 0
+        if mm[pos:pos + 1] == b'\n' and pos > 0 and mm[pos - 1:pos] == b'\r':
+            end = pos - 1
+        else:
+            end = pos
+        start = pos + 1
+    return start
+
+
+def _in_block(mm, end: int, begin_marker: bytes, end_marker: bytes) -> bool:
+    """Whether the last line before ``end`` containing a marker contains ``begin_marker``."""
+    begin = mm.rfind(begin_marker, 0, end)
+    if begin < 0:
+        return False
+    close = mm.rfind(end_marker, 0, end)
+    return close < begin or _BREAK.search(mm, begin, close) is None
+
+
+def decode_text(data: bytes, encoding: str) -> str:
+    """Decode bytes the way ``Path.read_text(errors='ignore')`` would."""
+    return data.decode(encoding, errors='ignore').replace('\r\n', '\n').replace('\r', '\n')
+
+
+def read_head_tail(
+    path: Path,
+    head_lines: int,
+    tail_lines: int,
+    min_lines: int,
+    block_markers: Tuple[bytes, bytes] = (b'-----BEGIN', b'-----END')
+) -> Optional[HeadTail]:
+    """Read the first ``head_lines`` and last ``tail_lines`` lines of a file.
+
+    The file is memory-mapped: line breaks are counted in fixed-size chunks,
+    the head is found scanning forward and the tail scanning backward from
+    EOF, so memory use does not grow with the file.
+
+    Returns:
+        The excerpt, or None if the file has at most ``min_lines`` lines (or
+        cannot be mapped) and should be read whole instead
+    """
+    encoding = locale.getpreferredencoding(False)
+    with open(path, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            return None
+    with mm:
+        breaks, crlf = count_line_breaks(mm)
+        line_count = breaks + 1
+        if line_count <= min_lines or head_lines + tail_lines >= line_count:
+            return None
+        head_end = _head_end(mm, head_lines)
+        tail_start = _tail_start(mm, tail_lines)
+        
+        # Context windows are widened to whole lines
+        after_end = _BREAK.search(mm, min(head_end + CONTEXT_BYTES, len(mm)))
+        after_end = after_end.start() if after_end else len(mm)
+        before_start = _BREAK.search(mm, max(tail_start - CONTEXT_BYTES, 0), tail_start)
+        before_start = before_start.end() if before_start else tail_start
+        return HeadTail(
+            line_count=line_count,
+            text_bytes=len(mm) - crlf,
+            head=decode_text(mm[:head_end], encoding),
+            tail=decode_text(mm[tail_start:], encoding),
+            after_head=decode_text(mm[head_end:after_end], encoding),
+            before_tail=decode_text(mm[before_start:tail_start], encoding),
+            in_block=_in_block(mm, before_start, *block_markers),
+        )
@@ -0,0 +1,316 @@
+"""Python import graph kept current from watcher events."""
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+import hashlib
+import os
+import re
+import threading
+import time
+from .changes import ChangeBatch
+from .file_index import RACY_MTIME_NS
+
+
+class RawImport(NamedTuple):
+    """One imported module as written, before it is resolved to a repo path."""
+    level: int
+    module: str
+    names: Tuple[str, ...] = ()
+
+
+# Start of an ``import`` or ``from ... import`` statement at the beginning of a line
+_STATEMENT = re.compile(r'^[ \t]*(?:from[ \t]+[.\w]+[ \t]+import\b|import[ \t]+\w)', re.M)
+_FROM = re.compile(r'\s*from\s+(\.*)\s*([\w.]*)\s+import\s+(.*)', re.S)
+
+# Longest statement scanned, in lines, when parentheses are never closed
+_MAX_STATEMENT_LINES = 200
+
+
+def _statement_at(source: str, pos: int) -> str:
+    """Logical line starting at ``pos``, joined across parentheses and backslashes, without comments."""
+    parts = []
+    depth = 0
+    for _ in range(_MAX_STATEMENT_LINES):
+        end = source.find('\n', pos)
+        if end == -1:
+            end = len(source)
+        line = source[pos:end].split('#', 1)[0]
+        parts.append(line.rstrip().rstrip('\\'))
+        depth += line.count('(') - line.count(')')
+        if end == len(source) or (depth <= 0 and not line.rstrip().endswith('\\')):
+            break
+        pos = end + 1
+    return ' '.join(parts).split(';', 1)[0].replace('(', ' ').replace(')', ' ')
+
+
+def _is_dotted(name: str) -> bool:
+    return all(part.isidentifier() for part in name.split('.'))
+
+
+def parse_imports(source: str) -> List[RawImport]:
+    """Extract the imports of Python source text.
+
+    Statements are found with a line scan rather than a full parse, so files
+    with syntax errors still yield their imports, and a 1000-line module is
+    scanned in well under a millisecond. ``from x import a, b`` yields one
+    entry with both names; ``import a, b`` yields one entry per module.
+    """
+    imports: List[RawImport] = []
+    for match in _STATEMENT.finditer(source):
+        statement = _statement_at(source, match.start())
+        parsed = _FROM.match(statement)
+        if parsed is not None:
+            dots, module, names = parsed.groups()
+            if module and not _is_dotted(module):
+                continue
+            names = tuple(n.split()[0] for n in names.split(',') if n.split() and n.split()[0].isidentifier())
+            imports.append(RawImport(len(dots), module, names))
+            continue
+        for name in statement.split(None, 1)[1].split(','):
+            words = name.split()
+            if words and _is_dotted(words[0]):
+                imports.append(RawImport(0, words[0]))
+    return imports
+
+
+def _module_key(path: str) -> str:
+    """Module key of a Python file: its path without ``.py``, or its package directory."""
+    if path == '__init__.py':
+        return ''
+    if path.endswith('/__init__.py'):
+        return path[:-len('/__init__.py')]
+    return path[:-3]
+
+
+def _join(*parts: str) -> str:
+    return '/'.join(filter(None, parts))
+
+
+class ImportGraph:
+    """Module-to-module edges of the Python files in a repository.
+
+    Every import is resolved to the repo file it loads: relative imports from
+    the importing package, absolute ones from the repository root, from each
+    directory holding a top-level package (such as ``src``) and, for scripts
+    outside a package, from the script's own directory. Imports of modules
+    that are not in the repository are dropped.
+
+    Parsed imports are cached by content hash, with the hash remembered by
+    path, ``mtime_ns`` and size, so re-checking an unchanged file costs one
+    ``stat``. Files are re-resolved incrementally: each candidate module key
+    maps back to the files whose imports could resolve to it, so adding or
+    removing a module only revisits those files. Adding or removing an
+    ``__init__.py`` changes package roots and re-resolves every file.
+    """
+
+    def __init__(self, root: Path, max_entries: int = 65536):
+        self.root = Path(root)
+        self.max_entries = max_entries
+        self._files: Set[str] = set()
+        self._imports: Dict[str, Tuple[RawImport, ...]] = {}
+        self._candidates: Dict[str, Tuple[Tuple[str, ...], ...]] = {}
+        self._edges: Dict[str, Tuple[str, ...]] = {}
+        self._wanted: Dict[str, Set[str]] = {}
+        self._roots: List[str] = ['']
+        self._digests: 'OrderedDict[str, Tuple[int, int, str]]' = OrderedDict()
+        self._parsed: 'OrderedDict[str, Tuple[RawImport, ...]]' = OrderedDict()
+        self._unsubscribe: Optional[Callable[[], None]] = None
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_live_index(cls, live_index, **kwargs) -> 'ImportGraph':
+        """Build from a ``LiveIndex`` and follow its added and removed files."""
+        graph = cls(live_index.file_index.root, **kwargs)
+        graph._unsubscribe = live_index.subscribe(graph.apply, replay=True)
+        return graph
+
+    def close(self):
+        """Stop following the live index."""
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def imports(self, path) -> List[Path]:
+        """Repo files imported directly by a file."""
+        with self._lock:
+            return [Path(p) for p in self._edges.get(Path(path).as_posix(), ())]
+
+    def dependencies(self, paths: Iterable, hops: int = 1) -> List[Path]:
+        """Files reachable from ``paths`` in at most ``hops`` imports, nearest first.
+
+        The starting files are not included; each hop is sorted by path.
+        """
+        with self._lock:
+            frontier = [Path(p).as_posix() for p in paths]
+            seen = set(frontier)
+            found: List[str] = []
+            for _ in range(hops):
+                reached = []
+                for path in frontier:
+                    for dep in self._edges.get(path, ()):
+                        if dep not in seen:
+                            seen.add(dep)
+                            reached.append(dep)
+                if not reached:
+                    break
+                found.extend(sorted(reached))
+                frontier = reached
+            return [Path(p) for p in found]
+
+    def apply(self, added: List[Path], removed: List[Path]):
+        """Apply a ``LiveIndex`` delta: parse new modules and re-resolve affected importers."""
+        added = [p.as_posix() for p in map(Path, added) if p.suffix == '.py']
+        removed = [p.as_posix() for p in map(Path, removed) if p.suffix == '.py']
+        if not added and not removed:
+            return
+        parsed = {path: self._read_imports(path) for path in added}
+        with self._lock:
+            affected: Set[str] = set()
+            for path in removed:
+                if path in self._files:
+                    self._files.discard(path)
+                    self._set_imports(path, None)
+                    affected |= self._wanted.get(_module_key(path), set())
+            for path in added:
+                self._files.add(path)
+                self._imports[path] = parsed[path]
+                affected |= self._wanted.get(_module_key(path), set())
+            if any(p.rpartition('/')[2] == '__init__.py' for p in added + removed):
+                self._roots = self._package_roots()
+                affected = set(self._files)
+            else:
+                affected |= set(added)
+            for path in affected & self._files:
+                self._resolve(path)
+
+    def apply_batch(self, batch: ChangeBatch):
+        """Re-parse the modules changed in a watcher batch; an overflow re-checks every file."""
+        if batch.overflow:
+            with self._lock:
+                paths = list(self._files)
+        else:
+            # Files replaced in place (atomic saves) arrive as ``created``
+            paths = [path for path, event_type in batch.changes if event_type in ('created', 'modified')]
+        for path in paths:
+            self.refresh(path)
+
+    def refresh(self, path):
+        """Re-read one indexed module and re-resolve it if its imports changed."""
+        path = Path(path).as_posix()
+        with self._lock:
+            if path not in self._files:
+                return
+        imports = self._read_imports(path)
+        with self._lock:
+            if path in self._files and imports != self._imports.get(path):
+                self._imports[path] = imports
+                self._resolve(path)
+
+    def _read_imports(self, path: str) -> Tuple[RawImport, ...]:
+        full_path = os.path.join(self.root, path)
+        try:
+            st = os.stat(full_path)
+        except OSError:
+            return ()
+        with self._lock:
+            known = self._digests.get(path)
+            if known is not None and known[:2] == (st.st_mtime_ns, st.st_size):
+                cached = self._parsed.get(known[2])
+                if cached is not None:
+                    self._parsed.move_to_end(known[2])
+                    return cached
+
+        try:
+            source = Path(full_path).read_bytes()
+        except OSError:
+            return ()
+        digest = hashlib.blake2b(source, digest_size=16).hexdigest()
+        with self._lock:
+            if st.st_mtime_ns < time.time_ns() - RACY_MTIME_NS:
+                self._digests[path] = (st.st_mtime_ns, st.st_size, digest)
+                self._digests.move_to_end(path)
+                while len(self._digests) > self.max_entries:
+                    self._digests.popitem(last=False)
+            cached = self._parsed.get(digest)
+            if cached is not None:
+                self._parsed.move_to_end(digest)
+                return cached
+
+        imports = tuple(parse_imports(source.decode('utf-8', errors='ignore')))
+        with self._lock:
+            self._parsed[digest] = imports
+            while len(self._parsed) > self.max_entries:
+                self._parsed.popitem(last=False)
+        return imports
+
+    def _package_roots(self) -> List[str]:
+        """Repository root plus every directory that holds a top-level package."""
+        packages = {_module_key(p) for p in self._files if p.rpartition('/')[2] == '__init__.py'}
+        roots = {package.rpartition('/')[0] for package in packages if package and package.rpartition('/')[0] not in packages}
+        roots.discard('')
+        return [''] + sorted(roots)
+
+    def _candidate_keys(self, path: str) -> Tuple[Tuple[str, ...], ...]:
+        """For each module a file imports, the keys it may resolve to, most likely first."""
+        directory = path.rpartition('/')[0]
+        in_package = _join(directory, '__init__.py') in self._files
+        bases = list(self._roots)
+        if not in_package and directory not in bases:
+            # A script's own directory comes first on ``sys.path``
+            bases.insert(0, directory)
+        targets = []
+        for raw in self._imports.get(path, ()):
+            if raw.level:
+                parts = directory.split('/') if directory else []
+                if raw.level - 1 > len(parts):
+                    continue
+                search = ['/'.join(parts[:len(parts) - raw.level + 1])]
+            else:
+                search = bases
+            module = raw.module.replace('.', '/')
+            if raw.names:
+                for name in raw.names:
+                    targets.append(tuple(k for base in search for k in (_join(base, module, name), _join(base, module)) if k))
+            else:
+                targets.append(tuple(_join(base, module) for base in search if module))
+        return tuple(targets)
+
+    def _module_file(self, key: str) -> Optional[str]:
+        for path in (_join(key, '__init__.py'), key + '.py'):
+            if path in self._files:
+                return path
+        return None
+
+    def _set_imports(self, path: str, candidates: Optional[Tuple[Tuple[str, ...], ...]]):
+        """Replace the candidate keys of a file, keeping the reverse ``_wanted`` map in step."""
+        for key in {k for target in self._candidates.pop(path, ()) for k in target}:
+            wanted = self._wanted.get(key)
+            if wanted is not None:
+                wanted.discard(path)
+                if not wanted:
+                    del self._wanted[key]
+        if candidates is None:
+            self._imports.pop(path, None)
+            self._edges.pop(path, None)
+            return
+        self._candidates[path] = candidates
+        for key in {k for target in candidates for k in target}:
+            self._wanted.setdefault(key, set()).add(path)
+
+    def _resolve(self, path: str):
+        candidates = self._candidate_keys(path)
+        if candidates != self._candidates.get(path):
+            self._set_imports(path, candidates)
+        edges = []
+        for target in candidates:
+            for key in target:
+                module = self._module_file(key)
+                if module is not None:
+                    if module != path and module not in edges:
+                        edges.append(module)
+                    break
+        self._edges[path] = tuple(edges)
@@ -1,36 +1,105 @@
 from pathlib import Path
-import fnmatch
-from typing import List
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import os
+from typing import Callable, List, Optional, Tuple
+from .binary import BinaryDetector
+from .gitignore import GitIgnore, git_ls_files
+from .matcher import PathFilter
 
 
-def list_repo_files(root: Path, include: List[str], exclude: List[str]) -> List[Path]:
+def scan_directory(
+    root: Path,
+    rel_dir: str,
+    path_filter: PathFilter,
+    gitignore: Optional[GitIgnore] = None
+) -> Tuple[List[str], List[str]]:
+    """Scan one directory and return its (files, subdirectories) as relative paths.
+
+    Directories excluded as a whole (e.g. ``node_modules/**``) or ignored by
+    ``gitignore`` are not returned, so they are never entered. Symlinked
+    directories are not followed, matching ``rglob``.
+    """
+    files, subdirs = [], []
+    try:
+        with os.scandir(root / rel_dir if rel_dir else root) as it:
+            entries = list(it)
+    except OSError:
+        return files, subdirs
+    for entry in entries:
+        rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                if path_filter.prunes_dir(rel) or (gitignore and gitignore.is_ignored_entry(rel, is_dir=True)):
+                    continue
+                subdirs.append(rel)
+            elif entry.is_file():
+                if gitignore and gitignore.is_ignored_entry(rel):
+                    continue
+                files.append(rel)
+        except OSError:
+            continue
+    return files, subdirs
+
+
+def walk_tree(scan: Callable[[str], Tuple[List[str], List[str]]], workers: int = 0, start: str = '') -> List[str]:
+    """Walk a tree from ``start`` (the root by default), calling ``scan(rel_dir)`` per directory.
+
+    With ``workers > 1`` directory scans are fanned out to a bounded thread
+    pool. Result order depends on scheduling; callers sort the merged list.
+    """
+    rel_files = []
+    if workers <= 1:
+        stack = [start]
+        while stack:
+            files, subdirs = scan(stack.pop())
+            rel_files.extend(files)
+            stack.extend(subdirs)
+        return rel_files
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ctx-scan') as pool:
+        pending = {pool.submit(scan, start)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirs = future.result()
+                rel_files.extend(files)
+                pending.update(pool.submit(scan, d) for d in subdirs)
+    return rel_files
+
+
+def list_repo_files(
+    root: Path,
+    include: List[str],
+    exclude: List[str],
+    workers: int = 0,
+    gitignore: Optional[GitIgnore] = None,
+    use_git: bool = False,
+    binary_detector: Optional[BinaryDetector] = None
+) -> List[Path]:
     """
     List all files in repository matching include patterns and not matching exclude patterns.
-    
+
     Args:
         root: Repository root path
         include: List of glob patterns to include (e.g., ['*.py', '*.js'])
         exclude: List of glob patterns to exclude (e.g., ['node_modules/**', '.git/**'])
-    
+        workers: Scan directories on this many threads (0 or 1 scans serially)
+        gitignore: Skip paths ignored by nested ``.gitignore`` files
+        use_git: List files with one ``git ls-files`` call when root is a git repo
+        binary_detector: Leave out files whose content looks binary
+
     Returns:
         Sorted list of relative file paths
     """
-    all_files = []
-    for p in root.rglob('*'):
-        if not p.is_file():
-            continue
-        
-        rel = p.relative_to(root)
-        rel_str = str(rel)
-        
-        # Check exclude patterns first
-        if any(fnmatch.fnmatch(rel_str, ex) for ex in exclude):
-            continue
-        
-        # Check include patterns
-        if include and any(fnmatch.fnmatch(rel_str, inc) for inc in include):
-            all_files.append(rel)
-        elif not include:  # If no include patterns, include all non-excluded
-            all_files.append(rel)
-    
+    path_filter = PathFilter(include, exclude)
+    rel_files = git_ls_files(root) if use_git else None
+    if rel_files is None:
+        if gitignore is not None:
+            gitignore.refresh()
+        rel_files = walk_tree(lambda rel_dir: scan_directory(root, rel_dir, path_filter, gitignore), workers)
+    all_files = [
+        Path(rel_str) for rel_str in rel_files
+        if path_filter.is_included(rel_str)
+        and not (binary_detector and binary_detector.is_binary_listed(root / rel_str))
+    ]
     return sorted(all_files)
@@ -0,0 +1,183 @@
+"""Live in-memory file index kept current from watcher events."""
+
+from bisect import bisect_left
+from pathlib import Path
+from operator import attrgetter
+from typing import Callable, List, Optional, Set, Tuple
+import threading
+from .file_index import FileIndex
+from .indexer import scan_directory, walk_tree
+from .changes import ChangeBatch
+
+
+# Listener signature: (added, removed) relative paths in sorted order
+IndexListener = Callable[[List[Path], List[Path]], None]
+
+
+class LiveIndex:
+    """Sorted set of indexed file paths with incremental updates.
+
+    Paths are kept in ``Path`` order in parallel lists of ``parts`` keys and
+    ``Path`` objects, so lookups are binary searches and single-file events
+    touch one slot. A full rescan through the wrapped ``FileIndex`` only
+    happens on ``rescan()`` or when an ``overflow`` event is applied.
+    """
+
+    def __init__(self, file_index: FileIndex):
+        self.file_index = file_index
+        self.version = 0
+        self._keys: List[Tuple[str, ...]] = []
+        self._paths: List[Path] = []
+        self._listeners: List[IndexListener] = []
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_config(cls, config, **kwargs) -> 'LiveIndex':
+        """Create a live index over ``FileIndex.from_config(config, **kwargs)``."""
+        live = cls(FileIndex.from_config(config, **kwargs))
+        live.rescan()
+        return live
+
+    def subscribe(self, listener: IndexListener, replay: bool = False) -> Callable[[], None]:
+        """Register a listener for index deltas. Returns an unsubscribe function.
+
+        With ``replay`` the listener first receives every indexed path as
+        added, under the same lock, so no delta is missed or seen twice.
+        """
+        with self._lock:
+            if replay and self._paths:
+                listener(list(self._paths), [])
+            self._listeners.append(listener)
+
+        def unsubscribe():
+            with self._lock:
+                if listener in self._listeners:
+                    self._listeners.remove(listener)
+        return unsubscribe
+
+    def _notify(self, added: List[Path], removed: List[Path]):
+        if not added and not removed:
+            return
+        self.version += 1
+        for listener in list(self._listeners):
+            listener(added, removed)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def __contains__(self, path) -> bool:
+        key = Path(path).parts
+        i = bisect_left(self._keys, key)
+        return i < len(self._keys) and self._keys[i] == key
+
+    def files(self) -> List[Path]:
+        """Return a sorted snapshot of all indexed paths."""
+        with self._lock:
+            return list(self._paths)
+
+    def rescan(self):
+        """Replace the contents with a full scan, notifying listeners of the delta."""
+        paths = self.file_index.scan()
+        with self._lock:
+            old, new = set(self._paths), set(paths)
+            self._paths = paths
+            self._keys = [p.parts for p in paths]
+            added = sorted(new - old, key=attrgetter('parts'))
+            removed = sorted(old - new, key=attrgetter('parts'))
+            self._notify(added, removed)
+
+    def _accepts(self, rel: str) -> bool:
+        if not self.file_index.path_filter.is_included(rel):
+            return False
+        gitignore = self.file_index.gitignore
+        if gitignore is not None and gitignore.is_ignored(rel):
+            return False
+        return not self.file_index.is_binary(rel)
+
+    def _insert(self, path: Path) -> bool:
+        key = path.parts
+        i = bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            return False
+        self._keys.insert(i, key)
+        self._paths.insert(i, path)
+        return True
+
+    def _remove_tree(self, path: Path) -> List[Path]:
+        """Remove a file, or every path below a directory, returning what was removed."""
+        key = path.parts
+        lo = bisect_left(self._keys, key)
+        hi = lo
+        n = len(key)
+        while hi < len(self._keys) and self._keys[hi][:n] == key:
+            hi += 1
+        removed = self._paths[lo:hi]
+        del self._keys[lo:hi]
+        del self._paths[lo:hi]
+        return removed
+
+    def _scan_subtree(self, rel_dir: str) -> List[str]:
+        gitignore = self.file_index.gitignore
+        path_filter = self.file_index.path_filter
+        if path_filter.prunes_dir(rel_dir) or (gitignore and gitignore.is_ignored(rel_dir, is_dir=True)):
+            return []
+        root = self.file_index.root
+        return walk_tree(lambda d: scan_directory(root, d, path_filter, gitignore), start=rel_dir)
+
+    def _apply_locked(self, event_type: str, path, dest: Optional[str], added: Set[Path], removed: Set[Path]):
+        """Apply one structural event, folding its effect into net added/removed sets.
+
+        A ``created`` path drops whatever was indexed under it first, so a
+        directory replaced within one batch is rescanned rather than merged.
+        """
+        if event_type in ('deleted', 'moved', 'created'):
+            for p in self._remove_tree(Path(path)):
+                if p in added:
+                    added.discard(p)
+                else:
+                    removed.add(p)
+        target = dest if event_type == 'moved' else path if event_type == 'created' else None
+        if target is None:
+            return
+        rel = Path(target).as_posix()
+        full = self.file_index.root / rel
+        if full.is_dir():
+            candidates = [c for c in self._scan_subtree(rel) if self._accepts(c)]
+        else:
+            candidates = [rel] if self._accepts(rel) and full.exists() else []
+        for candidate in candidates:
+            p = Path(candidate)
+            if self._insert(p):
+                if p in removed:
+                    removed.discard(p)
+                else:
+                    added.add(p)
+
+    def apply(self, event_type: str, path, dest: Optional[str] = None):
+        """Apply one watcher event given as a repo-relative path.
+
+        Args:
+            event_type: ``created``, ``modified``, ``deleted``, ``moved`` or ``overflow``
+            path: Repo-relative source path (ignored for ``overflow``)
+            dest: Repo-relative destination for ``moved`` events
+        """
+        if event_type == 'overflow':
+            self.rescan()
+            return
+        added: Set[Path] = set()
+        removed: Set[Path] = set()
+        with self._lock:
+            self._apply_locked(event_type, path, dest, added, removed)
+            self._notify(sorted(added, key=attrgetter('parts')), sorted(removed, key=attrgetter('parts')))
+
+    def apply_batch(self, batch: ChangeBatch):
+        """Apply a coalesced watcher batch, rescanning if it overflowed."""
+        if batch.overflow:
+            self.rescan()
+            return
+        added: Set[Path] = set()
+        removed: Set[Path] = set()
+        with self._lock:
+            for path, event_type in batch.changes:
+                self._apply_locked(event_type, path, None, added, removed)
+            self._notify(sorted(added, key=attrgetter('parts')), sorted(removed, key=attrgetter('parts')))
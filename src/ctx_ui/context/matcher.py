@@ -0,0 +1,152 @@
+"""Compiled glob matching shared by the indexer, watcher and scope checks."""
+
+from functools import lru_cache
+from typing import List, Optional, Sequence
+import os
+import re
+
+
+def translate_glob(pattern: str) -> str:
+    """Translate a glob pattern into a regex source string.
+
+    Semantics follow ``.gitignore`` style globbing:
+    - ``*`` and ``?`` never cross a ``/``
+    - ``**/`` matches zero or more directories, a trailing ``/**`` everything below
+    - patterns without a ``/`` match the file name at any depth
+    - a leading ``/`` anchors the pattern to the root, a trailing ``/`` means ``/**``
+    """
+    pat = pattern.strip()
+    # A trailing ``/`` does not anchor: ``build/`` matches ``pkg/build/`` too
+    whole_dir = pat.endswith('/')
+    pat = pat.rstrip('/')
+    anchored = pat.startswith('/') or '/' in pat
+    pat = pat.lstrip('/')
+    if whole_dir:
+        pat += '/**'
+
+    parts = []
+    i, n = 0, len(pat)
+    while i < n:
+        c = pat[i]
+        if pat.startswith('**/', i):
+            parts.append('(?:.*/)?')
+            i += 3
+        elif pat.startswith('**', i):
+            parts.append('.*')
+            i += 2
+        elif c == '*':
+            parts.append('[^/]*')
+            i += 1
+        elif c == '?':
+            parts.append('[^/]')
+            i += 1
+        elif c == '[':
+            start = i + 1
+            if pat[start:start + 1] in ('!', '^'):
+                start += 1
+            if pat[start:start + 1] == ']':
+                start += 1
+            end = pat.find(']', start)
+            if end == -1:
+                parts.append(re.escape(c))
+                i += 1
+                continue
+            body = pat[i + 1:end]
+            if body[0] in ('!', '^'):
+                body = '^' + body[1:]
+            parts.append('[' + body.replace('\\', '\\\\') + ']')
+            i = end + 1
+        else:
+            parts.append(re.escape(c))
+            i += 1
+
+    regex = ''.join(parts)
+    if not anchored:
+        regex = '(?:.*/)?' + regex
+    return regex
+
+
+def _normalize(path) -> str:
+    """Return a path as a ``/``-separated relative string."""
+    path = str(path)
+    if os.sep != '/':
+        path = path.replace(os.sep, '/')
+    return path
+
+
+class PathMatcher:
+    """A set of glob patterns compiled into a single alternation regex."""
+
+    def __init__(self, patterns: Sequence[str]):
+        self.patterns = list(patterns)
+        if self.patterns:
+            # One capturing group per pattern lets first_match() name the winner
+            source = '|'.join(f'({translate_glob(p)})' for p in self.patterns)
+            self._regex = re.compile(rf'(?s:{source})\Z')
+        else:
+            self._regex = None
+
+        # Whole-tree patterns (``node_modules/**``) also match ``<dir>/`` itself
+        dir_sources = [translate_glob(p) for p in self.patterns if p.strip().endswith(('**', '/'))]
+        self._dir_regex = re.compile(rf"(?s:{'|'.join(dir_sources)})\Z") if dir_sources else None
+
+    def __bool__(self) -> bool:
+        return bool(self.patterns)
+
+    def match(self, path) -> bool:
+        """Check if a relative path matches any pattern."""
+        return self._regex is not None and self._regex.match(_normalize(path)) is not None
+
+    def first_match(self, path) -> Optional[str]:
+        """Return the first pattern matching a relative path, or None."""
+        if self._regex is None:
+            return None
+        m = self._regex.match(_normalize(path))
+        if m is None:
+            return None
+        for idx, group in enumerate(m.groups()):
+            if group is not None:
+                return self.patterns[idx]
+        return None
+
+    def matches_dir(self, rel_dir) -> bool:
+        """Check if every path below a relative directory is matched."""
+        return self._dir_regex is not None and self._dir_regex.match(_normalize(rel_dir) + '/') is not None
+
+
+@lru_cache(maxsize=64)
+def _compile(patterns: tuple) -> PathMatcher:
+    return PathMatcher(patterns)
+
+
+def compile_patterns(patterns: Sequence[str]) -> PathMatcher:
+    """Compile a pattern list, reusing the matcher for identical lists."""
+    return _compile(tuple(patterns or ()))
+
+
+class PathFilter:
+    """Include/exclude pattern sets compiled once for repeated path checks."""
+
+    def __init__(self, include: List[str], exclude: List[str]):
+        self.include = compile_patterns(include)
+        self.exclude = compile_patterns(exclude)
+
+    @classmethod
+    def from_config(cls, config) -> 'PathFilter':
+        """Build a filter from ``AppConfig.index_include``/``index_exclude``."""
+        return cls(config.index_include, config.index_exclude)
+
+    def is_excluded(self, path) -> bool:
+        """Check if a relative path matches an exclude pattern."""
+        return self.exclude.match(path)
+
+    def is_included(self, path) -> bool:
+        """Check if a relative path passes both pattern sets."""
+        path = _normalize(path)
+        if self.exclude.match(path):
+            return False
+        return not self.include or self.include.match(path)
+
+    def prunes_dir(self, rel_dir) -> bool:
+        """Check if a directory is excluded as a whole and need not be walked."""
+        return self.exclude.matches_dir(rel_dir)
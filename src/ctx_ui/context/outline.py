@@ -0,0 +1,152 @@
+"""Outlines of source files: signatures and docstrings kept, bodies collapsed to ``...``."""
+
+from typing import Collection, Iterable, List, Optional, Tuple
+import ast
+from .syntax import TS_CLASSES, TS_FUNCTIONS, node_name, tree_sitter_parser
+
+# (first line, last line, indent) of a span replaced by ``<indent>...``
+Collapse = Tuple[int, int, str]
+
+_COMPOUND = (ast.If, ast.Try, ast.With, ast.AsyncWith, ast.For, ast.AsyncFor, ast.While)
+_DEFS = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+_IMPORTS = (ast.Import, ast.ImportFrom)
+
+
+def _indent(line: str) -> str:
+    return line[:len(line) - len(line.lstrip())]
+
+
+def _is_docstring(node: ast.stmt) -> bool:
+    return (
+        isinstance(node, ast.Expr)
+        and isinstance(node.value, ast.Constant)
+        and isinstance(node.value.value, str)
+    )
+
+
+def _keeps_structure(node: ast.stmt) -> bool:
+    """Whether a compound statement holds definitions or imports worth keeping."""
+    return any(isinstance(child, _DEFS + _IMPORTS) for child in ast.walk(node) if child is not node)
+
+
+def _python_collapses(lines: List[str], body: List[ast.stmt], prefix: str, in_class: bool, pinned: Collection[str]) -> List[Collapse]:
+    """Collapse spans of one block; runs of dropped statements share one ``...``."""
+    collapses: List[Collapse] = []
+    run: Optional[List[int]] = None
+
+    def flush():
+        nonlocal run
+        if run is not None:
+            collapses.append((run[0], run[1], _indent(lines[run[0] - 1])))
+            run = None
+
+    for i, node in enumerate(body):
+        if isinstance(node, _DEFS):
+            flush()
+            name = prefix + node.name
+            if name not in pinned:
+                collapses.extend(_python_def_collapses(lines, node, name, pinned))
+        elif isinstance(node, _IMPORTS) or (i == 0 and _is_docstring(node)):
+            flush()
+        elif in_class and isinstance(node, (ast.Assign, ast.AnnAssign)) and node.lineno == node.end_lineno:
+            # One-line class attributes and fields are part of the class signature
+            flush()
+        elif isinstance(node, _COMPOUND) and _keeps_structure(node):
+            flush()
+            for field in ('body', 'orelse', 'finalbody'):
+                collapses.extend(_python_collapses(lines, getattr(node, field, []), prefix, in_class, pinned))
+            for handler in getattr(node, 'handlers', ()):
+                collapses.extend(_python_collapses(lines, handler.body, prefix, in_class, pinned))
+        elif run is None:
+            run = [node.lineno, node.end_lineno]
+        else:
+            run[1] = node.end_lineno
+    flush()
+    return collapses
+
+
+def _python_def_collapses(lines: List[str], node, name: str, pinned: Collection[str]) -> List[Collapse]:
+    body = node.body
+    if isinstance(node, ast.ClassDef):
+        return _python_collapses(lines, body, name + '.', True, pinned)
+    if body and _is_docstring(body[0]):
+        body = body[1:]
+    if not body or body[0].lineno == node.lineno:
+        # Docstring-only or one-line definitions are kept as they are
+        return []
+    return [(body[0].lineno, body[-1].end_lineno, _indent(lines[body[0].lineno - 1]))]
+
+
+def outline_python(source: str, pinned: Collection[str] = ()) -> Optional[str]:
+    """Outline Python source with ``ast``.
+
+    Imports, decorators, class and function signatures, docstrings and
+    one-line class attributes are kept; function bodies and other top-level
+    code collapse to ``...``. ``pinned`` names (as ``Class.method``) keep
+    their whole body. Returns None if the source does not parse.
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return None
+    lines = source.split('\n')
+    return _apply_collapses(lines, _python_collapses(lines, tree.body, '', False, set(pinned)))
+
+
+def _apply_collapses(lines: List[str], collapses: Iterable[Collapse]) -> str:
+    out: List[str] = []
+    next_line = 1
+    for start, end, indent in sorted(collapses):
+        if start < next_line:
+            continue
+        out.extend(lines[next_line - 1:start - 1])
+        out.append(indent + '...')
+        next_line = end + 1
+    out.extend(lines[next_line - 1:])
+    return '\n'.join(out)
+
+
+def outline_tree_sitter(source: bytes, language: str, pinned: Collection[str] = ()) -> Optional[str]:
+    """Outline source with a tree-sitter grammar by collapsing function bodies.
+
+    Returns None when tree-sitter or the grammar is not installed.
+    """
+    parser = tree_sitter_parser(language)
+    if parser is None:
+        return None
+    pinned = set(pinned)
+    cuts: List[Tuple[int, int, bytes]] = []
+
+    def visit(node, prefix: str):
+        for child in node.named_children:
+            name = node_name(child) if child.type in TS_CLASSES or child.type in TS_FUNCTIONS else None
+            if name is None:
+                visit(child, prefix)
+            elif prefix + name in pinned:
+                continue
+            elif child.type in TS_CLASSES:
+                visit(child, prefix + name + '.')
+            else:
+                body = child.child_by_field_name('body')
+                if body is not None and body.start_point[0] != body.end_point[0]:
+                    braces = source[body.start_byte:body.start_byte + 1] == b'{'
+                    cuts.append((body.start_byte, body.end_byte, b'{ ... }' if braces else b'...'))
+
+    visit(parser.parse(source).root_node, '')
+    out = []
+    pos = 0
+    for start, end, replacement in sorted(cuts):
+        if start < pos:
+            continue
+        out.append(source[pos:start])
+        out.append(replacement)
+        pos = end
+    out.append(source[pos:])
+    return b''.join(out).decode('utf-8', errors='ignore')
+
+
+def outline_source(source: str, language: str, pinned: Collection[str] = ()) -> Optional[str]:
+    """Outline source text in a language returned by ``symbols.language_for``."""
+    if language == 'python':
+        return outline_python(source, pinned)
+    return outline_tree_sitter(source.encode('utf-8', errors='replace'), language, pinned)
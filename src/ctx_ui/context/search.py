@@ -0,0 +1,173 @@
+"""Fuzzy file path search backed by a trigram index."""
+
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+import heapq
+import threading
+
+
+# Upper bound on paths scored by the fuzzy fallback
+FUZZY_CANDIDATE_CAP = 20000
+
+
+def _trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class PathSearchIndex:
+    """Ranked fuzzy search over repo-relative paths.
+
+    Every lower-cased path is split into trigrams with a posting list of path
+    ids per trigram. A query token of three or more characters only has to
+    check the paths in its rarest trigram's posting list, so lookups stay in
+    the millisecond range for hundreds of thousands of paths. Queries with
+    no substring hit fall back to ranking paths by shared trigrams, which
+    tolerates typos and missing separators (``mainview`` finds
+    ``main_view.py``).
+
+    Removed paths leave tombstones in the posting lists that are compacted
+    once they outnumber the live paths.
+    """
+
+    def __init__(self, paths: Iterable[Path] = ()):
+        self._paths: List[Optional[Path]] = []
+        self._lowered: List[Optional[str]] = []
+        self._ids: Dict[Path, int] = {}
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        self._name_prefixes: Dict[str, List[int]] = defaultdict(list)
+        self._dead = 0
+        self._unsubscribe: Optional[Callable[[], None]] = None
+        self._lock = threading.Lock()
+        self.add(paths)
+
+    @classmethod
+    def from_live_index(cls, live_index) -> 'PathSearchIndex':
+        """Build from a ``LiveIndex`` and follow its updates."""
+        index = cls()
+        index._unsubscribe = live_index.subscribe(index.apply, replay=True)
+        return index
+
+    def close(self):
+        """Stop following the live index."""
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, paths: Iterable[Path]):
+        """Index paths; already indexed ones are skipped."""
+        with self._lock:
+            for path in paths:
+                self._add_locked(path)
+
+    def _add_locked(self, path: Path):
+        if path in self._ids:
+            return
+        path_id = len(self._paths)
+        text = path.as_posix().lower()
+        self._ids[path] = path_id
+        self._paths.append(path)
+        self._lowered.append(text)
+        for gram in _trigrams(text):
+            self._postings[gram].append(path_id)
+        name = text[text.rfind('/') + 1:]
+        for prefix in {name[:1], name[:2]}:
+            self._name_prefixes[prefix].append(path_id)
+
+    def remove(self, paths: Iterable[Path]):
+        """Drop paths from the index; unknown ones are ignored."""
+        with self._lock:
+            for path in paths:
+                path_id = self._ids.pop(path, None)
+                if path_id is None:
+                    continue
+                self._paths[path_id] = None
+                self._lowered[path_id] = None
+                self._dead += 1
+            if self._dead > 1024 and self._dead > len(self._ids):
+                self._compact_locked()
+
+    def apply(self, added: List[Path], removed: List[Path]):
+        """Apply a ``LiveIndex`` delta."""
+        self.remove(removed)
+        self.add(added)
+
+    def _compact_locked(self):
+        live = [p for p in self._paths if p is not None]
+        self._paths, self._lowered, self._ids = [], [], {}
+        self._postings = defaultdict(list)
+        self._name_prefixes = defaultdict(list)
+        self._dead = 0
+        for path in live:
+            self._add_locked(path)
+
+    def search(self, query: str, limit: int = 50) -> List[Path]:
+        """Return up to ``limit`` paths matching a query, best first.
+
+        Whitespace separates tokens that must all appear in the path; a query
+        made only of one- or two-character tokens matches file name prefixes.
+        Exact substring hits rank first, preferring hits in the file name and
+        then shorter paths. Without any hit, trigram-similar paths are returned.
+        """
+        tokens = query.lower().replace('\\', '/').split()
+        if not tokens or limit <= 0:
+            return []
+
+        with self._lock:
+            ranked = heapq.nsmallest(limit, self._substring_hits(tokens), key=lambda i: self._rank(i, tokens))
+            if not ranked:
+                ranked = self._similar(tokens, limit)
+            return [self._paths[i] for i in ranked]
+
+    def _substring_hits(self, tokens: List[str]) -> Iterable[int]:
+        grams = [gram for token in tokens for gram in _trigrams(token)]
+        if grams:
+            postings = [self._postings.get(gram) for gram in grams]
+            if not all(postings):
+                return []
+            candidates = min(postings, key=len)
+        else:
+            # Too short for trigrams: match the start of file names instead
+            candidates = min((self._name_prefixes.get(token[:2], []) for token in tokens), key=len)
+        lowered = self._lowered
+        return [
+            i for i in candidates
+            if lowered[i] is not None and all(token in lowered[i] for token in tokens)
+        ]
+
+    def _rank(self, path_id: int, tokens: List[str]):
+        text = self._lowered[path_id]
+        name = text[text.rfind('/') + 1:]
+        in_name = sum(0 if name.startswith(t) else 1 if t in name else 2 for t in tokens)
+        return in_name, len(text), text
+
+    def _similar(self, tokens: List[str], limit: int) -> List[int]:
+        grams = set()
+        for token in tokens:
+            grams |= _trigrams(token)
+        postings = sorted((p for p in map(self._postings.get, grams) if p), key=len)
+        if not postings:
+            return []
+
+        # Candidates come from the rarest trigrams; every candidate is then
+        # scored against all query trigrams
+        candidates = set(postings[0][:FUZZY_CANDIDATE_CAP])
+        for posting in postings[1:]:
+            if len(candidates) + len(posting) > FUZZY_CANDIDATE_CAP:
+                break
+            candidates.update(posting)
+
+        threshold = max(1, (len(grams) + 1) // 2)
+        lowered = self._lowered
+        scored = []
+        for i in candidates:
+            text = lowered[i]
+            if text is None:
+                continue
+            count = sum(1 for gram in grams if gram in text)
+            if count >= threshold:
+                scored.append((-count, len(text), i))
+        return [i for _, _, i in heapq.nsmallest(limit, scored)]
@@ -0,0 +1,188 @@
+"""Function, class and method extraction with parse results cached by content hash."""
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Hashable, Iterable, List, NamedTuple, Optional, Tuple
+import ast
+import hashlib
+import os
+import threading
+import time
+from .file_index import RACY_MTIME_NS
+from .outline import outline_source
+from .syntax import TREE_SITTER_LANGUAGES, TS_CLASSES, TS_FUNCTION_VALUES, TS_FUNCTIONS, node_name, tree_sitter_parser
+
+
+class Symbol(NamedTuple):
+    """A definition with its 1-based, inclusive line range (decorators included)."""
+    name: str
+    kind: str
+    start: int
+    end: int
+
+
+def language_for(path) -> Optional[str]:
+    """Language name used to parse a file, or None if symbols cannot be extracted."""
+    suffix = os.path.splitext(str(path))[1].lower()
+    if suffix in ('.py', '.pyi'):
+        return 'python'
+    return TREE_SITTER_LANGUAGES.get(suffix)
+
+
+def extract_python_symbols(source: str) -> List[Symbol]:
+    """Extract top-level functions and classes and their methods with ``ast``.
+
+    Functions nested in functions are part of their parent. Definitions under
+    module-level ``if``/``try``/``with`` blocks are included. Returns an empty
+    list for sources that do not parse.
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return []
+    symbols: List[Symbol] = []
+
+    def visit(nodes: Iterable[ast.AST], prefix: str, in_class: bool):
+        for node in nodes:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                start = min([node.lineno] + [d.lineno for d in node.decorator_list])
+                name = prefix + node.name
+                if isinstance(node, ast.ClassDef):
+                    symbols.append(Symbol(name, 'class', start, node.end_lineno))
+                    visit(node.body, name + '.', True)
+                else:
+                    symbols.append(Symbol(name, 'method' if in_class else 'function', start, node.end_lineno))
+            elif isinstance(node, (ast.If, ast.Try, ast.With, ast.AsyncWith)) or type(node).__name__ == 'TryStar':
+                for field in ('body', 'orelse', 'finalbody'):
+                    visit(getattr(node, field, ()), prefix, in_class)
+                for handler in getattr(node, 'handlers', ()):
+                    visit(handler.body, prefix, in_class)
+
+    visit(tree.body, '', False)
+    return symbols
+
+
+def extract_tree_sitter_symbols(source: bytes, language: str) -> List[Symbol]:
+    """Extract functions, classes and methods with a tree-sitter grammar.
+
+    Returns an empty list when tree-sitter or the grammar is not installed.
+    """
+    parser = tree_sitter_parser(language)
+    if parser is None:
+        return []
+    symbols: List[Symbol] = []
+
+    def visit(node, prefix: str, in_class: bool):
+        for child in node.named_children:
+            kind = None
+            if child.type in TS_CLASSES:
+                kind = 'class'
+            elif child.type in TS_FUNCTIONS:
+                kind = 'method' if in_class else 'function'
+            elif child.type == 'variable_declarator':
+                value = child.child_by_field_name('value')
+                if value is not None and value.type in TS_FUNCTION_VALUES:
+                    kind = 'function'
+            name = node_name(child) if kind else None
+            if name is None:
+                visit(child, prefix, in_class)
+                continue
+            symbols.append(Symbol(prefix + name, kind, child.start_point[0] + 1, child.end_point[0] + 1))
+            if kind == 'class':
+                visit(child, prefix + name + '.', True)
+
+    visit(parser.parse(source).root_node, '', False)
+    return symbols
+
+
+def extract_symbols(source: bytes, language: str) -> List[Symbol]:
+    """Extract symbols from source bytes in a language returned by ``language_for``."""
+    if language == 'python':
+        return extract_python_symbols(source.decode('utf-8', errors='ignore'))
+    return extract_tree_sitter_symbols(source, language)
+
+
+class SymbolIndex:
+    """Parse files into symbols and outlines, caching the results by content hash.
+
+    A file's digest is remembered by path, ``mtime_ns`` and size, so an
+    unchanged file is neither re-read nor re-parsed; an edited file is parsed
+    again only if its content actually changed. Up to ``max_entries`` results
+    are kept, least recently used first out.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._results: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._digests: 'OrderedDict[str, Tuple[int, int, str]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def symbols(self, full_path: Path) -> List[Symbol]:
+        """Symbols of a file; empty for unsupported languages and unreadable files."""
+        language = language_for(full_path)
+        if language is None:
+            return []
+        key = os.fspath(full_path)
+        try:
+            st = os.stat(key)
+        except OSError:
+            return []
+        with self._lock:
+            known = self._digests.get(key)
+            if known is not None and known[:2] == (st.st_mtime_ns, st.st_size):
+                cached = self._results.get((known[2], language))
+                if cached is not None:
+                    self._results.move_to_end((known[2], language))
+                    return cached
+
+        try:
+            source = Path(key).read_bytes()
+        except OSError:
+            return []
+        digest = hashlib.blake2b(source, digest_size=16).hexdigest()
+        if st.st_mtime_ns < time.time_ns() - RACY_MTIME_NS:
+            with self._lock:
+                self._digests[key] = (st.st_mtime_ns, st.st_size, digest)
+                self._digests.move_to_end(key)
+                while len(self._digests) > self.max_entries:
+                    self._digests.popitem(last=False)
+        return self._parse(source, digest, language)
+
+    def symbols_for_text(self, text: str, language: str) -> List[Symbol]:
+        """Symbols of source text already in memory."""
+        source = text.encode('utf-8', errors='replace')
+        return self._parse(source, hashlib.blake2b(source, digest_size=16).hexdigest(), language)
+
+    def outline(self, text: str, language: str, pinned: Iterable[str] = ()) -> Optional[str]:
+        """Outline of source text (see ``outline.outline_source``), or None if it cannot be parsed."""
+        pinned = tuple(sorted(set(pinned)))
+        source = text.encode('utf-8', errors='replace')
+        key = ('outline', hashlib.blake2b(source, digest_size=16).hexdigest(), language, pinned)
+        return self._cached(key, lambda: outline_source(text, language, pinned))
+
+    def _parse(self, source: bytes, digest: str, language: str) -> List[Symbol]:
+        return self._cached((digest, language), lambda: extract_symbols(source, language))
+
+    def _cached(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                return self._results[key]
+
+        result = compute()
+        with self._lock:
+            self._results[key] = result
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+        return result
+
+
+def merge_ranges(symbols: Iterable[Symbol]) -> List[Tuple[int, int]]:
+    """Sorted line ranges covering the symbols, with overlapping or adjacent ones merged."""
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted((s.start, s.end) for s in symbols):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
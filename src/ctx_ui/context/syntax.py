@@ -0,0 +1,73 @@
+"""Tree-sitter grammars and node kinds shared by symbol extraction and outlines."""
+
+from functools import lru_cache
+from typing import Optional
+
+
+# Languages parsed with tree-sitter grammars, by file suffix
+TREE_SITTER_LANGUAGES = {
+    '.js': 'javascript', '.jsx': 'javascript', '.mjs': 'javascript', '.cjs': 'javascript',
+    '.ts': 'typescript', '.tsx': 'tsx', '.go': 'go', '.rs': 'rust', '.java': 'java',
+    '.c': 'c', '.h': 'c', '.cpp': 'cpp', '.hpp': 'cpp', '.cs': 'c_sharp', '.rb': 'ruby',
+    '.php': 'php', '.kt': 'kotlin', '.swift': 'swift',
+}
+
+# Node types treated as functions and as classes across the grammars
+TS_FUNCTIONS = {
+    'function_declaration', 'function_definition', 'function_item', 'generator_function_declaration',
+    'method_declaration', 'method_definition', 'method', 'singleton_method', 'constructor_declaration',
+}
+TS_CLASSES = {
+    'class_declaration', 'class_definition', 'class_specifier', 'class', 'module', 'interface_declaration',
+    'struct_item', 'struct_specifier', 'enum_item', 'enum_declaration', 'trait_item', 'impl_item',
+    'type_spec', 'object_declaration', 'protocol_declaration',
+}
+TS_FUNCTION_VALUES = {'arrow_function', 'function_expression', 'function'}
+
+# Definitions named by their ``type`` field (``impl Foo`` in Rust)
+TS_TYPE_NAMED = {'impl_item'}
+
+# Innermost nodes of C/C++ declarators that hold a function's name
+TS_DECLARATOR_NAMES = {'identifier', 'field_identifier', 'qualified_identifier', 'destructor_name', 'operator_name'}
+
+
+@lru_cache(maxsize=None)
+def tree_sitter_parser(language: str):
+    """Return a tree-sitter parser for a language, or None if no grammar is installed."""
+    for module in ('tree_sitter_language_pack', 'tree_sitter_languages'):
+        try:
+            get_parser = __import__(module, fromlist=['get_parser']).get_parser
+            return get_parser(language)
+        except ImportError:
+            continue
+        except Exception:
+            return None
+    return None
+
+
+def _declarator_name(node):
+    """Innermost name of a C/C++ declarator chain such as ``*f(int)`` or ``&Foo::get()``."""
+    while node is not None and node.type not in TS_DECLARATOR_NAMES:
+        inner = node.child_by_field_name('declarator')
+        if inner is None and node.named_child_count:
+            # reference_declarator wraps its declarator without a field name
+            inner = node.named_children[-1]
+        node = inner
+    return node
+
+
+def node_name(node) -> Optional[str]:
+    """Name of a definition node, or None.
+
+    Most grammars have a ``name`` field. C and C++ functions are named by
+    their ``declarator`` (their ``type`` field is the return type), and
+    only kinds in ``TS_TYPE_NAMED`` are named by their ``type``.
+    """
+    name = node.child_by_field_name('name')
+    if name is None:
+        declarator = node.child_by_field_name('declarator')
+        if declarator is not None:
+            name = _declarator_name(declarator)
+        elif node.type in TS_TYPE_NAMED:
+            name = node.child_by_field_name('type')
+    return name.text.decode('utf-8', errors='replace') if name is not None else None
@@ -1,17 +1,48 @@
 from pydantic import BaseModel, Field
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple, Union
 from pathlib import Path
-import hashlib
 import json
+import os
+import stat
+from ..context.hashing import FileHasher, HashResult
+from ..storage.blobs import BlobStore
+
+# Shared by packs built without their own hasher, so repeated builds reuse known hashes
+_DEFAULT_HASHER = FileHasher()
 
 
 class Snippet(BaseModel):
-    """Represents a code snippet with file path and location."""
+    """Represents a code snippet with file path and location.
+
+    ``size``, ``mtime_ns`` and the git ``blob`` id are recorded when known,
+    so that ``ContextPack.verify`` can skip hashing unchanged files.
+    """
     path: str
     start: int = 1
     end: int = 9999
     hash: str
     why: str = ''
+    size: Optional[int] = None
+    mtime_ns: Optional[int] = None
+    blob: Optional[str] = None
+
+
+# Snippet states reported by ContextPack.verify
+FRESH = 'fresh'
+STALE = 'stale'
+MISSING = 'missing'
+
+
+class SnippetStatus(BaseModel):
+    """A snippet and whether the working tree still holds the content it was built from."""
+    snippet: Snippet
+    status: str
+
+
+def _git_entries(root: Path, paths: List[str]) -> Dict[str, Tuple[str, bool]]:
+    """Index blob ids and working-tree modification flags, from one git call."""
+    from ..watcher.repo_watcher import GitIntegration
+    return GitIntegration(root).get_index_entries(paths)
 
 
 class ContextPack(BaseModel):
@@ -21,25 +52,185 @@ class ContextPack(BaseModel):
     snippets: List[Snippet] = Field(default_factory=list)
 
     @staticmethod
-    def build_from_paths(root: Path, paths: List[str]) -> 'ContextPack':
-        """Build a context pack from file paths."""
+    def _fingerprint_files(
+        root: Path, paths: List[str], blob_store: Optional[BlobStore], hasher: Optional[FileHasher], use_git: bool
+    ) -> List[Union[Dict[str, Any], OSError]]:
+        """Snippet fields identifying each file's content, or the error for unreadable files.
+
+        Hashes cover the raw bytes (as ``compute_file_hash`` does) and the
+        content goes to ``blob_store``. Size and ``mtime_ns`` are recorded
+        when the stat vouches for the hash, and with ``use_git`` so is the
+        index blob id of files whose working tree matches the index.
+        """
+        hasher = hasher or _DEFAULT_HASHER
+        full_paths = [root / p for p in paths]
+        if blob_store is None:
+            results = hasher.hash_many_with_stats(full_paths)
+        else:
+            results = hasher.hash_many_with_stats(full_paths, blob_store.put_file)
+            # Known hashes skip put_file, so store content collected since it was last put
+            for i, result in enumerate(results):
+                if result.digest is not None and result.digest not in blob_store:
+                    try:
+                        results[i] = HashResult(blob_store.put_file(full_paths[i]), None)
+                    except OSError as e:
+                        results[i] = HashResult(None, None, e)
+        entries = _git_entries(root, paths) if use_git else {}
+        fingerprints: List[Union[Dict[str, Any], OSError]] = []
+        for p, (h, st, error) in zip(paths, results):
+            if h is None:
+                fingerprints.append(error)
+                continue
+            entry = entries.get(str(p))
+            fingerprints.append({
+                'hash': h,
+                'size': st.st_size if st is not None else None,
+                'mtime_ns': st.st_mtime_ns if st is not None else None,
+                'blob': entry[0] if entry is not None and not entry[1] else None,
+            })
+        return fingerprints
+
+    @staticmethod
+    def build_from_paths(
+        root: Path,
+        paths: List[str],
+        blob_store: Optional[BlobStore] = None,
+        hasher: Optional[FileHasher] = None,
+        use_git: bool = False
+    ) -> 'ContextPack':
+        """Build a context pack from file paths.
+
+        Files are hashed by ``hasher`` (a shared one by default), so only
+        files changed since they were last hashed are read. With a
+        ``blob_store`` the file contents are stored under their hashes, so the
+        pack can be rehydrated after the files change. ``use_git`` also
+        records git blob ids for ``verify(use_git=True)``.
+        """
         snips = []
-        for p in paths:
-            abs_p = root / p
-            try:
-                content = abs_p.read_text(errors='ignore')
-                h = hashlib.sha256(content.encode()).hexdigest()
-                snips.append(Snippet(path=str(p), hash=f'sha256:{h}'))
-            except Exception as e:
-                print(f"Warning: Could not read {p}: {e}")
+        for p, fingerprint in zip(paths, ContextPack._fingerprint_files(root, paths, blob_store, hasher, use_git)):
+            if isinstance(fingerprint, OSError):
+                print(f"Warning: Could not read {p}: {fingerprint}")
+                continue
+            snips.append(Snippet(path=str(p), **fingerprint))
         return ContextPack(snippets=snips)
 
-    def save(self, path: Path) -> Path:
-        """Save context pack to JSON file."""
+    @staticmethod
+    def build_from_symbols(
+        root: Path,
+        symbols: Dict[str, List[Any]],
+        blob_store: Optional[BlobStore] = None,
+        hasher: Optional[FileHasher] = None,
+        use_git: bool = False
+    ) -> 'ContextPack':
+        """Build a context pack with one snippet per selected symbol.
+
+        ``symbols`` maps file paths to records with ``name``, ``start`` and
+        ``end`` (such as ``context.symbols.Symbol``); snippets carry the file
+        hash and the symbol's line range. Files are hashed and stored as in
+        ``build_from_paths``.
+        """
+        snips = []
+        paths = list(symbols)
+        for p, fingerprint in zip(paths, ContextPack._fingerprint_files(root, paths, blob_store, hasher, use_git)):
+            if isinstance(fingerprint, OSError):
+                print(f"Warning: Could not read {p}: {fingerprint}")
+                continue
+            for symbol in symbols[p]:
+                snips.append(Snippet(path=str(p), start=symbol.start, end=symbol.end, why=symbol.name, **fingerprint))
+        return ContextPack(snippets=snips)
+
+    def verify(
+        self, root: Path, hasher: Optional[FileHasher] = None, use_git: bool = False
+    ) -> List['SnippetStatus']:
+        """Check every snippet against the working tree.
+
+        A file whose size and ``mtime_ns`` match the recorded ones is fresh
+        and a file of another size is stale, both without reading it; only
+        the remaining files are hashed. With ``use_git`` one ``git ls-files``
+        call first settles the snippets with a recorded blob id whose file is
+        clean in the index.
+        """
+        return ContextPack.verify_many([self], root, hasher, use_git)[0]
+
+    def diff(
+        self, root: Path, hasher: Optional[FileHasher] = None, use_git: bool = False
+    ) -> List['SnippetStatus']:
+        """The snippets that are stale or missing, as found by ``verify``."""
+        return [s for s in self.verify(root, hasher, use_git) if s.status != FRESH]
+
+    @staticmethod
+    def verify_many(
+        packs: List['ContextPack'], root: Path, hasher: Optional[FileHasher] = None, use_git: bool = False
+    ) -> List[List['SnippetStatus']]:
+        """``verify`` several packs, checking each distinct file version once and calling git once."""
+        hasher = hasher or _DEFAULT_HASHER
+        versions = {(s.path, s.hash, s.size, s.mtime_ns, s.blob) for pack in packs for s in pack.snippets}
+        entries = _git_entries(root, sorted({v[0] for v in versions})) if use_git else {}
+        statuses: Dict[tuple, str] = {}
+        to_hash = []
+        for version in versions:
+            path, _, size, mtime_ns, blob = version
+            entry = entries.get(path)
+            if blob is not None and entry is not None and not entry[1]:
+                statuses[version] = FRESH if entry[0] == blob else STALE
+                continue
+            try:
+                st = os.stat(root / path)
+            except OSError:
+                statuses[version] = MISSING
+                continue
+            if not stat.S_ISREG(st.st_mode):
+                statuses[version] = MISSING
+            elif size is not None and st.st_size != size:
+                statuses[version] = STALE
+            elif mtime_ns is not None and st.st_mtime_ns == mtime_ns:
+                statuses[version] = FRESH
+            else:
+                to_hash.append(version)
+        for version, h in zip(to_hash, hasher.hash_many([root / v[0] for v in to_hash])):
+            statuses[version] = MISSING if h is None else FRESH if h == version[1] else STALE
+        return [
+            [SnippetStatus(snippet=s, status=statuses[(s.path, s.hash, s.size, s.mtime_ns, s.blob)]) for s in pack.snippets]
+            for pack in packs
+        ]
+
+    def save(self, path: Path, blob_store: Optional[BlobStore] = None) -> Path:
+        """Save context pack to JSON file.
+
+        With a ``blob_store`` the saved file becomes the owner of the blobs
+        its snippets point to, replacing what an earlier save there held.
+        """
         path.parent.mkdir(parents=True, exist_ok=True)
         path.write_text(json.dumps(self.model_dump(), indent=2))
+        if blob_store is not None:
+            blob_store.retain(str(path.resolve()), {s.hash for s in self.snippets})
         return path
 
+    @staticmethod
+    def delete(path: Path, blob_store: Optional[BlobStore] = None):
+        """Delete a saved context pack and release its blobs for ``BlobStore.gc``."""
+        path.unlink(missing_ok=True)
+        if blob_store is not None:
+            blob_store.release(str(path.resolve()))
+
+    def rehydrate(self, blob_store: BlobStore) -> Dict[str, str]:
+        """File contents as they were when the pack was built, by path.
+
+        Raises:
+            KeyError: If a snippet's content is not in the blob store
+        """
+        contents: Dict[str, str] = {}
+        for snippet in self.snippets:
+            if snippet.path not in contents:
+                contents[snippet.path] = blob_store.get(snippet.hash).decode('utf-8', errors='ignore')
+        return contents
+
+    @staticmethod
+    def snippet_text(snippet: Snippet, blob_store: BlobStore) -> str:
+        """The lines a snippet covers, from the content stored under its hash."""
+        lines = blob_store.get(snippet.hash).decode('utf-8', errors='ignore').splitlines(keepends=True)
+        return ''.join(lines[snippet.start - 1:snippet.end])
+
     @staticmethod
     def load(path: Path) -> 'ContextPack':
         """Load context pack from JSON file."""
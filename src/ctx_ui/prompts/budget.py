@@ -0,0 +1,81 @@
+"""Spread a global token budget across the selected files."""
+
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+class FileCut(NamedTuple):
+    """A file shortened to fit the token budget; token counts are estimates."""
+    file_path: str
+    tokens: int
+    kept_tokens: int
+    line_count: int
+    kept_lines: int
+
+
+def allocate_budget(
+    costs: Dict[str, int],
+    budget: int,
+    priorities: Optional[Dict[str, float]] = None
+) -> Dict[str, int]:
+    """Split ``budget`` tokens between files by priority and size.
+
+    Budget is shared in proportion to priority (1.0 by default). Files that
+    need less than their share get exactly what they need and the rest is
+    shared again among the larger ones, so small files are kept whole and
+    only the largest ones are cut.
+
+    Args:
+        costs: Estimated tokens of each file's full content
+        budget: Tokens available for file contents
+        priorities: Optional weights per file path; higher gets more
+
+    Returns:
+        Tokens granted to each file, never more than its cost
+    """
+    def weight(path: str) -> float:
+        return max((priorities or {}).get(path, 1.0), 1e-6)
+
+    remaining = max(budget, 0)
+    total_weight = sum(weight(path) for path in costs)
+    allocation = {}
+    for path in sorted(costs, key=lambda p: (costs[p] / weight(p), p)):
+        share = int(remaining * weight(path) / total_weight)
+        allocation[path] = min(costs[path], share)
+        remaining -= allocation[path]
+        total_weight -= weight(path)
+    return allocation
+
+
+def fit_lines(
+    line_tokens: List[int],
+    max_tokens: int,
+    head_share: float = 0.8,
+    max_head: Optional[int] = None,
+    max_tail: Optional[int] = None
+) -> Tuple[int, int]:
+    """Choose how many leading and trailing lines fit in ``max_tokens``.
+
+    The head gets ``head_share`` of the budget, the tail the rest plus
+    whatever the head left unused.
+
+    Returns:
+        (head_lines, tail_lines)
+    """
+    max_head = len(line_tokens) if max_head is None else max_head
+    max_tail = len(line_tokens) if max_tail is None else max_tail
+
+    head, used = 0, 0
+    head_budget = int(max_tokens * head_share)
+    while head < max_head and used + line_tokens[head] <= head_budget:
+        used += line_tokens[head]
+        head += 1
+
+    tail = 0
+    while (
+        tail < max_tail
+        and head + tail < len(line_tokens)
+        and used + line_tokens[-1 - tail] <= max_tokens
+    ):
+        used += line_tokens[-1 - tail]
+        tail += 1
+    return head, tail
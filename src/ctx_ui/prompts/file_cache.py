@@ -0,0 +1,109 @@
+"""Bounded LRU cache of rendered per-file prompt blocks."""
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Set, Tuple
+import threading
+import time
+from ..context.file_index import RACY_MTIME_NS
+from ..context.changes import ChangeBatch
+
+
+# (relative path, mtime_ns, size, render settings)
+CacheKey = Tuple[str, int, int, Hashable]
+
+
+class RenderedFileCache:
+    """Reuse rendered file blocks while the file and the render settings are unchanged.
+
+    Entries are keyed by path, ``mtime_ns``, size and the settings passed by
+    the generator, so an edited file misses even if no watcher event arrived.
+    The cache holds at most ``max_bytes`` of rendered text (measured in
+    characters, or by the ``sizeof`` passed along with non-string values) and
+    evicts least recently used blocks first. Watcher batches
+    drop entries of changed paths early to free their memory.
+
+    Files modified within the last ``RACY_MTIME_NS`` are rendered but not
+    cached, since a write in the same timestamp tick would go unnoticed.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[CacheKey, Tuple[Any, int]]' = OrderedDict()
+        self._keys_by_path: Dict[str, Set[CacheKey]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_render(
+        self,
+        file_path: str,
+        full_path: Path,
+        settings: Hashable,
+        render: Callable[[str, Path], Any],
+        sizeof: Callable[[Any], int] = len
+    ) -> Any:
+        """Return the cached block for a file, rendering and storing it on a miss."""
+        stat = full_path.stat()
+        key = (file_path, stat.st_mtime_ns, stat.st_size, settings)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        block = render(file_path, full_path)
+        if stat.st_mtime_ns < time.time_ns() - RACY_MTIME_NS:
+            self._store(key, block, sizeof(block))
+        return block
+
+    def _store(self, key: CacheKey, block: Any, size: int):
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = (block, size)
+            self._keys_by_path.setdefault(key[0], set()).add(key)
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes:
+                old_key, _ = next(iter(self._entries.items()))
+                self._drop_locked(old_key)
+
+    def _drop_locked(self, key: CacheKey):
+        _, size = self._entries.pop(key)
+        self.total_bytes -= size
+        keys = self._keys_by_path[key[0]]
+        keys.discard(key)
+        if not keys:
+            del self._keys_by_path[key[0]]
+
+    def invalidate(self, path: str):
+        """Drop the entries of a file, or of every file below a directory."""
+        prefix = path.rstrip('/') + '/'
+        with self._lock:
+            paths = [p for p in self._keys_by_path if p == path or p.startswith(prefix)]
+            for p in paths:
+                for key in list(self._keys_by_path.get(p, ())):
+                    self._drop_locked(key)
+
+    def invalidate_batch(self, batch: ChangeBatch):
+        """Drop the entries touched by a watcher batch; an overflow clears everything."""
+        if batch.overflow:
+            self.clear()
+            return
+        for path, _ in batch.changes:
+            self.invalidate(path)
+
+    def clear(self):
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_path.clear()
+            self.total_bytes = 0
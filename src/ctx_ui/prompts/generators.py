@@ -1,18 +1,37 @@
 """Prompt generation functions for different AI assistants."""
 
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Set
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, TextIO, Tuple
+import itertools
+from ..context.binary import BinaryDetector
+from ..context.head_tail import HeadTail, read_head_tail
+from ..context.symbols import SymbolIndex, language_for, merge_ranges
+from ..reflection.redaction import redact_secrets
+from .budget import FileCut, allocate_budget, fit_lines
+from .tokens import TOKEN_WEIGHTS, estimate_tokens
 
 
-def generate_copilot_prompt_text(user_query: str, selected_files: Set[str]) -> str:
-    """Generate structured prompt for GitHub Copilot following strict rules.
+def iter_copilot_prompt(
+    user_query: str,
+    selected_files: Set[str],
+    repo_root: Optional[Path] = None,
+    binary_detector: Optional[BinaryDetector] = None,
+    selected_symbols: Optional[Dict[str, Iterable[str]]] = None
+) -> Iterator[str]:
+    """Yield a structured prompt for GitHub Copilot following strict rules.
     
     Args:
         user_query: The user's task description
         selected_files: Set of file paths to be modified
+        repo_root: Root path of the repository, needed to mark binary files
+        binary_detector: Optional BinaryDetector marking files with binary content
+        selected_symbols: Optional symbol names per file path to focus on
         
-    Returns:
-        Formatted prompt string for GitHub Copilot
+    Yields:
+        Chunks of the prompt; joined they form ``generate_copilot_prompt_text``
     """
     prompt_parts = []
     
@@ -28,7 +47,13 @@ def generate_copilot_prompt_text(user_query: str, selected_files: Set[str]) -> s
     prompt_parts.append("# Context")
     prompt_parts.append("Primary files to modify:\n")
     for file_path in sorted(selected_files):
-        prompt_parts.append(f"- `{file_path}`")
+        names = sorted((selected_symbols or {}).get(file_path, ()))
+        if repo_root is not None and binary_detector is not None and binary_detector.is_binary(repo_root / file_path):
+            prompt_parts.append(f"- `{file_path}` (binary file)")
+        elif names:
+            prompt_parts.append(f"- `{file_path}` (symbols: {', '.join(f'`{name}`' for name in names)})")
+        else:
+            prompt_parts.append(f"- `{file_path}`")
     prompt_parts.append("")
     
     # Plan (always include)
@@ -60,97 +85,438 @@ def generate_copilot_prompt_text(user_query: str, selected_files: Set[str]) -> s
     prompt_parts.append("- Do not add documentation or changelog files unless requested")
     prompt_parts.append("- Do not add docstrings or comments unless necessary for clarity")
     
-    return '\n'.join(prompt_parts)
+    yield from _join_lines(prompt_parts)
 
 
-def generate_chatgpt_prompt_text(user_query: str, selected_files: Set[str], repo_root: Path) -> str:
-    """Generate a simpler prompt for ChatGPT focused on code questions/suggestions.
+def generate_copilot_prompt_text(
+    user_query: str,
+    selected_files: Set[str],
+    repo_root: Optional[Path] = None,
+    binary_detector: Optional[BinaryDetector] = None,
+    selected_symbols: Optional[Dict[str, Iterable[str]]] = None
+) -> str:
+    """Generate structured prompt for GitHub Copilot following strict rules.
+    
+    Takes the arguments of ``iter_copilot_prompt``.
+    
+    Returns:
+        Formatted prompt string for GitHub Copilot
+    """
+    return ''.join(iter_copilot_prompt(user_query, selected_files, repo_root, binary_detector, selected_symbols))
+
+
+# Denylist for binary/noisy assets (case-insensitive)
+NOISE_SUFFIXES = {
+    '.lock', '.min.js', '.min.css', '.map',
+    '.png', '.jpg', '.jpeg', '.gif', '.webp',
+    '.pdf', '.zip', '.tar', '.gz', '.tgz', '.xz',
+    '.mp4', '.mov', '.avi'
+}
+
+# Size/line limits for truncation
+MAX_FILE_KB = 50
+MAX_FILE_LINES = 800
+HEAD_LINES = 400
+TAIL_LINES = 100
+TRUNCATION_MARKER = '\n--- TRUNCATED MIDDLE ---\n'
+
+
+def _is_noisy_asset(file_path: str) -> bool:
+    """Check if file should be skipped due to binary/noisy suffix."""
+    return any(file_path.lower().endswith(suffix) for suffix in NOISE_SUFFIXES)
+
+
+def _truncate_large_content(content: str, line_count: int) -> tuple[str, bool]:
+    """Truncate content if it exceeds size limits.
+    
+    Assumptions:
+    - If both size and line limits are exceeded, truncation applies once (head+tail)
+    
+    Returns:
+        (content, was_truncated)
+    """
+    if line_count <= MAX_FILE_LINES:
+        return content, False
+    
+    lines = content.split('\n')
+    head = lines[:HEAD_LINES]
+    tail = lines[-TAIL_LINES:]
+    truncated = '\n'.join(head) + TRUNCATION_MARKER + '\n'.join(tail)
+    return truncated, True
+
+# Truncation settings baked into rendered blocks; part of every cache key
+RENDER_SETTINGS = (MAX_FILE_KB, MAX_FILE_LINES, HEAD_LINES, TAIL_LINES)
+
+# Files above this size are counted and excerpted through a memory map
+STREAM_MIN_BYTES = 1024 * 1024
+
+
+def _render_file_block(file_path: str, full_path: Path) -> str:
+    """Render one file as a header plus fenced, redacted and truncated body."""
+    # Large files with too many lines are excerpted without reading them whole
+    if full_path.stat().st_size > STREAM_MIN_BYTES:
+        excerpt = read_head_tail(full_path, HEAD_LINES, TAIL_LINES, MAX_FILE_LINES)
+        if excerpt is not None:
+            return _render_excerpt_block(file_path, full_path, excerpt)
+    
+    # Read file and get metadata
+    content = full_path.read_text(errors='ignore')
+    return _render_content_block(file_path, full_path, content)
+
+
+def _render_content_block(file_path: str, full_path: Path, content: str) -> str:
+    """Redact, truncate and format file content that was read whole."""
+    size_bytes = len(content) if content.isascii() else len(content.encode('utf-8'))
+    size_kb = size_bytes / 1024.0
+    line_count = content.count('\n') + 1
+    
+    # Apply secret redaction
+    content = redact_secrets(content)
+    
+    # Apply size-based truncation
+    was_truncated = False
+    if size_kb > MAX_FILE_KB or line_count > MAX_FILE_LINES:
+        content, was_truncated = _truncate_large_content(content, line_count)
+    
+    return _format_file_block(file_path, full_path, content, line_count, size_kb, was_truncated)
+
+
+# Part of the cache key of outline blocks; bump when outlining changes
+OUTLINE_SETTINGS = ('outline', 1) + RENDER_SETTINGS
+
+
+def _render_outline_block(
+    file_path: str,
+    full_path: Path,
+    symbol_index: SymbolIndex,
+    pinned: Optional[Tuple[str, ...]] = None
+) -> str:
+    """Render an oversized file as an outline instead of cutting out its middle.
+    
+    Imports, signatures and docstrings are kept and other code collapses to
+    ``...``; ``pinned`` symbols keep their bodies. With ``pinned`` given (even
+    empty) the file is outlined whatever its size. Files within the limits,
+    in unsupported languages, that do not parse, or above
+    ``STREAM_MIN_BYTES`` without pins render as usual.
+    """
+    language = language_for(full_path)
+    if language is None or (pinned is None and full_path.stat().st_size > STREAM_MIN_BYTES):
+        return _render_file_block(file_path, full_path)
+    
+    content = full_path.read_text(errors='ignore')
+    size_bytes = len(content) if content.isascii() else len(content.encode('utf-8'))
+    size_kb = size_bytes / 1024.0
+    line_count = content.count('\n') + 1
+    outline = None
+    if pinned is not None or size_kb > MAX_FILE_KB or line_count > MAX_FILE_LINES:
+        outline = symbol_index.outline(content, language, pinned or ())
+    if outline is None:
+        return _render_content_block(file_path, full_path, content)
+    
+    outline = redact_secrets(outline)
+    header = f"### File: `{file_path}` ({line_count} lines, {size_kb:.1f} KB) — OUTLINE: bodies collapsed to `...`"
+    if pinned:
+        header += ", full bodies of " + ', '.join(f"`{name}`" for name in pinned)
+    outline_lines = outline.count('\n') + 1
+    if outline_lines > MAX_FILE_LINES:
+        outline, _ = _truncate_large_content(outline, outline_lines)
+        header += f", TRUNCATED to first {HEAD_LINES} and last {TAIL_LINES} lines"
+    return _fence_block(header, full_path, outline)
+
+
+def _excerpt_lines(excerpt: HeadTail) -> tuple[List[str], List[str]]:
+    """Redact an excerpt and return its head and tail lines.
+    
+    Each side is redacted together with the text around its cut, so rules
+    spanning lines, and PEM blocks opened before the tail, apply as they
+    would on the whole file.
+    """
+    head = redact_secrets(excerpt.head + excerpt.after_head).split('\n')[:HEAD_LINES]
+    before_tail = ('-----BEGIN\n' if excerpt.in_block else '') + excerpt.before_tail
+    tail = redact_secrets(before_tail + excerpt.tail).split('\n')[-TAIL_LINES:]
+    return head, tail
+
+
+def _render_excerpt_block(file_path: str, full_path: Path, excerpt: HeadTail) -> str:
+    """Render the head and tail of a large file as the full path would."""
+    head, tail = _excerpt_lines(excerpt)
+    content = '\n'.join(head) + TRUNCATION_MARKER + '\n'.join(tail)
+    return _format_file_block(file_path, full_path, content, excerpt.line_count, excerpt.text_bytes / 1024.0, True)
+
+
+def _format_file_block(
+    file_path: str,
+    full_path: Path,
+    content: str,
+    line_count: int,
+    size_kb: float,
+    was_truncated: bool,
+    head_lines: int = HEAD_LINES,
+    tail_lines: int = TAIL_LINES
+) -> str:
+    """Wrap file content in a metadata header and a code fence."""
+    # File header with metadata
+    header = f"### File: `{file_path}` ({line_count} lines, {size_kb:.1f} KB)"
+    if was_truncated:
+        header += f" — TRUNCATED to first {head_lines} and last {tail_lines} lines"
+    return _fence_block(header, full_path, content)
+
+
+def _fence_block(header: str, full_path: Path, content: str) -> str:
+    """Join a block header and content fenced with the file's language."""
+    return '\n'.join([
+        f"\n{header}\n",
+        f"```{full_path.suffix[1:] if full_path.suffix else ''}",
+        content,
+        "```\n",
+    ])
+
+
+# Part of the cache key of symbol blocks; bump when their rendering changes
+SYMBOL_SETTINGS = ('symbols', 1)
+
+
+def _render_symbol_block(file_path: str, full_path: Path, names: Tuple[str, ...], symbol_index: SymbolIndex) -> str:
+    """Render only the line ranges of the named symbols.
+    
+    The whole file is redacted before slicing (redaction keeps line numbers),
+    so secrets spanning a range boundary are still caught. Falls back to the
+    whole-file block when none of the names is found.
+    """
+    content = full_path.read_text(errors='ignore')
+    language = language_for(full_path)
+    wanted = set(names)
+    chosen = []
+    if language is not None:
+        chosen = [s for s in symbol_index.symbols_for_text(content, language) if s.name in wanted]
+    if not chosen:
+        return _render_file_block(file_path, full_path)
+    
+    size_bytes = len(content) if content.isascii() else len(content.encode('utf-8'))
+    lines = redact_secrets(content).split('\n')
+    parts = []
+    next_line = 1
+    for start, end in merge_ranges(chosen):
+        if start > next_line:
+            parts.append(f"--- OMITTED lines {next_line}-{start - 1} ---")
+        parts.extend(lines[start - 1:end])
+        next_line = end + 1
+    if any(lines[next_line - 1:]):
+        parts.append(f"--- OMITTED lines {next_line}-{len(lines)} ---")
+    
+    symbols = ', '.join(f"`{s.name}` (lines {s.start}-{s.end})" for s in chosen)
+    header = f"### File: `{file_path}` ({len(lines)} lines, {size_bytes / 1024.0:.1f} KB) — SYMBOLS: {symbols}"
+    return _fence_block(header, full_path, '\n'.join(parts))
+
+
+class FileSource(NamedTuple):
+    """Redacted lines of a file with their estimated tokens, before budget cuts.
+    
+    ``excerpt_head`` is the number of leading lines of an excerpted large
+    file (the rest are its last lines), or None if ``lines`` is the whole file.
+    """
+    lines: List[str]
+    line_tokens: List[int]
+    line_count: int
+    size_kb: float
+    excerpt_head: Optional[int]
+    
+    @property
+    def tokens(self) -> int:
+        return sum(self.line_tokens)
+
+
+# Settings baked into cached file sources
+SOURCE_SETTINGS = ('source', HEAD_LINES, TAIL_LINES, STREAM_MIN_BYTES, TOKEN_WEIGHTS)
+
+# Files granted fewer tokens than this are listed without content
+MIN_FILE_TOKENS = 64
+
+# Tokens reserved for each line of the budget summary
+BUDGET_SUMMARY_LINE_TOKENS = 30
+
+
+def _source_size(source: FileSource) -> int:
+    return sum(map(len, source.lines)) + len(source.lines)
+
+
+def _read_file_source(file_path: str, full_path: Path) -> FileSource:
+    """Read and redact a file for budget mode, estimating tokens per line."""
+    excerpt_head = None
+    if full_path.stat().st_size > STREAM_MIN_BYTES:
+        excerpt = read_head_tail(full_path, HEAD_LINES, TAIL_LINES, MAX_FILE_LINES)
+        if excerpt is not None:
+            head, tail = _excerpt_lines(excerpt)
+            lines, excerpt_head = head + tail, len(head)
+            line_count, size_kb = excerpt.line_count, excerpt.text_bytes / 1024.0
+    
+    if excerpt_head is None:
+        content = full_path.read_text(errors='ignore')
+        size_bytes = len(content) if content.isascii() else len(content.encode('utf-8'))
+        lines = redact_secrets(content).split('\n')
+        line_count, size_kb = len(lines), size_bytes / 1024.0
+    
+    line_tokens = [estimate_tokens(line + '\n') for line in lines]
+    return FileSource(lines, line_tokens, line_count, size_kb, excerpt_head)
+
+
+def _budget_block(file_path: str, full_path: Path, source: FileSource, granted: int) -> tuple[str, Optional[FileCut]]:
+    """Render a file source within ``granted`` tokens.
+    
+    Returns:
+        (block, cut) where cut is None if the source was kept whole
+    """
+    lines, excerpt_head = source.lines, source.excerpt_head
+    if granted >= source.tokens:
+        if excerpt_head is None:
+            content = '\n'.join(lines)
+        else:
+            content = '\n'.join(lines[:excerpt_head]) + TRUNCATION_MARKER + '\n'.join(lines[excerpt_head:])
+        block = _format_file_block(
+            file_path, full_path, content, source.line_count, source.size_kb, excerpt_head is not None
+        )
+        return block, None
+    
+    head, tail = 0, 0
+    if granted >= MIN_FILE_TOKENS:
+        head, tail = fit_lines(
+            source.line_tokens,
+            granted,
+            max_head=excerpt_head,
+            max_tail=None if excerpt_head is None else len(lines) - excerpt_head
+        )
+    kept_tokens = sum(source.line_tokens[:head]) + sum(source.line_tokens[len(lines) - tail:])
+    cut = FileCut(file_path, source.tokens, kept_tokens, source.line_count, head + tail)
+    if not head and not tail:
+        header = f"### File: `{file_path}` ({source.line_count} lines, {source.size_kb:.1f} KB)"
+        return f"\n{header} — OMITTED to fit the token budget\n", cut
+    
+    content = '\n'.join(lines[:head]) + TRUNCATION_MARKER + '\n'.join(lines[len(lines) - tail:])
+    block = _format_file_block(file_path, full_path, content, source.line_count, source.size_kb, True, head, tail)
+    return block, cut
+
+
+def _fit_to_budget(
+    prompt_parts: List[str],
+    ordered: List[str],
+    entries: list,
+    repo_root: Path,
+    token_budget: int,
+    priorities: Optional[Dict[str, float]]
+) -> tuple[List[str], List[FileCut]]:
+    """Cut file sources so the whole prompt fits ``token_budget`` estimated tokens."""
+    sources = {fp: entry for fp, entry in zip(ordered, entries) if isinstance(entry, FileSource)}
+    
+    # Everything but the file contents is fixed: the prompt text, inline
+    # notes, every block's header and fence, and room for the summary
+    fixed = estimate_tokens('\n'.join(prompt_parts))
+    fixed += sum(estimate_tokens(entry) for entry in entries if isinstance(entry, str))
+    for fp, source in sources.items():
+        empty_block = _format_file_block(fp, repo_root / fp, '', source.line_count, source.size_kb, True, 0, 0)
+        fixed += estimate_tokens(empty_block) + BUDGET_SUMMARY_LINE_TOKENS
+    allocation = allocate_budget(
+        {fp: source.tokens for fp, source in sources.items()}, token_budget - fixed, priorities
+    )
+    
+    blocks, cuts = [], []
+    for fp, entry in zip(ordered, entries):
+        if isinstance(entry, FileSource):
+            entry, cut = _budget_block(fp, repo_root / fp, entry, allocation[fp])
+            if cut is not None:
+                cuts.append(cut)
+        blocks.append(entry)
+    return blocks, cuts
+
+
+def _budget_summary(cuts: List[FileCut], token_budget: int) -> str:
+    """List the files that were cut to fit the budget."""
+    lines = [f"## Token budget\n\nFiles cut to fit ~{token_budget:,} tokens (estimated):\n"]
+    for cut in cuts:
+        lines.append(
+            f"- `{cut.file_path}`: kept {cut.kept_lines} of {cut.line_count} lines "
+            f"(~{cut.kept_tokens:,} of ~{cut.tokens:,} tokens)"
+        )
+    return '\n'.join(lines)
+
+
+def _file_entry(
+    file_path: str,
+    repo_root: Path,
+    live_index,
+    file_cache,
+    binary_detector,
+    render=_render_file_block,
+    settings=RENDER_SETTINGS,
+    sizeof=len
+):
+    """Render the prompt text for one selected file; errors are rendered inline."""
+    full_path = repo_root / file_path
+    
+    # Check if noisy asset
+    if _is_noisy_asset(file_path):
+        return f"- `{file_path}` — _Skipped embedding (binary/noisy asset)_\n"
+    
+    exists = file_path in live_index if live_index is not None else full_path.exists()
+    if not exists:
+        return f"\n### File: `{file_path}`\n_File not found_\n"
+    
+    # Sniff the first bytes before reading the whole file
+    if binary_detector is not None and binary_detector.is_binary(full_path):
+        return f"- `{file_path}` — _Skipped embedding (binary/noisy asset)_\n"
+    
+    try:
+        if file_cache is None:
+            return render(file_path, full_path)
+        return file_cache.get_or_render(file_path, full_path, settings, render, sizeof)
+    except Exception as e:
+        return f"\n### File: `{file_path}`\n_Error reading file: {e}_\n"
+
+
+def iter_chatgpt_prompt(
+    user_query: str,
+    selected_files: Set[str],
+    repo_root: Path,
+    live_index=None,
+    file_cache=None,
+    workers: int = 0,
+    binary_detector: Optional[BinaryDetector] = None,
+    token_budget: Optional[int] = None,
+    priorities: Optional[Dict[str, float]] = None,
+    budget_report: Optional[List[FileCut]] = None,
+    selected_symbols: Optional[Dict[str, Iterable[str]]] = None,
+    symbol_index: Optional[SymbolIndex] = None,
+    outline_large_files: bool = False,
+    pinned_symbols: Optional[Dict[str, Iterable[str]]] = None
+) -> Iterator[str]:
+    """Yield a simpler prompt for ChatGPT focused on code questions/suggestions.
+    
+    Chunks are produced as files are read, so at most a few rendered files
+    are held at once (a token budget needs every file before the first one
+    is cut, so that mode holds them all).
     
     Args:
         user_query: The user's task description
         selected_files: Set of file paths to include
         repo_root: Root path of the repository
+        live_index: Optional LiveIndex used instead of the filesystem to check existence
+        file_cache: Optional RenderedFileCache reusing blocks of unchanged files
+        workers: Threads reading and rendering files; 0 or 1 renders serially
+        binary_detector: Optional BinaryDetector skipping files with binary content
+        token_budget: Optional limit for the whole prompt in estimated tokens;
+            replaces the fixed per-file truncation with cuts spread over the files
+        priorities: Optional budget weights per file path (default 1.0)
+        budget_report: Optional list that receives a FileCut per shortened file
+        selected_symbols: Optional symbol names per file path; those files embed
+            only the line ranges of the named functions, classes and methods
+        symbol_index: Optional SymbolIndex reused across prompts
+        outline_large_files: Outline files over the size/line limits instead of
+            cutting out their middle (not applied with a token budget)
+        pinned_symbols: Optional symbol names per file path; those files are
+            outlined whatever their size, keeping the named bodies whole
         
-    Returns:
-        Formatted prompt string for ChatGPT with file contents
+    Yields:
+        Chunks of the prompt; joined they form ``generate_chatgpt_prompt_text``
     """
-    import re
-    
-    # Denylist for binary/noisy assets (case-insensitive)
-    NOISE_SUFFIXES = {
-        '.lock', '.min.js', '.min.css', '.map',
-        '.png', '.jpg', '.jpeg', '.gif', '.webp',
-        '.pdf', '.zip', '.tar', '.gz', '.tgz', '.xz',
-        '.mp4', '.mov', '.avi'
-    }
-    
-    # Size/line limits for truncation
-    MAX_FILE_KB = 50
-    MAX_FILE_LINES = 800
-    HEAD_LINES = 400
-    TAIL_LINES = 100
-    
-    def _is_noisy_asset(file_path: str) -> bool:
-        """Check if file should be skipped due to binary/noisy suffix."""
-        return any(file_path.lower().endswith(suffix) for suffix in NOISE_SUFFIXES)
-    
-    def _redact_secrets(content: str) -> str:
-        """Redact likely secrets from content (conservative approach).
-        
-        Assumptions:
-        - Uses conservative regexes to avoid false positives
-        - Better to slightly over-redact than to leak secrets
-        """
-        lines = content.split('\n')
-        redacted_lines = []
-        in_pem_block = False
-        
-        for line in lines:
-            # PEM block detection
-            if '-----BEGIN' in line:
-                in_pem_block = True
-                redacted_lines.append('[REDACTED]')
-                continue
-            if '-----END' in line:
-                in_pem_block = False
-                redacted_lines.append('[REDACTED]')
-                continue
-            if in_pem_block:
-                redacted_lines.append('[REDACTED]')
-                continue
-            
-            # Key=value secrets (API_KEY, SECRET, TOKEN)
-            if re.search(r'(API_KEY|SECRET|TOKEN)\s*=', line, re.IGNORECASE):
-                redacted_lines.append('[REDACTED]')
-                continue
-            
-            # JWT-like tokens (three base64url segments separated by dots)
-            if re.match(r'^[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+$', line.strip()):
-                redacted_lines.append('[REDACTED]')
-                continue
-            
-            redacted_lines.append(line)
-        
-        return '\n'.join(redacted_lines)
-    
-    def _truncate_large_content(content: str, line_count: int) -> tuple[str, bool]:
-        """Truncate content if it exceeds size limits.
-        
-        Assumptions:
-        - If both size and line limits are exceeded, truncation applies once (head+tail)
-        
-        Returns:
-            (content, was_truncated)
-        """
-        if line_count <= MAX_FILE_LINES:
-            return content, False
-        
-        lines = content.split('\n')
-        head = lines[:HEAD_LINES]
-        tail = lines[-TAIL_LINES:]
-        truncated = '\n'.join(head) + '\n--- TRUNCATED MIDDLE ---\n' + '\n'.join(tail)
-        return truncated, True
-    
     prompt_parts = []
     
     # Role with clarified scope
@@ -175,47 +541,120 @@ def generate_chatgpt_prompt_text(user_query: str, selected_files: Set[str], repo
     prompt_parts.append("### Primary files to consider\n")
     
     # Add file contents with metadata, truncation, and redaction
-    for file_path in sorted(selected_files):
-        full_path = repo_root / file_path
-        
-        # Check if noisy asset
-        if _is_noisy_asset(file_path):
-            prompt_parts.append(f"- `{file_path}` — _Skipped embedding (binary/noisy asset)_\n")
-            continue
-        
-        if not full_path.exists():
-            prompt_parts.append(f"\n### File: `{file_path}`")
-            prompt_parts.append("_File not found_\n")
-            continue
+    if token_budget:
+        render, settings, sizeof = _read_file_source, SOURCE_SETTINGS, _source_size
+    else:
+        render, settings, sizeof = _render_file_block, RENDER_SETTINGS, len
+    
+    if (selected_symbols or pinned_symbols or outline_large_files) and symbol_index is None:
+        symbol_index = SymbolIndex()
+    
+    def file_entry(file_path: str):
+        names = tuple(sorted(selected_symbols.get(file_path, ()))) if selected_symbols else ()
+        if names:
+            render_symbols = partial(_render_symbol_block, names=names, symbol_index=symbol_index)
+            return _file_entry(
+                file_path, repo_root, live_index, file_cache, binary_detector,
+                render_symbols, SYMBOL_SETTINGS + names, len
+            )
+        pins = (pinned_symbols or {}).get(file_path)
+        if pins is not None or (outline_large_files and not token_budget):
+            pins = None if pins is None else tuple(sorted(set(pins)))
+            render_outline = partial(_render_outline_block, symbol_index=symbol_index, pinned=pins)
+            return _file_entry(
+                file_path, repo_root, live_index, file_cache, binary_detector,
+                render_outline, OUTLINE_SETTINGS + (pins,), len
+            )
+        return _file_entry(
+            file_path, repo_root, live_index, file_cache, binary_detector, render, settings, sizeof
+        )
+    
+    ordered = sorted(selected_files)
+    entries = _map_in_order(file_entry, ordered, workers)
+    if token_budget:
+        entries, cuts = _fit_to_budget(prompt_parts, ordered, list(entries), repo_root, token_budget, priorities)
+        if cuts:
+            entries.append(_budget_summary(cuts, token_budget))
+        if budget_report is not None:
+            budget_report.extend(cuts)
+    
+    yield from _join_lines(itertools.chain(prompt_parts, entries))
+
+
+def generate_chatgpt_prompt_text(
+    user_query: str,
+    selected_files: Set[str],
+    repo_root: Path,
+    live_index=None,
+    file_cache=None,
+    workers: int = 0,
+    binary_detector: Optional[BinaryDetector] = None,
+    token_budget: Optional[int] = None,
+    priorities: Optional[Dict[str, float]] = None,
+    budget_report: Optional[List[FileCut]] = None,
+    selected_symbols: Optional[Dict[str, Iterable[str]]] = None,
+    symbol_index: Optional[SymbolIndex] = None,
+    outline_large_files: bool = False,
+    pinned_symbols: Optional[Dict[str, Iterable[str]]] = None
+) -> str:
+    """Generate a simpler prompt for ChatGPT focused on code questions/suggestions.
+    
+    Takes the arguments of ``iter_chatgpt_prompt``.
+    
+    Returns:
+        Formatted prompt string for ChatGPT with file contents
+    """
+    return ''.join(iter_chatgpt_prompt(
+        user_query, selected_files, repo_root, live_index, file_cache, workers,
+        binary_detector, token_budget, priorities, budget_report, selected_symbols, symbol_index,
+        outline_large_files, pinned_symbols
+    ))
+
+
+def write_prompt(sink: TextIO, chunks: Iterable[str]) -> int:
+    """Write prompt chunks to a text sink as they are produced.
+    
+    Args:
+        sink: Any object with a ``write(str)`` method (a file, ``io.StringIO``,
+            an HTTP response wrapper, a clipboard helper)
+        chunks: Output of ``iter_copilot_prompt`` or ``iter_chatgpt_prompt``
         
+    Returns:
+        Number of characters written
+    """
+    written = 0
+    for chunk in chunks:
+        sink.write(chunk)
+        written += len(chunk)
+    return written
+
+
+def _join_lines(parts: Iterable[str]) -> Iterator[str]:
+    """Yield ``parts`` separated by newlines, like ``'\\n'.join`` without building the result."""
+    for i, part in enumerate(parts):
+        if i:
+            yield '\n'
+        yield part
+
+
+def _map_in_order(fn: Callable, items: List[str], workers: int) -> Iterator:
+    """Yield ``fn(item)`` in order, computing up to ``2 * workers`` results ahead on threads."""
+    if workers <= 1 or len(items) <= 1:
+        yield from map(fn, items)
+        return
+    
+    pending = deque()
+    remaining = iter(items)
+    with ThreadPoolExecutor(max_workers=min(workers, len(items)), thread_name_prefix='ctx-render') as pool:
         try:
-            # Read file and get metadata
-            content = full_path.read_text(errors='ignore')
-            size_bytes = len(content.encode('utf-8'))
-            size_kb = size_bytes / 1024.0
-            lines = content.split('\n')
-            line_count = len(lines)
-            
-            # Apply secret redaction
-            content = _redact_secrets(content)
-            
-            # Apply size-based truncation
-            was_truncated = False
-            if size_kb > MAX_FILE_KB or line_count > MAX_FILE_LINES:
-                content, was_truncated = _truncate_large_content(content, line_count)
-            
-            # File header with metadata
-            header = f"### File: `{file_path}` ({line_count} lines, {size_kb:.1f} KB)"
-            if was_truncated:
-                header += f" — TRUNCATED to first {HEAD_LINES} and last {TAIL_LINES} lines"
-            
-            prompt_parts.append(f"\n{header}\n")
-            prompt_parts.append(f"```{full_path.suffix[1:] if full_path.suffix else ''}")
-            prompt_parts.append(content)
-            prompt_parts.append("```\n")
-            
-        except Exception as e:
-            prompt_parts.append(f"\n### File: `{file_path}`")
-            prompt_parts.append(f"_Error reading file: {e}_\n")
-    
-    return '\n'.join(prompt_parts)
+            for item in itertools.islice(remaining, 2 * workers):
+                pending.append(pool.submit(fn, item))
+            while pending:
+                result = pending.popleft().result()
+                for item in itertools.islice(remaining, 1):
+                    pending.append(pool.submit(fn, item))
+                yield result
+        finally:
+            # A consumer that stops early leaves no queued reads behind
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,122 @@
+"""Server-side store of generated prompts, served to the browser over HTTP."""
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, NamedTuple, Optional
+import secrets
+import shutil
+import tempfile
+import threading
+from .generators import write_prompt
+
+
+class StoredPrompt(NamedTuple):
+    """A prompt written to disk; ``preview`` holds its first characters."""
+    prompt_id: str
+    kind: str
+    path: Path
+    size: int
+    preview: str
+
+    @property
+    def truncated(self) -> bool:
+        return len(self.preview) < self.size
+
+
+def iter_file(f: BinaryIO, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Yield the rest of an open binary file in chunks, closing it at the end.
+
+    Streaming from a handle opened up front keeps the whole prompt readable
+    even if the store evicts and unlinks its file meanwhile.
+    """
+    with f:
+        while chunk := f.read(chunk_size):
+            yield chunk
+
+
+class _PreviewSink:
+    """Text sink that writes through to a file and keeps the first characters."""
+
+    def __init__(self, out, preview_chars: int):
+        self.out = out
+        self.preview_chars = preview_chars
+        self.parts = []
+        self.kept = 0
+
+    def write(self, chunk: str):
+        self.out.write(chunk)
+        if self.kept < self.preview_chars:
+            part = chunk[:self.preview_chars - self.kept]
+            self.parts.append(part)
+            self.kept += len(part)
+
+
+class PromptStore:
+    """Keep the latest generated prompts on disk under unguessable ids.
+
+    Prompts are streamed to UTF-8 files as they are generated, so neither
+    the server nor the websocket holds a full copy; the browser fetches the
+    text for copy and download from the prompt route. The oldest prompts
+    are deleted once more than ``max_prompts`` are stored.
+    """
+
+    def __init__(self, directory: Optional[Path] = None, max_prompts: int = 20, preview_chars: int = 20000):
+        self._owns_directory = directory is None
+        self.directory = Path(tempfile.mkdtemp(prefix='ctx-prompts-')) if directory is None else Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_prompts = max_prompts
+        self.preview_chars = preview_chars
+        self._prompts: 'OrderedDict[str, StoredPrompt]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, chunks: Iterable[str], kind: str = 'prompt') -> StoredPrompt:
+        """Write prompt chunks to a new file and return its record."""
+        prompt_id = secrets.token_urlsafe(16)
+        path = self.directory / f'{prompt_id}.md'
+        try:
+            with open(path, 'w', encoding='utf-8', newline='') as out:
+                sink = _PreviewSink(out, self.preview_chars)
+                size = write_prompt(sink, chunks)
+        except BaseException:
+            # Never registered, so eviction would not remove a half-written file
+            path.unlink(missing_ok=True)
+            raise
+        record = StoredPrompt(prompt_id, kind, path, size, ''.join(sink.parts))
+
+        with self._lock:
+            self._prompts[prompt_id] = record
+            evicted = []
+            while len(self._prompts) > self.max_prompts:
+                evicted.append(self._prompts.popitem(last=False)[1])
+        for old in evicted:
+            old.path.unlink(missing_ok=True)
+        return record
+
+    def get(self, prompt_id: str) -> Optional[StoredPrompt]:
+        """Return a stored prompt, or None if it is unknown or was evicted."""
+        with self._lock:
+            return self._prompts.get(prompt_id)
+
+    def iter_bytes(self, prompt_id: str, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """Yield the UTF-8 bytes of a stored prompt in chunks."""
+        record = self.get(prompt_id)
+        if record is None:
+            raise KeyError(prompt_id)
+        yield from iter_file(open(record.path, 'rb'), chunk_size)
+
+    def delete(self, prompt_id: str):
+        """Forget a prompt and remove its file."""
+        with self._lock:
+            record = self._prompts.pop(prompt_id, None)
+        if record is not None:
+            record.path.unlink(missing_ok=True)
+
+    def close(self):
+        """Remove every stored prompt (and the directory if the store created it)."""
+        with self._lock:
+            records = list(self._prompts.values())
+            self._prompts.clear()
+        for record in records:
+            record.path.unlink(missing_ok=True)
+        if self._owns_directory:
+            shutil.rmtree(self.directory, ignore_errors=True)
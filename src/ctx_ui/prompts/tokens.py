@@ -0,0 +1,42 @@
+"""Fast local token count estimates, calibrated offline against a BPE tokenizer."""
+
+from typing import Tuple
+import re
+
+
+# ASCII approximation of the cl100k_base pre-tokenizer: words with one
+# leading non-letter, digit groups of up to three, punctuation runs and
+# whitespace. Non-ASCII bytes are treated as letters.
+_PIECE = re.compile(
+    rb'[^\r\nA-Za-z0-9\x80-\xff]?[A-Za-z\x80-\xff]+'
+    rb'|[0-9]{1,3}'
+    rb'| ?[^\sA-Za-z0-9\x80-\xff]+[\r\n]*'
+    rb'|\s*[\r\n]'
+    rb'|\s+(?!\S)'
+    rb'|\s'
+)
+_LETTERS = b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
+_HIGH_BYTES = bytes(range(128, 256))
+
+# Tokens per pre-token piece, per ASCII letter (long identifiers split into
+# several tokens) and per non-ASCII byte. Least-squares fit against
+# cl100k_base counts of ~3000 source, Markdown and JSON files; on held-out
+# files the median error is 4% and the 95th percentile 15%, against 12% and
+# 34% for characters / 4. Refit with benchmarks/calibrate_tokens.py.
+TOKEN_WEIGHTS = (0.981, 0.0518, 0.560)
+
+
+def token_features(text: str) -> Tuple[int, int, int]:
+    """Return (pieces, ASCII letters, non-ASCII bytes) of a text."""
+    data = text.encode('utf-8', errors='replace')
+    pieces = len(_PIECE.findall(data))
+    letters = len(data) - len(data.translate(None, _LETTERS))
+    high = 0 if text.isascii() else len(data) - len(data.translate(None, _HIGH_BYTES))
+    return pieces, letters, high
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens a model will see for ``text``."""
+    if not text:
+        return 0
+    return round(sum(w * f for w, f in zip(TOKEN_WEIGHTS, token_features(text))))
@@ -3,6 +3,8 @@
 from pathlib import Path
 from typing import List, Dict, Any
 import re
+from ..context.matcher import compile_patterns
+from .redaction import SECRET_PATTERNS, find_secrets
 
 
 class ScopeGuard:
@@ -11,23 +13,22 @@ class ScopeGuard:
     def __init__(self, allowed_paths: List[str], excluded_paths: List[str]):
         self.allowed_paths = allowed_paths
         self.excluded_paths = excluded_paths
+        self._allowed = compile_patterns(allowed_paths)
+        self._excluded = compile_patterns(excluded_paths)
     
     def check_file(self, file_path: str) -> tuple[bool, str]:
         """Check if file is within allowed scope."""
-        path = Path(file_path)
-        
         # Check excluded patterns
-        for pattern in self.excluded_paths:
-            if path.match(pattern):
-                return False, f"File matches excluded pattern: {pattern}"
+        pattern = self._excluded.first_match(file_path)
+        if pattern is not None:
+            return False, f"File matches excluded pattern: {pattern}"
         
         # Check allowed patterns
         if not self.allowed_paths:
             return True, "No scope restrictions"
         
-        for pattern in self.allowed_paths:
-            if path.match(pattern):
-                return True, "File is within allowed scope"
+        if self._allowed.match(file_path):
+            return True, "File is within allowed scope"
         
         return False, "File is outside allowed scope"
 
@@ -35,29 +36,28 @@ class ScopeGuard:
 class SecretsScanner:
     """Simple secrets scanner to detect potential sensitive data."""
     
-    # Common patterns for secrets
-    PATTERNS = {
-        'api_key': re.compile(r'(?i)api[_-]?key["\s:=]+["\']?([a-zA-Z0-9_\-]{20,})["\']?'),
-        'password': re.compile(r'(?i)password["\s:=]+["\']?([^\s"\']{8,})["\']?'),
-        'token': re.compile(r'(?i)token["\s:=]+["\']?([a-zA-Z0-9_\-]{20,})["\']?'),
-        'secret': re.compile(r'(?i)secret["\s:=]+["\']?([a-zA-Z0-9_\-]{20,})["\']?'),
-        'private_key': re.compile(r'-----BEGIN (RSA |EC )?PRIVATE KEY-----'),
-        'aws_key': re.compile(r'AKIA[0-9A-Z]{16}'),
-    }
+    # Common patterns for secrets, shared with prompt redaction
+    PATTERNS = {name: re.compile(source) for name, source in SECRET_PATTERNS.items()}
     
     def scan_text(self, text: str) -> List[Dict[str, Any]]:
         """Scan text for potential secrets."""
         findings = []
+        line, line_pos = 1, 0
         
-        for secret_type, pattern in self.PATTERNS.items():
-            matches = pattern.finditer(text)
-            for match in matches:
-                findings.append({
-                    'type': secret_type,
-                    'line': text[:match.start()].count('\n') + 1,
-                    'snippet': match.group(0)[:50] + '...' if len(match.group(0)) > 50 else match.group(0)
-                })
+        # One scan finds every pattern; line numbers are counted incrementally
+        for match in find_secrets(text):
+            line += text.count('\n', line_pos, match.start)
+            line_pos = match.start
+            snippet = text[match.start:match.end]
+            findings.append({
+                'type': match.kind,
+                'line': line,
+                'snippet': snippet[:50] + '...' if len(snippet) > 50 else snippet
+            })
         
+        # Report grouped by pattern, in pattern order
+        order = {name: i for i, name in enumerate(self.PATTERNS)}
+        findings.sort(key=lambda finding: order[finding['type']])
         return findings
     
     def scan_file(self, file_path: Path) -> List[Dict[str, Any]]:
@@ -0,0 +1,166 @@
+"""Secret detection and redaction - one shared rule set, one scan per buffer."""
+
+from typing import Dict, Iterator, List, NamedTuple, Tuple
+import re
+
+
+# Patterns reported by SecretsScanner; every hit is also redacted in prompts.
+# Flags are scoped so the patterns can be combined into one expression.
+SECRET_PATTERNS: Dict[str, str] = {
+    'api_key': r'(?i:api[_-]?key["\s:=]+["\']?([a-zA-Z0-9_\-]{20,})["\']?)',
+    'password': r'(?i:password["\s:=]+["\']?([^\s"\']{8,})["\']?)',
+    'token': r'(?i:token["\s:=]+["\']?([a-zA-Z0-9_\-]{20,})["\']?)',
+    'secret': r'(?i:secret["\s:=]+["\']?([a-zA-Z0-9_\-]{20,})["\']?)',
+    'private_key': r'-----BEGIN (RSA |EC )?PRIVATE KEY-----',
+    'aws_key': r'AKIA[0-9A-Z]{16}',
+}
+
+# Line rules that only redact: key=value assignments and JWT-like lines
+REDACT_PATTERNS: Dict[str, str] = {
+    'assignment': r'(?i:(?:API_KEY|SECRET|TOKEN)[^\S\n]*=)',
+    'jwt': r'^[^\S\n]*[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+[^\S\n]*$',
+}
+
+REDACTED = '[REDACTED]'
+
+# A line containing a BEGIN marker opens a PEM block that is redacted up to
+# and including the next line containing an END marker
+_MARKERS = {'pem_begin': '-----BEGIN', 'pem_end': '-----END'}
+_PEM_BEGIN = {'pem_begin', 'private_key'}
+
+_RULES = [
+    (name, re.compile(source, re.MULTILINE))
+    for name, source in {**SECRET_PATTERNS, **REDACT_PATTERNS, **_MARKERS}.items()
+]
+
+# Every rule hit starts at one of these keywords or at a JWT-like line, so a
+# single scan for them finds all candidate positions. Buffers are lower-cased
+# first, which turns the trigger into plain literals that ``re`` skips through
+# quickly. That is only sound while lowering keeps every offset and maps all
+# case-insensitive aliases of ASCII letters to ASCII; dotless i and long s
+# are the exceptions, so such buffers use the case-insensitive trigger.
+_KEYWORDS = 'api|password|token|secret|akia|-----begin|-----end'
+_JWT_LINE = r'[^\S\n]*[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+\.[A-Za-z0-9_-]+[^\S\n]*$'
+_TRIGGER_LOWER = re.compile(
+    _KEYWORDS + r'|\n(?=' + _JWT_LINE.replace('A-Za-z', 'a-z') + ')', re.MULTILINE
+)
+_TRIGGER = re.compile(f'(?i:{_KEYWORDS})' + r'|\n(?=' + _JWT_LINE + ')', re.MULTILINE)
+_JWT_AT_START = re.compile(_JWT_LINE, re.MULTILINE)
+_UNFOLDED = re.compile('[\u0131\u017f]')
+
+
+class SecretMatch(NamedTuple):
+    """One rule hit; ``start``/``end`` delimit the matched text."""
+    kind: str
+    start: int
+    end: int
+
+
+def iter_matches(text: str) -> Iterator[SecretMatch]:
+    """Yield every rule hit in order of position.
+
+    The buffer is scanned once for trigger positions and the rules are only
+    tried, anchored, at those. Hits of the same rule never overlap, mirroring
+    ``finditer`` on that rule alone.
+    """
+    haystack, trigger = text.lower(), _TRIGGER_LOWER
+    if not text.isascii() and (len(haystack) != len(text) or _UNFOLDED.search(text)):
+        haystack, trigger = text, _TRIGGER
+    last_end: Dict[str, int] = {}
+
+    def hits_at(pos: int) -> Iterator[SecretMatch]:
+        for kind, rule in _RULES:
+            match = rule.match(text, pos)
+            if match is None or pos < last_end.get(kind, 0):
+                continue
+            last_end[kind] = match.end()
+            yield SecretMatch(kind, pos, match.end())
+
+    if _JWT_AT_START.match(text):
+        yield from hits_at(0)
+    candidate = trigger.search(haystack)
+    while candidate is not None:
+        pos = candidate.start()
+        # JWT candidates are reported at the newline ending the previous line
+        yield from hits_at(pos + 1 if haystack[pos] == '\n' else pos)
+        candidate = trigger.search(haystack, pos + 1)
+
+
+def find_secrets(text: str) -> List[SecretMatch]:
+    """Return the ``SECRET_PATTERNS`` hits in ``text``."""
+    return [m for m in iter_matches(text) if m.kind in SECRET_PATTERNS]
+
+
+def _line_span(text: str, start: int, end: int) -> Tuple[int, int]:
+    """Return the span of the lines covering ``text[start:end]`` without the final newline."""
+    line_start = text.rfind('\n', 0, start) + 1
+    line_end = text.find('\n', max(start, end - 1))
+    return line_start, len(text) if line_end == -1 else line_end
+
+
+def redaction_spans(text: str) -> List[Tuple[int, int]]:
+    """Return sorted, merged line spans to redact."""
+    spans: List[Tuple[int, int]] = []
+    pem_start = None
+    marker_line = None  # (line_start, line_end, is_begin) of the latest marker line
+
+    def close_marker_line():
+        nonlocal pem_start
+        line_start, line_end, is_begin = marker_line
+        if is_begin:
+            if pem_start is None:
+                pem_start = line_start
+        elif pem_start is not None:
+            spans.append((pem_start, line_end))
+            pem_start = None
+        else:
+            spans.append((line_start, line_end))
+
+    for kind, start, end in iter_matches(text):
+        is_begin = kind in _PEM_BEGIN
+        if is_begin or kind == 'pem_end':
+            line_start, line_end = _line_span(text, start, start)
+            if marker_line is not None and marker_line[0] == line_start:
+                # BEGIN wins over END on the same line
+                marker_line = (line_start, line_end, marker_line[2] or is_begin)
+            else:
+                if marker_line is not None:
+                    close_marker_line()
+                marker_line = (line_start, line_end, is_begin)
+            if kind != 'private_key':
+                continue
+        spans.append(_line_span(text, start, end))
+
+    if marker_line is not None:
+        close_marker_line()
+    if pem_start is not None:
+        spans.append((pem_start, len(text)))
+
+    spans.sort()
+    merged: List[Tuple[int, int]] = []
+    for start, end in spans:
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def redact_secrets(text: str) -> str:
+    """Replace every line touched by a rule with ``[REDACTED]``.
+
+    Matching runs once over the whole buffer; only the affected line ranges
+    are rewritten, everything else is copied through in slices.
+    """
+    spans = redaction_spans(text)
+    if not spans:
+        return text
+    parts = []
+    pos = 0
+    for start, end in spans:
+        parts.append(text[pos:start])
+        parts.append('\n'.join([REDACTED] * (text.count('\n', start, end) + 1)))
+        pos = end
+    parts.append(text[pos:])
+    return ''.join(parts)
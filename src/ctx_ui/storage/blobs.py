@@ -0,0 +1,183 @@
+"""Content-addressed, zlib-compressed blob store with reference-counted garbage collection."""
+
+from pathlib import Path
+from typing import Iterable, Iterator, Tuple
+import hashlib
+import os
+import sqlite3
+import tempfile
+import time
+import zlib
+from ..context.hashing import HASH_CHUNK_BYTES
+
+HASH_PREFIX = 'sha256:'
+
+
+def blob_hash(data: bytes) -> str:
+    """Key of a blob: ``sha256:`` and the hex digest of its bytes, as in ``Snippet.hash``."""
+    return HASH_PREFIX + hashlib.sha256(data).hexdigest()
+
+
+class BlobStore:
+    """Immutable blobs stored once per distinct content.
+
+    Blobs live under ``objects/<2 hex>/<62 hex>`` as zlib streams and are
+    written atomically, so putting content that is already stored costs a
+    hash and a ``stat``. Owners (such as saved context packs) reference
+    blobs in a small SQLite table; a blob's reference count is the number of
+    owners holding it, and ``gc()`` deletes blobs nobody references.
+    """
+
+    def __init__(self, directory: Path, level: int = 6):
+        self.directory = Path(directory)
+        self.level = level
+        self.objects = self.directory / 'objects'
+        self.objects.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.directory / 'refs.db'
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS refs (
+                    owner TEXT NOT NULL,
+                    hash TEXT NOT NULL,
+                    PRIMARY KEY (owner, hash)
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS refs_hash ON refs (hash)')
+            conn.commit()
+
+    def _object_path(self, key: str) -> Path:
+        if not key.startswith(HASH_PREFIX) or len(key) != len(HASH_PREFIX) + 64:
+            raise KeyError(key)
+        digest = key[len(HASH_PREFIX):]
+        return self.objects / digest[:2] / digest[2:]
+
+    def __contains__(self, key: str) -> bool:
+        try:
+            return self._object_path(key).exists()
+        except KeyError:
+            return False
+
+    def put(self, data: bytes) -> str:
+        """Store bytes if they are not stored yet and return their key."""
+        key = blob_hash(data)
+        path = self._object_path(key)
+        try:
+            # Refresh the age checked by gc() so a concurrent collection keeps it
+            os.utime(path)
+            return key
+        except FileNotFoundError:
+            pass
+        path.parent.mkdir(exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(zlib.compress(data, self.level))
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return key
+
+    def put_file(self, path, chunk_size: int = HASH_CHUNK_BYTES) -> str:
+        """Store a file's bytes, streamed in chunks, and return their key.
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        digest = hashlib.sha256()
+        compressor = zlib.compressobj(self.level)
+        fd, tmp = tempfile.mkstemp(dir=self.objects, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as out, open(path, 'rb') as f:
+                while True:
+                    chunk = f.read(chunk_size)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    out.write(compressor.compress(chunk))
+                out.write(compressor.flush())
+            key = HASH_PREFIX + digest.hexdigest()
+            target = self._object_path(key)
+            if target.exists():
+                os.utime(target)
+                os.unlink(tmp)
+            else:
+                target.parent.mkdir(exist_ok=True)
+                os.replace(tmp, target)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        return key
+
+    def get(self, key: str) -> bytes:
+        """Return the bytes of a blob.
+
+        Raises:
+            KeyError: If the blob is not stored
+            ValueError: If the stored blob is corrupt
+        """
+        try:
+            compressed = self._object_path(key).read_bytes()
+        except FileNotFoundError:
+            raise KeyError(key) from None
+        try:
+            data = zlib.decompress(compressed)
+        except zlib.error as e:
+            raise ValueError(f'Corrupt blob {key}: {e}') from None
+        if blob_hash(data) != key:
+            raise ValueError(f'Corrupt blob {key}: content does not match its hash')
+        return data
+
+    def retain(self, owner: str, keys: Iterable[str]):
+        """Make ``owner`` reference exactly ``keys``, replacing what it held before."""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('DELETE FROM refs WHERE owner = ?', (owner,))
+            conn.executemany('INSERT OR IGNORE INTO refs (owner, hash) VALUES (?, ?)', ((owner, k) for k in keys))
+            conn.commit()
+
+    def release(self, owner: str):
+        """Drop every reference held by ``owner``."""
+        self.retain(owner, ())
+
+    def refcount(self, key: str) -> int:
+        """Number of owners referencing a blob."""
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute('SELECT COUNT(*) FROM refs WHERE hash = ?', (key,)).fetchone()[0]
+
+    def _iter_objects(self) -> Iterator[Tuple[str, Path]]:
+        for bucket in self.objects.iterdir():
+            if not bucket.is_dir():
+                continue
+            for path in bucket.iterdir():
+                if not path.name.startswith('.tmp-'):
+                    yield HASH_PREFIX + bucket.name + path.name, path
+
+    def usage(self) -> Tuple[int, int]:
+        """Number of stored blobs and their compressed size in bytes."""
+        count = size = 0
+        for _, path in self._iter_objects():
+            count += 1
+            size += path.stat().st_size
+        return count, size
+
+    def gc(self, min_age: float = 60.0) -> int:
+        """Delete unreferenced blobs and return how many were removed.
+
+        Blobs written or re-put in the last ``min_age`` seconds are kept, so
+        content stored just before its owner is saved is not collected.
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            referenced = {row[0] for row in conn.execute('SELECT DISTINCT hash FROM refs')}
+        cutoff = time.time() - min_age
+        removed = 0
+        for key, path in self._iter_objects():
+            if key in referenced:
+                continue
+            try:
+                if path.stat().st_mtime <= cutoff:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                continue
+        return removed
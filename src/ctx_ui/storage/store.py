@@ -30,6 +30,14 @@ class MetadataStore:
                 )
             ''')
             
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS directories (
+                    path TEXT PRIMARY KEY,
+                    mtime_ns INTEGER NOT NULL,
+                    entries TEXT NOT NULL
+                )
+            ''')
+            
             conn.execute('''
                 CREATE TABLE IF NOT EXISTS tasks (
                     id TEXT PRIMARY KEY,
@@ -78,6 +86,41 @@ class MetadataStore:
             cursor = conn.execute('SELECT * FROM files ORDER BY path')
             return [dict(row) for row in cursor.fetchall()]
     
+    def load_directory_snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Load the persisted directory listings keyed by relative path."""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute('SELECT path, mtime_ns, entries FROM directories')
+            snapshot = {}
+            for path, mtime_ns, entries in cursor:
+                listing = json.loads(entries)
+                snapshot[path] = {'mtime_ns': mtime_ns, 'files': listing['files'], 'dirs': listing['dirs']}
+            return snapshot
+    
+    def save_index_changes(
+        self,
+        dirs: Dict[str, Dict[str, Any]],
+        removed_dirs: List[str],
+        removed_files: List[str]
+    ):
+        """Persist changed directory listings and drop deleted files in one transaction.
+        
+        Args:
+            dirs: Changed listings, ``{path: {'mtime_ns', 'files', 'dirs'}}``
+            removed_dirs: Directory paths that no longer exist
+            removed_files: File paths that no longer exist
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany('DELETE FROM directories WHERE path = ?', [(p,) for p in removed_dirs])
+            conn.executemany(
+                'INSERT OR REPLACE INTO directories (path, mtime_ns, entries) VALUES (?, ?, ?)',
+                [
+                    (path, d['mtime_ns'], json.dumps({'files': d['files'], 'dirs': d['dirs']}))
+                    for path, d in dirs.items()
+                ]
+            )
+            conn.executemany('DELETE FROM files WHERE path = ?', [(p,) for p in removed_files])
+            conn.commit()
+    
     def save_task(self, task_id: str, title: str, description: str, context_pack: Optional[str], metadata: Optional[Dict[str, Any]] = None):
         """Save task metadata."""
         with sqlite3.connect(self.db_path) as conn:
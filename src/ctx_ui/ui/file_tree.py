@@ -0,0 +1,158 @@
+"""File tree model - nested dicts built from the flat index and their diffs."""
+
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+# (kind, path) where kind is add_dir, remove_dir, add_file or remove_file
+TreeChange = Tuple[str, str]
+
+
+def build_file_tree(files: List[Path]) -> Dict:
+    """Build a hierarchical tree structure from flat file list.
+    
+    Each directory's ``_files`` list keeps the order of ``files``, so a
+    sorted file list (such as ``LiveIndex.files()``) gives sorted nodes.
+    """
+    tree = {}
+    
+    for file_path in files:
+        parts = file_path.parts
+        current = tree
+        
+        for i, part in enumerate(parts):
+            if i == len(parts) - 1:
+                # It's a file
+                if '_files' not in current:
+                    current['_files'] = []
+                current['_files'].append(file_path)
+            else:
+                # It's a directory
+                if part not in current:
+                    current[part] = {}
+                current = current[part]
+    
+    return tree
+
+
+def tree_node_at(tree: Dict, dir_path: str) -> Optional[Dict]:
+    """Return the node of a ``/``-separated directory path, or None if absent."""
+    node = tree
+    if dir_path:
+        for part in dir_path.split('/'):
+            node = node.get(part)
+            if node is None:
+                return None
+    return node
+
+
+def diff_file_trees(old: Dict, new: Dict, parent_path: str = '') -> List[TreeChange]:
+    """Compute the changes turning one ``build_file_tree`` result into another.
+    
+    Added or removed directories are reported once, without their contents,
+    since the UI creates and deletes them as a whole. Removals come before
+    additions and parents before children.
+    
+    Returns:
+        List of ``(kind, path)`` changes with ``/``-separated paths
+    """
+    prefix = f'{parent_path}/' if parent_path else ''
+    old_dirs = {key for key in old if key != '_files'}
+    new_dirs = {key for key in new if key != '_files'}
+    old_files = set(old.get('_files', ()))
+    new_files = set(new.get('_files', ()))
+    
+    changes: List[TreeChange] = []
+    changes.extend(('remove_dir', prefix + key) for key in sorted(old_dirs - new_dirs))
+    changes.extend(('remove_file', f.as_posix()) for f in sorted(old_files - new_files))
+    changes.extend(('add_dir', prefix + key) for key in sorted(new_dirs - old_dirs))
+    changes.extend(('add_file', f.as_posix()) for f in sorted(new_files - old_files))
+    for key in sorted(old_dirs & new_dirs):
+        if old[key] is not new[key]:
+            changes.extend(diff_file_trees(old[key], new[key], prefix + key))
+    return changes
+
+
+def _has_ancestor_in(path: str, dirs) -> bool:
+    """Whether a strict ancestor directory of a ``/``-separated path is in ``dirs``."""
+    parent = path.rpartition('/')[0]
+    while parent:
+        if parent in dirs:
+            return True
+        parent = parent.rpartition('/')[0]
+    return False
+
+
+def _remove_file(tree: Dict, file_path: Path) -> Optional[TreeChange]:
+    """Remove one file, pruning directories it leaves empty."""
+    parts = file_path.parts
+    chain = [tree]
+    for part in parts[:-1]:
+        node = chain[-1].get(part)
+        if node is None:
+            return None
+        chain.append(node)
+    
+    node_files = chain[-1].get('_files', [])
+    i = bisect_left(node_files, file_path)
+    if i == len(node_files) or node_files[i] != file_path:
+        return None
+    del node_files[i]
+    if not node_files:
+        del chain[-1]['_files']
+    
+    # Prune empty directories bottom-up; report the topmost one
+    depth = len(chain) - 1
+    while depth > 0 and not chain[depth]:
+        del chain[depth - 1][parts[depth - 1]]
+        depth -= 1
+    if depth < len(chain) - 1:
+        return ('remove_dir', '/'.join(parts[:depth + 1]))
+    return ('remove_file', file_path.as_posix())
+
+
+def apply_tree_delta(tree: Dict, added: List[Path], removed: List[Path]) -> List[TreeChange]:
+    """Update a ``build_file_tree`` result in place with an index delta.
+    
+    Each path costs a walk from the root and a binary search in its
+    directory, so a delta such as ``LiveIndex`` listeners receive touches
+    only the directories along its paths. Changes are reported as
+    ``diff_file_trees`` reports them: whole added or removed directories
+    once, removals before additions and parents before children.
+    
+    Returns:
+        List of ``(kind, path)`` changes with ``/``-separated paths
+    """
+    removals = [change for change in (_remove_file(tree, p) for p in removed) if change is not None]
+    removed_dirs = {path for kind, path in removals if kind == 'remove_dir'}
+    changes = [change for change in removals if not _has_ancestor_in(change[1], removed_dirs)]
+    
+    added_dirs = set()
+    for file_path in added:
+        parts = file_path.parts
+        node = tree
+        created = None
+        for depth, part in enumerate(parts[:-1]):
+            if part not in node:
+                node[part] = {}
+                if created is None:
+                    created = '/'.join(parts[:depth + 1])
+            node = node[part]
+        
+        node_files = node.setdefault('_files', [])
+        i = bisect_left(node_files, file_path)
+        if i < len(node_files) and node_files[i] == file_path:
+            continue
+        node_files.insert(i, file_path)
+        
+        # Contents of a directory added in this delta are not reported
+        path = created or file_path.as_posix()
+        if _has_ancestor_in(path, added_dirs):
+            continue
+        if created is not None:
+            added_dirs.add(created)
+            changes.append(('add_dir', created))
+        else:
+            changes.append(('add_file', path))
+    return changes
@@ -0,0 +1,40 @@
+"""HTTP route streaming stored prompts to the copy and download buttons."""
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from nicegui import app
+import os
+from ..prompts.store import PromptStore, iter_file
+
+PROMPT_ROUTE = '/prompts'
+
+
+def prompt_url(prompt_id: str, download: bool = False) -> str:
+    """URL of a stored prompt; ``download`` asks the browser to save it."""
+    return f'{PROMPT_ROUTE}/{prompt_id}' + ('?download=1' if download else '')
+
+
+def register_prompt_routes(store: PromptStore):
+    """Serve the prompts of ``store`` under ``PROMPT_ROUTE``."""
+
+    @app.get(PROMPT_ROUTE + '/{prompt_id}')
+    def get_prompt(prompt_id: str, download: bool = False):
+        record = store.get(prompt_id)
+        if record is None:
+            raise HTTPException(status_code=404, detail='Prompt not found')
+        # The prompt may be evicted at any time; once open, the handle stays readable
+        try:
+            f = open(record.path, 'rb')
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail='Prompt not found') from None
+        headers = {
+            'Cache-Control': 'no-store',
+            'Content-Length': str(os.fstat(f.fileno()).st_size),
+        }
+        if download:
+            headers['Content-Disposition'] = f'attachment; filename="{record.kind.lower()}-prompt.md"'
+        return StreamingResponse(
+            iter_file(f),
+            media_type='text/markdown; charset=utf-8',
+            headers=headers
+        )
@@ -1,45 +1,60 @@
 """Main View - Simplified Context File Picker + Prompt Query."""
 
-from nicegui import ui, app
+from nicegui import ui, background_tasks
+from bisect import bisect_left
+from collections import deque
 from pathlib import Path
-from typing import List, Dict, Set
-from ...context.indexer import list_repo_files
+from typing import Deque, List, Dict, Set, Tuple
+from ...context.binary import BinaryDetector
+from ...context.imports import ImportGraph
+from ...context.live_index import LiveIndex
+from ...context.search import PathSearchIndex
+from ...context.symbols import SymbolIndex, language_for
+from ..file_tree import apply_tree_delta, build_file_tree, diff_file_trees, tree_node_at
 from ...config import AppState
-from ...prompts.generators import generate_copilot_prompt_text, generate_chatgpt_prompt_text
-import asyncio
+from ...prompts.file_cache import RenderedFileCache
+from ...prompts.generators import iter_chatgpt_prompt, iter_copilot_prompt
+from ...prompts.store import PromptStore, StoredPrompt
+from ..prompt_routes import prompt_url
 
 
-def build_file_tree(files: List[Path]) -> Dict:
-    """Build a hierarchical tree structure from flat file list."""
-    tree = {}
-    
-    for file_path in files:
-        parts = file_path.parts
-        current = tree
-        
-        for i, part in enumerate(parts):
-            if i == len(parts) - 1:
-                # It's a file
-                if '_files' not in current:
-                    current['_files'] = []
-                current['_files'].append(file_path)
-            else:
-                # It's a directory
-                if part not in current:
-                    current[part] = {}
-                current = current[part]
-    
-    return tree
+# File rows rendered per page inside one directory
+TREE_PAGE_SIZE = 200
+
+# Results shown for a file search
+SEARCH_RESULT_LIMIT = 50
+
+# Token budget weight of files added by "Add Dependencies" (hand-picked files weigh 1.0)
+DEPENDENCY_PRIORITY = 0.5
 
 
 def main_page(state: AppState):
     """Create the main simplified page."""
     
-    # Initialize file changes tracking
-    if not hasattr(app.storage.general, 'file_changes'):
-        app.storage.general['file_changes'] = []
-    
-    last_change_count = {'value': len(app.storage.general.get('file_changes', []))}
+    # Shared index kept current from watcher events
+    if state.live_index is None:
+        state.live_index = LiveIndex.from_config(state.config)
+    live_index = state.live_index
+    if state.search_index is None:
+        state.search_index = PathSearchIndex.from_live_index(live_index)
+    search_index = state.search_index
+    if state.file_cache is None:
+        state.file_cache = RenderedFileCache(state.config.prompt_cache_max_bytes)
+    file_cache = state.file_cache
+    if state.binary_detector is None:
+        state.binary_detector = BinaryDetector()
+    binary_detector = state.binary_detector
+    if state.prompt_store is None:
+        state.prompt_store = PromptStore(
+            max_prompts=state.config.prompt_store_max, preview_chars=state.config.prompt_preview_chars
+        )
+    prompt_store = state.prompt_store
+    if state.symbol_index is None:
+        state.symbol_index = SymbolIndex()
+    symbol_index = state.symbol_index
+    if state.import_graph is None:
+        state.import_graph = ImportGraph.from_live_index(live_index)
+    import_graph = state.import_graph
     
     # Simple header without navigation
     with ui.header().classes('items-center justify-between'):
@@ -60,108 +75,296 @@ def main_page(state: AppState):
         
         # State variables
         selected_files: Set[str] = set()
-        file_checkboxes: Dict[str, ui.checkbox] = {}
+        file_checkboxes: Dict[str, ui.checkbox] = {}  # Only rows currently rendered
+        dir_views: Dict[str, Dict] = {}  # Rendered directories by path ('' is the root)
+        search_checkboxes: Dict[str, ui.checkbox] = {}  # Rows of the current search results
+        selected_symbols: Dict[str, Set[str]] = {}  # Symbol names to embed instead of whole files
+        outlined_files: Set[str] = set()  # Files outlined with their selected symbols pinned
+        dependency_files: Set[str] = set()  # Selected by "Add Dependencies" rather than by hand
         output_expanded = {'value': False}  # Track expansion state
+        current_prompt = {'record': None}  # Latest StoredPrompt shown in the output area
+        
+        # File tree state. Index deltas are queued from the watcher thread and
+        # applied on the event loop; the listener is attached before the
+        # snapshot is taken so no delta falls in between.
+        pending_deltas: Deque[Tuple[List[Path], List[Path]]] = deque()
         
-        # File tree state
-        files = list_repo_files(repo, state.config.index_include, state.config.index_exclude)
-        file_tree = build_file_tree(files)
+        def queue_delta(added: List[Path], removed: List[Path]):
+            pending_deltas.append((added, removed))
+        
+        connection = {'unsubscribe': live_index.subscribe(queue_delta), 'subscription': None, 'version': None}
+        file_tree = build_file_tree(live_index.files())
         file_count_label = None
         tree_container = None
         
-        def rebuild_file_tree():
-            """Rebuild the file tree from scratch."""
-            nonlocal files, file_tree, tree_container, file_count_label
-            
-            # Re-scan files
-            files = list_repo_files(repo, state.config.index_include, state.config.index_exclude)
-            file_tree = build_file_tree(files)
+        def apply_index_deltas():
+            """Patch the tree with the index deltas queued since the last call."""
+            changes = []
+            while pending_deltas:
+                added, removed = pending_deltas.popleft()
+                changes.extend(apply_tree_delta(file_tree, added, removed))
+            if changes:
+                patch_rendered_tree(changes)
+        
+        def resync_file_tree():
+            """Rebuild the tree from a fresh index snapshot, for deltas that were missed."""
+            nonlocal file_tree
+            pending_deltas.clear()
+            new_tree = build_file_tree(live_index.files())
+            changes = diff_file_trees(file_tree, new_tree)
+            file_tree = new_tree
+            patch_rendered_tree(changes)
+        
+        def patch_rendered_tree(changes):
+            """Apply tree changes to the UI.
             
+            Only nodes whose directory is already rendered are touched, so open
+            folders stay open and existing checkboxes keep their state.
+            """
             # Update count label
             if file_count_label:
-                file_count_label.text = f'{len(files)} files found'
+                file_count_label.text = f'{len(live_index)} files found'
             
-            # Rebuild tree
-            if tree_container:
-                tree_container.clear()
-                with tree_container:
-                    render_tree(file_tree)
+            # Apply changes to rendered directories only
+            touched = set()
+            for kind, path in changes:
+                parent, _, name = path.rpartition('/')
+                if kind == 'remove_dir':
+                    forget_dir(path)
+                view = dir_views.get(parent)
+                if view is None:
+                    continue
+                touched.add(parent)
+                if kind == 'remove_dir':
+                    remove_subdir(view, name)
+                elif kind == 'add_dir':
+                    add_subdir(view, name)
+                elif kind == 'remove_file':
+                    remove_file_row(view, name)
+                else:
+                    add_file_row(view, name)
+            for parent in touched:
+                if parent in dir_views:
+                    update_more_button(dir_views[parent])
             
             # Preserve selections but remove deleted files
-            deleted_files = [f for f in selected_files if f not in {str(p) for p in files}]
+            deleted_files = [f for f in selected_files if Path(f) not in live_index]
             for deleted in deleted_files:
                 selected_files.discard(deleted)
+                selected_symbols.pop(deleted, None)
+                outlined_files.discard(deleted)
+                dependency_files.discard(deleted)
                 if deleted in file_checkboxes:
                     del file_checkboxes[deleted]
             
             update_selected_count()
+            if search_input.value:
+                run_search()
+        
+        def run_search():
+            """Show ranked matches for the search box, or the tree when it is empty."""
+            query = search_input.value or ''
+            search_results.clear()
+            search_checkboxes.clear()
+            if not query.strip():
+                search_results.set_visibility(False)
+                tree_container.set_visibility(True)
+                return
+            
+            matches = search_index.search(query, limit=SEARCH_RESULT_LIMIT)
+            tree_container.set_visibility(False)
+            search_results.set_visibility(True)
+            with search_results:
+                if not matches:
+                    ui.label('No matching files').classes('text-sm text-gray-500')
+                for path in matches:
+                    file_str = path.as_posix()
+                    with ui.row().classes('w-full items-center gap-2'):
+                        search_checkboxes[file_str] = ui.checkbox(
+                            '',
+                            value=file_str in selected_files,
+                            on_change=lambda e, f=file_str: toggle_file(f, e.value)
+                        )
+                        ui.label(file_str).classes('text-sm')
         
         def force_refresh():
-            """Force immediate refresh of file tree."""
-            rebuild_file_tree()
+            """Force a full rescan and refresh of the file tree."""
+            live_index.rescan()
+            apply_index_deltas()
             ui.notify('🔄 File tree refreshed', type='info')
         
-        async def check_for_changes():
-            """Periodically check for file system changes and refresh if needed."""
-            while True:
-                await asyncio.sleep(2)  # Check every 2 seconds
+        async def consume_changes(subscription):
+            """Refresh the tree as change batches are pushed by the watcher."""
+            async for batch in subscription:
+                apply_index_deltas()
                 
-                current_count = len(app.storage.general.get('file_changes', []))
-                if current_count > last_change_count['value']:
-                    # Changes detected - refresh the tree
-                    last_change_count['value'] = current_count
-                    rebuild_file_tree()
-                    
-                    # Show notification
-                    changes = app.storage.general.get('file_changes', [])
-                    if changes:
-                        latest = changes[-1]
-                        ui.notify(
-                            f'📁 File {latest["type"]}: {latest["path"]}',
-                            type='info',
-                            position='top-right',
-                            timeout=3000
-                        )
-        
-        # Start background change monitoring
-        ui.timer(2.0, check_for_changes, once=False)
+                # Show notification
+                if batch.overflow:
+                    # Either the watcher or this tab fell behind; the tree was reloaded from the index
+                    message = '📁 Too many changes to list - file tree refreshed'
+                elif len(batch.changes) == 1:
+                    path, event_type = batch.changes[0]
+                    message = f'📁 File {event_type}: {path}'
+                else:
+                    message = f'📁 {len(batch.changes)} files changed'
+                with tree_container:
+                    ui.notify(message, type='info', position='top-right', timeout=3000)
         
         # Main layout: Left (file browser) + Right (prompt area + output)
         with ui.splitter(value=25).classes('w-full').style('height: calc(100vh - 180px)') as splitter:
             with splitter.before:
                 with ui.card().classes('w-full h-full overflow-y-auto p-4'):
                     ui.label('📂 Project Files').classes('text-lg font-bold mb-2')
-                    file_count_label = ui.label(f'{len(files)} files found').classes('text-sm text-gray-600 mb-4')
+                    file_count_label = ui.label(f'{len(live_index)} files found').classes('text-sm text-gray-600 mb-4')
+                    
+                    # Fuzzy search replaces the tree while a query is entered
+                    search_input = ui.input(
+                        placeholder='Search files...',
+                        on_change=lambda: run_search()
+                    ).classes('w-full mb-2').props('dense outlined clearable')
+                    search_results = ui.column().classes('w-full gap-0')
+                    search_results.set_visibility(False)
                     
                     # File tree with checkboxes
                     tree_container = ui.column().classes('w-full')
                     
-                    def render_tree(tree_node: Dict, parent_path: str = '', level: int = 0):
-                        """Recursively render the file tree."""
-                        indent = '  ' * level
+                    def render_dir(dir_path: str):
+                        """Render a directory's subfolders and first page of files in the current context."""
+                        node = tree_node_at(file_tree, dir_path) or {}
+                        view = {
+                            'path': dir_path,
+                            'dirs_column': ui.column().classes('w-full gap-0'),
+                            'files_column': ui.column().classes('w-full gap-0'),
+                            'more_row': ui.row().classes('w-full'),
+                            'dir_names': [],  # Sorted names of rendered subfolders
+                            'subdirs': {},
+                            'names': [],  # Sorted names of rendered file rows
+                            'rows': {},
+                            'limit': TREE_PAGE_SIZE,
+                            'more': None,
+                        }
+                        dir_views[dir_path] = view
+                        
+                        # Render directories first; their children render when first expanded
+                        for key in sorted(k for k in node if k != '_files'):
+                            add_subdir(view, key)
+                        
+                        # Render files in pages so huge directories stay responsive
+                        for file_path in node.get('_files', [])[:view['limit']]:
+                            add_file_row(view, file_path.name)
+                        update_more_button(view)
+                    
+                    def child_path(view: Dict, name: str) -> str:
+                        return f"{view['path']}/{name}" if view['path'] else name
+                    
+                    def expand_dir(expansion: ui.expansion, dir_path: str, opened: bool):
+                        """Create a directory's children the first time it is opened."""
+                        if not opened or dir_path in dir_views:
+                            return
+                        with expansion:
+                            render_dir(dir_path)
+                    
+                    def add_subdir(view: Dict, name: str):
+                        """Insert a folder at its sorted position."""
+                        index = bisect_left(view['dir_names'], name)
+                        with view['dirs_column']:
+                            expansion = ui.expansion(
+                                name,
+                                icon='folder',
+                                on_value_change=lambda e, path=child_path(view, name): expand_dir(e.sender, path, e.value)
+                            ).classes('w-full').props('dense')
+                        if index < len(view['dir_names']):
+                            expansion.move(target_index=index)
+                        view['dir_names'].insert(index, name)
+                        view['subdirs'][name] = expansion
+                    
+                    def remove_subdir(view: Dict, name: str):
+                        expansion = view['subdirs'].pop(name, None)
+                        if expansion is not None:
+                            view['dir_names'].remove(name)
+                            expansion.delete()
+                    
+                    def forget_dir(dir_path: str):
+                        """Drop registry entries for a removed directory and everything below it."""
+                        prefix = dir_path + '/'
+                        for path in [p for p in dir_views if p == dir_path or p.startswith(prefix)]:
+                            del dir_views[path]
+                        for path in [p for p in file_checkboxes if p.startswith(prefix)]:
+                            del file_checkboxes[path]
+                    
+                    def add_file_row(view: Dict, name: str):
+                        """Insert a file row at its sorted position if it falls within the rendered page."""
+                        index = bisect_left(view['names'], name)
+                        if index >= view['limit'] or name in view['rows']:
+                            return
+                        file_str = child_path(view, name)
+                        with view['files_column']:
+                            with ui.row().classes('w-full items-center gap-2') as row:
+                                checkbox = ui.checkbox(
+                                    '',
+                                    value=file_str in selected_files,
+                                    on_change=lambda e, f=file_str: toggle_file(f, e.value)
+                                )
+                                ui.label(name).classes('text-sm')
+                        if index < len(view['names']):
+                            row.move(target_index=index)
+                        view['names'].insert(index, name)
+                        view['rows'][name] = row
+                        file_checkboxes[file_str] = checkbox
                         
-                        # Render directories first
-                        for key in sorted(tree_node.keys()):
-                            if key == '_files':
-                                continue
-                            
-                            dir_path = f"{parent_path}/{key}" if parent_path else key
-                            
-                            with ui.expansion(key, icon='folder').classes('w-full').props('dense'):
-                                render_tree(tree_node[key], dir_path, level + 1)
+                        # Keep the page bounded by pushing the last row back behind "Show more"
+                        if len(view['names']) > view['limit']:
+                            remove_file_row(view, view['names'][-1], refill=False)
+                    
+                    def remove_file_row(view: Dict, name: str, refill: bool = True):
+                        """Delete a file row, pulling in the next unrendered file to keep the page full."""
+                        row = view['rows'].pop(name, None)
+                        if row is None:
+                            return
+                        view['names'].remove(name)
+                        row.delete()
+                        file_checkboxes.pop(child_path(view, name), None)
+                        if not refill or not view['names']:
+                            return
                         
-                        # Render files
-                        if '_files' in tree_node:
-                            for file_path in sorted(tree_node['_files']):
-                                file_str = str(file_path)
-                                
-                                with ui.row().classes('w-full items-center gap-2'):
-                                    checkbox = ui.checkbox('', value=False, on_change=lambda e, f=file_str: toggle_file(f, e.value))
-                                    file_checkboxes[file_str] = checkbox
-                                    ui.label(file_path.name).classes('text-sm')
+                        # Rendered rows are the start of the directory's sorted files
+                        node_files = (tree_node_at(file_tree, view['path']) or {}).get('_files', [])
+                        index = bisect_left(node_files, Path(child_path(view, view['names'][-1])))
+                        for file_path in node_files[index:]:
+                            if file_path.name not in view['rows']:
+                                add_file_row(view, file_path.name)
+                                break
+                    
+                    def update_more_button(view: Dict):
+                        """Show how many files of a directory are not rendered yet."""
+                        node = tree_node_at(file_tree, view['path']) or {}
+                        remaining = len(node.get('_files', [])) - len(view['names'])
+                        if remaining <= 0:
+                            if view['more'] is not None:
+                                view['more'].delete()
+                                view['more'] = None
+                            return
+                        label = f'Show more ({remaining} remaining)'
+                        if view['more'] is None:
+                            with view['more_row']:
+                                view['more'] = ui.button(
+                                    label,
+                                    on_click=lambda v=view: show_more(v),
+                                    icon='expand_more'
+                                ).props('flat dense size=sm')
+                        else:
+                            view['more'].text = label
+                    
+                    def show_more(view: Dict):
+                        """Render the next page of a directory's files."""
+                        view['limit'] += TREE_PAGE_SIZE
+                        node = tree_node_at(file_tree, view['path']) or {}
+                        for file_path in node.get('_files', [])[:view['limit']]:
+                            add_file_row(view, file_path.name)
+                        update_more_button(view)
                     
                     with tree_container:
-                        render_tree(file_tree)
+                        render_dir('')
             
             with splitter.after:
                 with ui.card().classes('w-full h-full p-4').style('display: flex; flex-direction: column; overflow: hidden;'):
@@ -170,7 +373,16 @@ def main_page(state: AppState):
                     # Selected files summary
                     with ui.row().classes('w-full items-center justify-between gap-2 mb-2'):
                         selected_count = ui.label('0 files selected').classes('text-sm font-semibold text-gray-700')
-                        ui.button('Clear All', on_click=lambda: clear_all_selections(), icon='clear').props('flat dense size=sm')
+                        with ui.row().classes('items-center gap-1'):
+                            hops_input = ui.number(
+                                value=state.config.dependency_hops, min=1, max=10, step=1, format='%d'
+                            ).props('dense outlined').classes('w-16').tooltip('Import hops to follow')
+                            ui.button(
+                                'Add Dependencies',
+                                on_click=lambda: add_dependencies(),
+                                icon='account_tree'
+                            ).props('flat dense size=sm').tooltip('Select the repo modules imported by the selected files')
+                            ui.button('Clear All', on_click=lambda: clear_all_selections(), icon='clear').props('flat dense size=sm')
                     
                     # Selected files list (collapsible)
                     selected_files_container = ui.column().classes('w-full mb-2').style('max-height: 100px; overflow-y: auto; flex-shrink: 0;')
@@ -235,20 +447,54 @@ def main_page(state: AppState):
         
         def toggle_file(file_path: str, checked: bool):
             """Toggle file selection."""
+            dependency_files.discard(file_path)
             if checked:
                 selected_files.add(file_path)
             else:
                 selected_files.discard(file_path)
+                selected_symbols.pop(file_path, None)
+                outlined_files.discard(file_path)
+            
+            # Keep the tree and search rows of the same file in sync
+            for checkboxes in (file_checkboxes, search_checkboxes):
+                checkbox = checkboxes.get(file_path)
+                if checkbox is not None and checkbox.value != checked:
+                    checkbox.value = checked
             update_selected_count()
         
         def clear_all_selections():
             """Clear all selected files."""
             selected_files.clear()
-            for checkbox in file_checkboxes.values():
+            selected_symbols.clear()
+            outlined_files.clear()
+            dependency_files.clear()
+            for checkbox in [*file_checkboxes.values(), *search_checkboxes.values()]:
                 checkbox.value = False
             update_selected_count()
             ui.notify('Cleared all selections', type='info')
         
+        def add_dependencies():
+            """Select the repo modules imported by the selection, up to the chosen number of hops."""
+            if not selected_files:
+                ui.notify('Select at least one Python file first', type='warning')
+                return
+            hops = max(1, int(hops_input.value or 1))
+            added = [p.as_posix() for p in import_graph.dependencies(selected_files, hops)]
+            if not added:
+                ui.notify('The selected files import no other repository modules', type='info')
+                return
+            
+            selected_files.update(added)
+            for file_path in added:
+                for checkboxes in (file_checkboxes, search_checkboxes):
+                    checkbox = checkboxes.get(file_path)
+                    if checkbox is not None:
+                        checkbox.value = True
+            # After the checkboxes, whose change handlers count as picking by hand
+            dependency_files.update(added)
+            update_selected_count()
+            ui.notify(f'Added {len(added)} dependencies within {hops} hop(s)', type='positive')
+        
         def update_selected_count():
             """Update the selected files count and list."""
             count = len(selected_files)
@@ -261,13 +507,69 @@ def main_page(state: AppState):
                     for file_path in sorted(selected_files):
                         with ui.row().classes('w-full items-center gap-1'):
                             ui.icon('description', size='xs').classes('text-blue-600')
-                            ui.label(file_path).classes('text-xs text-gray-700')
+                            names = selected_symbols.get(file_path)
+                            label = f'{file_path} ({len(names)} symbols)' if names else file_path
+                            if file_path in outlined_files:
+                                label += ' (outline)'
+                            ui.label(label).classes('text-xs text-gray-700')
+                            if language_for(file_path) is not None:
+                                ui.button(
+                                    icon='data_object',
+                                    on_click=lambda f=file_path: open_symbol_picker(f)
+                                ).props('flat dense size=xs').tooltip('Embed only some functions or classes')
+        
+        def open_symbol_picker(file_path: str):
+            """Let the user pick the functions, classes and methods of a file to embed."""
+            symbols = symbol_index.symbols(repo / file_path)
+            if not symbols:
+                ui.notify('No functions or classes found in this file', type='warning')
+                return
+            chosen = set(selected_symbols.get(file_path, ()))
+            
+            def pick(name: str, checked: bool):
+                if checked:
+                    chosen.add(name)
+                else:
+                    chosen.discard(name)
+            
+            def apply():
+                if chosen:
+                    selected_symbols[file_path] = set(chosen)
+                else:
+                    selected_symbols.pop(file_path, None)
+                if outline_switch.value:
+                    outlined_files.add(file_path)
+                else:
+                    outlined_files.discard(file_path)
+                dialog.close()
+                update_selected_count()
+            
+            with ui.dialog() as dialog, ui.card().classes('w-[36rem]'):
+                ui.label(f'Symbols in {file_path}').classes('text-lg font-bold')
+                outline_switch = ui.switch('Outline the rest of the file', value=file_path in outlined_files)
+                ui.label(
+                    'Checked symbols are embedded in full; without the outline, only they are embedded'
+                ).classes('text-xs text-gray-600')
+                with ui.scroll_area().classes('w-full h-96'):
+                    for symbol in symbols:
+                        ui.checkbox(
+                            f'{symbol.name} ({symbol.kind}, lines {symbol.start}-{symbol.end})',
+                            value=symbol.name in chosen,
+                            on_change=lambda e, n=symbol.name: pick(n, e.value)
+                        ).classes('text-sm').style(f'margin-left: {symbol.name.count(".") * 16}px')
+                with ui.row().classes('w-full justify-end gap-2'):
+                    ui.button('Cancel', on_click=dialog.close).props('flat')
+                    ui.button('Apply', on_click=apply).props('color=primary')
+            dialog.open()
         
         def start_fresh():
             """Clear everything and start fresh."""
             # Clear selected files
             selected_files.clear()
-            for checkbox in file_checkboxes.values():
+            selected_symbols.clear()
+            outlined_files.clear()
+            dependency_files.clear()
+            for checkbox in [*file_checkboxes.values(), *search_checkboxes.values()]:
                 checkbox.value = False
             update_selected_count()
             
@@ -276,6 +578,7 @@ def main_page(state: AppState):
             
             # Clear output
             output_area.value = ''
+            current_prompt['record'] = None
             
             # Clear copy button
             copy_container.clear()
@@ -300,17 +603,14 @@ def main_page(state: AppState):
                 return
             
             # Generate prompt using the dedicated generator
-            prompt_text = generate_copilot_prompt_text(user_query.value, selected_files)
-            output_area.value = prompt_text
-            
-            # Show copy button
-            copy_container.clear()
-            with copy_container:
-                ui.button(
-                    '📋 Copy Copilot Prompt',
-                    on_click=lambda: copy_prompt('Copilot'),
-                    icon='content_copy'
-                ).props('color=primary')
+            record = prompt_store.create(
+                iter_copilot_prompt(
+                    user_query.value, selected_files, repo,
+                    binary_detector=binary_detector, selected_symbols=selected_symbols
+                ),
+                kind='Copilot'
+            )
+            show_prompt(record, 'primary')
             
             ui.notify('✓ Copilot prompt generated! Copy and use with GitHub Copilot', type='positive', timeout=5000)
         
@@ -320,27 +620,104 @@ def main_page(state: AppState):
                 return
             
             # Generate prompt using the dedicated generator
-            prompt_text = generate_chatgpt_prompt_text(user_query.value, selected_files, repo)
-            output_area.value = prompt_text
+            budget_report = []
+            record = prompt_store.create(
+                iter_chatgpt_prompt(
+                    user_query.value, selected_files, repo, live_index,
+                    file_cache=file_cache, workers=state.config.prompt_render_workers,
+                    binary_detector=binary_detector,
+                    token_budget=state.config.prompt_token_budget or None,
+                    priorities={f: DEPENDENCY_PRIORITY for f in dependency_files},
+                    budget_report=budget_report,
+                    selected_symbols={f: n for f, n in selected_symbols.items() if f not in outlined_files},
+                    symbol_index=symbol_index,
+                    outline_large_files=state.config.prompt_outline_large_files,
+                    pinned_symbols={f: selected_symbols.get(f, ()) for f in outlined_files}
+                ),
+                kind='ChatGPT'
+            )
+            if budget_report:
+                ui.notify(f'{len(budget_report)} file(s) cut to fit the token budget', type='info')
+            show_prompt(record, 'secondary')
+            
+            ui.notify('✓ ChatGPT prompt generated! Copy and use with ChatGPT', type='positive', timeout=5000)
+        
+        def show_prompt(record: StoredPrompt, color: str):
+            """Preview a stored prompt and offer copy and download buttons."""
+            current_prompt['record'] = record
+            preview = record.preview
+            if record.truncated:
+                preview += (
+                    f'\n\n… preview shows the first {len(record.preview):,} of {record.size:,} characters;'
+                    ' use Copy or Download for the full prompt'
+                )
+            output_area.value = preview
             
-            # Show copy button
+            # Show copy and download buttons
             copy_container.clear()
             with copy_container:
                 ui.button(
-                    '📋 Copy ChatGPT Prompt',
-                    on_click=lambda: copy_prompt('ChatGPT'),
+                    f'📋 Copy {record.kind} Prompt',
+                    on_click=copy_prompt,
                     icon='content_copy'
-                ).props('color=secondary')
-            
-            ui.notify('✓ ChatGPT prompt generated! Copy and use with ChatGPT', type='positive', timeout=5000)
+                ).props(f'color={color}')
+                ui.button(
+                    'Download',
+                    on_click=lambda: ui.download(prompt_url(record.prompt_id, download=True)),
+                    icon='download'
+                ).props('flat')
         
-        def copy_prompt(prompt_type: str):
-            """Copy the prompt to clipboard."""
-            if not output_area.value:
+        async def copy_prompt():
+            """Copy the prompt to clipboard; the browser fetches it from the prompt route."""
+            record = current_prompt['record']
+            if record is None or prompt_store.get(record.prompt_id) is None:
                 ui.notify('No prompt to copy', type='warning')
                 return
             
-            ui.run_javascript(f'''
-                navigator.clipboard.writeText({repr(output_area.value)});
-            ''')
-            ui.notify(f'✓ {prompt_type} prompt copied to clipboard', type='positive')
+            # The fetch promise is handed to ClipboardItem so the copy still
+            # counts as part of the click where browsers require that
+            url = prompt_url(record.prompt_id)
+            try:
+                await ui.run_javascript(f'''
+                    const text = fetch("{url}").then(r => r.ok ? r.text() : Promise.reject(r.status));
+                    if (window.ClipboardItem) {{
+                        const blob = text.then(t => new Blob([t], {{type: "text/plain"}}));
+                        await navigator.clipboard.write([new ClipboardItem({{"text/plain": blob}})]);
+                    }} else {{
+                        await navigator.clipboard.writeText(await text);
+                    }}
+                ''', timeout=30.0)
+            except Exception as e:
+                ui.notify(f'Copy failed: {e}', type='negative')
+                return
+            ui.notify(f'✓ {record.kind} prompt copied to clipboard', type='positive')
+        
+        # Index deltas and pushed batches are followed per connection. NiceGUI
+        # keeps the client and page through a reconnect, so a reconnecting tab
+        # subscribes again and resyncs if the index changed while it was away;
+        # a deleted client is never reconnected.
+        def subscribe_changes():
+            """Start (or restart after a reconnect) the index listener and push subscription."""
+            if connection['unsubscribe'] is None:
+                connection['unsubscribe'] = live_index.subscribe(queue_delta)
+                if live_index.version != connection['version']:
+                    resync_file_tree()
+            previous = connection['subscription']
+            if state.change_hub is not None and (previous is None or previous.closed):
+                connection['subscription'] = state.change_hub.subscribe()
+                background_tasks.create(consume_changes(connection['subscription']))
+        
+        def unsubscribe_changes():
+            """Stop following changes for a disconnected tab."""
+            # Read the version first: a delta racing the unsubscribe is then either
+            # queued or counted as missed
+            connection['version'] = live_index.version
+            if connection['unsubscribe'] is not None:
+                connection['unsubscribe']()
+                connection['unsubscribe'] = None
+            if connection['subscription'] is not None:
+                connection['subscription'].close()
+        
+        tree_container.client.on_connect(subscribe_changes)
+        tree_container.client.on_disconnect(unsubscribe_changes)
+        subscribe_changes()
@@ -0,0 +1,113 @@
+"""Coalesce raw file system events into debounced change batches."""
+
+from typing import Callable, Dict, Optional, Tuple
+import threading
+import time
+from ..context.changes import ChangeBatch
+
+
+# Net event type for (previous, incoming); None means the two cancel out. A
+# path deleted and created again stays structural, since it may have changed
+# between file and directory or been replaced by a whole new tree
+_COALESCE: Dict[Tuple[str, str], Optional[str]] = {
+    ('created', 'created'): 'created',
+    ('created', 'modified'): 'created',
+    ('created', 'deleted'): None,
+    ('modified', 'created'): 'modified',
+    ('modified', 'modified'): 'modified',
+    ('modified', 'deleted'): 'deleted',
+    ('deleted', 'created'): 'created',
+    ('deleted', 'modified'): 'created',
+    ('deleted', 'deleted'): 'deleted',
+}
+
+
+class ChangeBatcher:
+    """Collapse per-path events and deliver them as one batch per window.
+
+    The first event of a quiet period opens a window of ``window`` seconds;
+    everything arriving before it closes is merged into a single batch. At
+    most ``max_pending`` distinct paths are buffered, beyond which the batch
+    turns into an overflow marker.
+    """
+
+    def __init__(
+        self,
+        on_batch: Callable[[ChangeBatch], None],
+        window: float = 0.3,
+        max_pending: int = 10000
+    ):
+        self.on_batch = on_batch
+        self.window = window
+        self.max_pending = max_pending
+        self._pending: Dict[str, str] = {}
+        self._overflow = False
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    def add(self, path: str, event_type: str):
+        """Record one event for a repo-relative path."""
+        with self._cond:
+            if self._overflow:
+                return
+            previous = self._pending.pop(path, None)
+            merged = event_type if previous is None else _COALESCE.get((previous, event_type), event_type)
+            if merged is not None:
+                self._pending[path] = merged
+            if len(self._pending) > self.max_pending:
+                self._pending.clear()
+                self._overflow = True
+            self._cond.notify()
+
+    def add_move(self, src: Optional[str], dest: Optional[str]):
+        """Record a rename as a deletion of ``src`` and a creation of ``dest``."""
+        if src is not None:
+            self.add(src, 'deleted')
+        if dest is not None:
+            self.add(dest, 'created')
+
+    def drain(self) -> Optional[ChangeBatch]:
+        """Take the pending changes as a batch, or None if nothing is pending."""
+        with self._cond:
+            if not self._pending and not self._overflow:
+                return None
+            batch = ChangeBatch(list(self._pending.items()), self._overflow)
+            self._pending = {}
+            self._overflow = False
+            return batch
+
+    def flush(self):
+        """Deliver pending changes immediately."""
+        batch = self.drain()
+        if batch is not None:
+            self.on_batch(batch)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and not self._pending and not self._overflow:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                # Let the window fill up; stop() cuts it short
+                deadline = time.monotonic() + self.window
+                remaining = self.window
+                while self._running and remaining > 0:
+                    self._cond.wait(remaining)
+                    remaining = deadline - time.monotonic()
+            self.flush()
+
+    def start(self):
+        """Start the background delivery thread."""
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='ctx-change-batcher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the delivery thread, dropping undelivered changes."""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join()
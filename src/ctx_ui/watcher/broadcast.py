@@ -0,0 +1,87 @@
+"""Asyncio pub/sub hub pushing watcher batches to connected UI clients."""
+
+from typing import Optional, Set
+import asyncio
+from .batcher import ChangeBatch
+
+
+class Subscription:
+    """One client's stream of change batches.
+
+    Iterate with ``async for``; iteration ends after ``close()``. A client
+    that falls more than ``maxsize`` batches behind gets a single overflow
+    batch instead, since it will re-read the index anyway.
+    """
+
+    _CLOSED = object()
+
+    def __init__(self, hub: 'ChangeHub', maxsize: int):
+        self._hub = hub
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.closed = False
+
+    def _put(self, batch: ChangeBatch):
+        if self.closed:
+            return
+        if self._queue.full():
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            batch = ChangeBatch([], overflow=True)
+        self._queue.put_nowait(batch)
+
+    def close(self):
+        """Unsubscribe and end iteration."""
+        if self.closed:
+            return
+        self.closed = True
+        self._hub._subscribers.discard(self)
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(self._CLOSED)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> ChangeBatch:
+        item = await self._queue.get()
+        if item is self._CLOSED:
+            raise StopAsyncIteration
+        return item
+
+
+class ChangeHub:
+    """Fan change batches out to every subscribed client.
+
+    ``publish`` may be called from any thread (the watcher's batcher thread);
+    delivery happens on the event loop the subscribers live on.
+    """
+
+    def __init__(self, queue_size: int = 32):
+        self.queue_size = queue_size
+        self._subscribers: Set[Subscription] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def subscribe(self) -> Subscription:
+        """Create a subscription; must be called on the event loop."""
+        self._loop = asyncio.get_running_loop()
+        subscription = Subscription(self, self.queue_size)
+        self._subscribers.add(subscription)
+        return subscription
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def _fan_out(self, batch: ChangeBatch):
+        for subscription in list(self._subscribers):
+            subscription._put(batch)
+
+    def publish(self, batch: ChangeBatch):
+        """Deliver a batch to all subscribers; safe to call from any thread."""
+        loop = self._loop
+        if loop is None or not self._subscribers:
+            return
+        try:
+            loop.call_soon_threadsafe(self._fan_out, batch)
+        except RuntimeError:
+            pass  # Event loop already closed during shutdown
@@ -3,69 +3,93 @@
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler, FileSystemEvent
 from pathlib import Path
-from typing import Callable, List
+from typing import Callable, Dict, List, Optional, Tuple
 import subprocess
 import time
-import hashlib
+from ..context.gitignore import GitIgnore
+from ..context.hashing import hash_file
+from .batcher import ChangeBatch, ChangeBatcher
+from ..context.matcher import compile_patterns
 
 
 class RepoWatcher(FileSystemEventHandler):
-    """Watch repository for file system changes."""
+    """Watch repository for file system changes.
+    
+    Raw events are coalesced per path by a ``ChangeBatcher`` and delivered to
+    ``on_batch`` as one ``ChangeBatch`` per debounce window.
+    """
     
     def __init__(
         self,
         repo_path: Path,
-        on_change: Callable[[Path, str], None],
-        exclude_patterns: List[str] = None
+        on_batch: Callable[[ChangeBatch], None],
+        exclude_patterns: List[str] = None,
+        gitignore: Optional[GitIgnore] = None,
+        debounce_seconds: float = 0.3,
+        max_pending: int = 10000
     ):
         self.repo_path = repo_path
-        self.on_change = on_change
+        self.on_batch = on_batch
         self.exclude_patterns = exclude_patterns or []
+        self._exclude_matcher = compile_patterns(self.exclude_patterns)
+        self.gitignore = gitignore
+        self.batcher = ChangeBatcher(on_batch, window=debounce_seconds, max_pending=max_pending)
         self.observer = None
     
     def should_ignore(self, path: str) -> bool:
         """Check if path should be ignored."""
-        import fnmatch
-        for pattern in self.exclude_patterns:
-            if fnmatch.fnmatch(path, pattern):
-                return True
-        return False
+        if self._exclude_matcher.match(path):
+            return True
+        return self.gitignore is not None and self.gitignore.is_ignored(path)
+    
+    def _relevant_path(self, src_path: str) -> Optional[str]:
+        """Return the repo-relative path of an event, or None if it is ignored."""
+        try:
+            rel = Path(src_path).relative_to(self.repo_path).as_posix()
+        except ValueError:
+            return None  # Outside the repository
+        if rel == '.' or self.should_ignore(rel):
+            return None
+        return rel
+    
+    def on_any_event(self, event: FileSystemEvent):
+        """Drop cached ignore rules when a .gitignore file changes."""
+        if self.gitignore is None:
+            return
+        for src in (event.src_path, getattr(event, 'dest_path', '')):
+            if src and Path(src).name == '.gitignore':
+                rel = self._relevant_path(str(Path(src).parent))
+                if rel is not None or Path(src).parent == self.repo_path:
+                    self.gitignore.invalidate(rel or '')
     
     def on_modified(self, event: FileSystemEvent):
         """Handle file modification events."""
         if event.is_directory:
             return
         
-        path = Path(event.src_path)
-        if self.should_ignore(str(path.relative_to(self.repo_path))):
-            return
-        
-        self.on_change(path, 'modified')
+        rel = self._relevant_path(event.src_path)
+        if rel is not None:
+            self.batcher.add(rel, 'modified')
     
     def on_created(self, event: FileSystemEvent):
-        """Handle file creation events."""
-        if event.is_directory:
-            return
-        
-        path = Path(event.src_path)
-        if self.should_ignore(str(path.relative_to(self.repo_path))):
-            return
-        
-        self.on_change(path, 'created')
+        """Handle file and directory creation events."""
+        rel = self._relevant_path(event.src_path)
+        if rel is not None:
+            self.batcher.add(rel, 'created')
     
     def on_deleted(self, event: FileSystemEvent):
-        """Handle file deletion events."""
-        if event.is_directory:
-            return
-        
-        path = Path(event.src_path)
-        if self.should_ignore(str(path.relative_to(self.repo_path))):
-            return
-        
-        self.on_change(path, 'deleted')
+        """Handle file and directory deletion events."""
+        rel = self._relevant_path(event.src_path)
+        if rel is not None:
+            self.batcher.add(rel, 'deleted')
+    
+    def on_moved(self, event: FileSystemEvent):
+        """Handle renames as a deletion of the source and a creation of the destination."""
+        self.batcher.add_move(self._relevant_path(event.src_path), self._relevant_path(event.dest_path))
     
     def start(self):
         """Start watching the repository."""
+        self.batcher.start()
         self.observer = Observer()
         self.observer.schedule(self, str(self.repo_path), recursive=True)
         self.observer.start()
@@ -75,6 +99,11 @@ class RepoWatcher(FileSystemEventHandler):
         if self.observer:
             self.observer.stop()
             self.observer.join()
+        self.batcher.stop()
+
+
+# Beyond this many paths the whole index is listed instead of passing pathspecs
+GIT_PATHSPEC_LIMIT = 1000
 
 
 class GitIntegration:
@@ -138,6 +167,37 @@ class GitIntegration:
         except Exception:
             return []
     
+    def get_index_entries(self, paths: Optional[List[str]] = None) -> Dict[str, Tuple[str, bool]]:
+        """Map tracked paths to their index blob id and whether the working tree differs.
+
+        One ``git ls-files`` call lists both; git checks the working tree
+        against its own stat cache, so clean files are not read. Unmerged
+        paths count as modified. Returns an empty dict outside a repository.
+        """
+        args = ['git', '--literal-pathspecs', 'ls-files', '-z', '--stage', '-t', '--cached', '--modified']
+        if paths is not None:
+            if not paths:
+                return {}
+            if len(paths) <= GIT_PATHSPEC_LIMIT:
+                args += ['--', *paths]
+        try:
+            result = subprocess.run(args, cwd=self.repo_path, capture_output=True, check=True)
+        except Exception:
+            return {}
+        
+        entries: Dict[str, Tuple[str, bool]] = {}
+        for record in result.stdout.split(b'\0'):
+            info, _, path = record.partition(b'\t')
+            fields = info.split()
+            if len(fields) != 4:
+                continue
+            tag, _, oid, stage = (f.decode() for f in fields)
+            path = path.decode('utf-8', errors='surrogateescape')
+            known = entries.get(path)
+            modified = tag == 'C' or stage != '0' or known is not None
+            entries[path] = (known[0] if known else oid, modified)
+        return entries
+    
     def get_file_history(self, file_path: str, limit: int = 10) -> List[dict]:
         """Get commit history for a specific file."""
         try:
@@ -169,7 +229,6 @@ class GitIntegration:
 def compute_file_hash(file_path: Path) -> str:
     """Compute SHA-256 hash of file contents."""
     try:
-        content = file_path.read_bytes()
-        return f"sha256:{hashlib.sha256(content).hexdigest()}"
+        return hash_file(file_path)
     except Exception:
         return "error"
@@ -0,0 +1,76 @@
+"""Tests for watcher event coalescing."""
+
+import threading
+import pytest
+from src.ctx_ui.watcher.batcher import ChangeBatch, ChangeBatcher
+
+
+def test_repeated_events_collapse_per_path():
+    """Test that a burst of events nets out to one change per path."""
+    batcher = ChangeBatcher(on_batch=lambda batch: None)
+    for _ in range(50):
+        batcher.add('src/app.py', 'modified')
+    batcher.add('tmp.swp', 'created')
+    batcher.add('tmp.swp', 'modified')
+    batcher.add('tmp.swp', 'deleted')
+    batcher.add('new.py', 'created')
+    batcher.add('new.py', 'modified')
+    batcher.add('old.py', 'modified')
+    batcher.add('old.py', 'deleted')
+
+    assert batcher.drain() == ChangeBatch([
+        ('src/app.py', 'modified'),
+        ('new.py', 'created'),
+        ('old.py', 'deleted'),
+    ])
+    assert batcher.drain() is None
+
+
+def test_moves_and_replacements():
+    """Test that renames split into delete+create and replaced paths stay creations."""
+    batcher = ChangeBatcher(on_batch=lambda batch: None)
+    batcher.add_move('a.py', 'b.py')
+    batcher.add('config.json', 'deleted')
+    batcher.add('config.json', 'created')
+    batcher.add_move(None, 'moved_in.py')
+
+    assert batcher.drain().changes == [
+        ('a.py', 'deleted'),
+        ('b.py', 'created'),
+        ('config.json', 'created'),
+        ('moved_in.py', 'created'),
+    ]
+
+
+def test_overflow_switches_to_rescan():
+    """Test that exceeding the bound drops individual changes."""
+    batcher = ChangeBatcher(on_batch=lambda batch: None, max_pending=10)
+    for i in range(1000):
+        batcher.add(f'file{i}.py', 'created')
+
+    batch = batcher.drain()
+    assert batch.overflow
+    assert batch.changes == []
+    assert batcher._pending == {}
+
+
+def test_background_thread_delivers_one_batch_per_window():
+    """Test that a burst inside one window is delivered as a single batch."""
+    batches = []
+    delivered = threading.Event()
+
+    def on_batch(batch):
+        batches.append(batch)
+        delivered.set()
+
+    batcher = ChangeBatcher(on_batch, window=0.2)
+    batcher.start()
+    try:
+        for i in range(100):
+            batcher.add(f'file{i % 10}.py', 'modified')
+        assert delivered.wait(5)
+    finally:
+        batcher.stop()
+
+    assert len(batches) == 1
+    assert len(batches[0].changes) == 10
@@ -0,0 +1,84 @@
+"""Tests for content-sniffing binary detection."""
+
+import codecs
+import os
+import random
+import pytest
+from src.ctx_ui.context.binary import BinaryDetector, is_binary_data
+from src.ctx_ui.context.file_index import FileIndex
+from src.ctx_ui.context.indexer import list_repo_files
+from src.ctx_ui.context.live_index import LiveIndex
+from src.ctx_ui.prompts.generators import generate_chatgpt_prompt_text
+
+
+@pytest.mark.parametrize('data, expected', [
+    (b'', False),
+    (b'def f():\n\treturn 1\n', False),
+    ('café naïve\n'.encode('latin-1'), False),
+    ('über ' * 100 + '€', False),
+    (codecs.BOM_UTF16_LE + 'text'.encode('utf-16-le'), False),
+    (b'\x1b[31mred\x1b[0m\n', False),
+    (b'\x89PNG\r\n\x1a\n\0\0\0\rIHDR', True),
+    (b'abc\0def', True),
+    (bytes([1, 2, 3, 4, 5, 6]) * 10 + b'text', True),
+])
+def test_is_binary_data(data, expected):
+    """Test the verdicts on typical text and binary prefixes."""
+    if isinstance(data, str):
+        data = data.encode()[:-1]  # Multi-byte character cut off by the prefix
+    assert is_binary_data(data) is expected
+
+
+def test_random_bytes_are_binary():
+    """Test that compressed-looking data without NUL bytes is binary."""
+    data = bytes(b for b in random.Random(0).randbytes(8192) if b)
+    assert is_binary_data(data)
+
+
+def test_verdicts_are_cached_until_the_file_changes(tmp_path, monkeypatch):
+    """Test that files are only reopened after their mtime or size changes."""
+    path = tmp_path / 'blob'
+    path.write_bytes(b'\0\1\2')
+    detector = BinaryDetector()
+    opened = []
+    real_open = open
+    monkeypatch.setattr('builtins.open', lambda *a, **k: opened.append(a[0]) or real_open(*a, **k))
+
+    assert detector.is_binary(path)
+    assert detector.is_binary(path)
+    assert len(opened) == 1
+
+    path.write_text('plain text now')
+    os.utime(path, ns=(1, 1))
+    assert not detector.is_binary(path)
+    assert len(opened) == 2
+
+
+def test_indexers_skip_binary_files_without_a_suffix(tmp_path):
+    """Test that the full scan, the live index and list_repo_files drop binary content."""
+    (tmp_path / 'tool').write_bytes(b'\x7fELF\2\1\1\0')
+    (tmp_path / 'Makefile').write_text('all:\n\techo hi\n')
+    (tmp_path / 'main.py').write_text('x')
+    detector = BinaryDetector()
+
+    live = LiveIndex(FileIndex(tmp_path, ['*'], [], binary_detector=detector))
+    live.rescan()
+    listed = list_repo_files(tmp_path, ['*'], [], binary_detector=detector)
+
+    expected = ['Makefile', 'main.py']
+    assert sorted(p.as_posix() for p in live.files()) == expected
+    assert sorted(p.as_posix() for p in listed) == expected
+
+    (tmp_path / 'core').write_bytes(b'\0' * 16)
+    live.apply('created', 'core')
+    assert sorted(p.as_posix() for p in live.files()) == expected
+
+
+def test_chatgpt_prompt_skips_binary_files(tmp_path):
+    """Test that a binary file with a text-like name is listed but not embedded."""
+    (tmp_path / 'data.txt').write_bytes(b'header\0\xff\xfe' * 100)
+
+    prompt = generate_chatgpt_prompt_text('q', {'data.txt'}, tmp_path, binary_detector=BinaryDetector())
+
+    assert '`data.txt` — _Skipped embedding (binary/noisy asset)_' in prompt
+    assert 'header' not in prompt
@@ -0,0 +1,71 @@
+"""Tests for the content-addressed blob store and context pack snapshots."""
+
+import pytest
+from src.ctx_ui.models.context_pack import ContextPack
+from src.ctx_ui.storage.blobs import BlobStore, blob_hash
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BlobStore(tmp_path / 'blobs')
+
+
+def test_blobs_round_trip_and_deduplicate(store):
+    """Test that equal content is stored once, compressed, under its sha256 key."""
+    data = b'print("hello")\n' * 1000
+
+    key = store.put(data)
+
+    assert key == blob_hash(data) and key.startswith('sha256:')
+    assert store.put(data) == key and key in store
+    assert store.get(key) == data
+    count, size = store.usage()
+    assert count == 1 and size < len(data) // 10
+    with pytest.raises(KeyError):
+        store.get(blob_hash(b'missing'))
+
+
+def test_corrupt_blobs_are_detected(store):
+    """Test that a damaged object raises instead of returning wrong content."""
+    key = store.put(b'content')
+    store._object_path(key).write_bytes(b'garbage')
+
+    with pytest.raises(ValueError):
+        store.get(key)
+
+
+def test_packs_rehydrate_after_files_change(store, tmp_path):
+    """Test that a saved pack replays the content it was built from."""
+    repo = tmp_path / 'repo'
+    repo.mkdir()
+    (repo / 'a.py').write_text('one\ntwo\nthree\n')
+    pack = ContextPack.build_from_paths(repo, ['a.py'], blob_store=store)
+    pack.snippets[0].start, pack.snippets[0].end = 2, 3
+    pack.save(tmp_path / 'packs' / 'p.json', blob_store=store)
+    assert pack.snippets[0].hash == ContextPack.build_from_paths(repo, ['a.py']).snippets[0].hash
+
+    (repo / 'a.py').write_text('changed\n')
+    loaded = ContextPack.load(tmp_path / 'packs' / 'p.json')
+
+    assert loaded.rehydrate(store) == {'a.py': 'one\ntwo\nthree\n'}
+    assert ContextPack.snippet_text(loaded.snippets[0], store) == 'two\nthree\n'
+
+
+def test_overlapping_packs_share_blobs_and_gc_frees_released_ones(store, tmp_path):
+    """Test that N packs cost their distinct content and gc keeps referenced blobs."""
+    repo = tmp_path / 'repo'
+    repo.mkdir()
+    for i in range(10):
+        (repo / f'f{i}.py').write_text(f'# file {i}\n' + 'x = 1\n' * 500)
+    packs = tmp_path / 'packs'
+    for n in range(5):
+        ContextPack.build_from_paths(repo, [f'f{i}.py' for i in range(n, n + 6)], blob_store=store).save(packs / f'{n}.json', blob_store=store)
+
+    assert store.usage()[0] == 10
+    assert store.refcount(blob_hash((repo / 'f5.py').read_bytes())) == 5
+
+    for n in range(4):
+        ContextPack.delete(packs / f'{n}.json', blob_store=store)
+    assert store.gc(min_age=0) == 4
+    assert store.usage()[0] == 6
+    assert set(ContextPack.load(packs / '4.json').rehydrate(store)) == {f'f{i}.py' for i in range(4, 10)}
@@ -0,0 +1,70 @@
+"""Tests for the change broadcast hub."""
+
+import asyncio
+import threading
+import pytest
+from src.ctx_ui.watcher.batcher import ChangeBatch
+from src.ctx_ui.watcher.broadcast import ChangeHub
+
+
+def test_batches_reach_every_client_and_task_count_is_constant():
+    """Test push delivery from a foreign thread with one task per client."""
+
+    async def scenario():
+        hub = ChangeHub()
+        received = {i: [] for i in range(3)}
+
+        async def client(i, subscription):
+            async for batch in subscription:
+                received[i].append(batch)
+
+        subscriptions = [hub.subscribe() for _ in range(3)]
+        tasks = [asyncio.create_task(client(i, s)) for i, s in enumerate(subscriptions)]
+        await asyncio.sleep(0)
+        baseline = len(asyncio.all_tasks())
+
+        counts = []
+        for round_no in range(5):
+            publisher = threading.Thread(
+                target=lambda: [hub.publish(ChangeBatch([(f'f{round_no}_{n}.py', 'modified')])) for n in range(4)]
+            )
+            publisher.start()
+            publisher.join()
+            await asyncio.sleep(0.01)
+            counts.append(len(asyncio.all_tasks()))
+
+        assert counts == [baseline] * 5
+        assert all(len(batches) == 20 for batches in received.values())
+
+        # Disconnecting a client ends its task and stops delivery to it
+        subscriptions[0].close()
+        await asyncio.wait_for(tasks[0], 1)
+        hub.publish(ChangeBatch([('late.py', 'created')]))
+        await asyncio.sleep(0.01)
+        assert hub.subscriber_count == 2
+        assert len(received[0]) == 20
+        assert len(received[1]) == 21
+
+        for s in subscriptions[1:]:
+            s.close()
+        await asyncio.gather(*tasks)
+        assert len(asyncio.all_tasks()) == baseline - 3
+
+    asyncio.run(scenario())
+
+
+def test_slow_client_gets_overflow_instead_of_unbounded_queue():
+    """Test that a client that stops reading is capped at one overflow batch."""
+
+    async def scenario():
+        hub = ChangeHub(queue_size=4)
+        subscription = hub.subscribe()
+        for i in range(100):
+            hub._fan_out(ChangeBatch([(f'f{i}.py', 'modified')]))
+        assert subscription._queue.qsize() <= 4
+        pending = [subscription._queue.get_nowait() for _ in range(subscription._queue.qsize())]
+        return pending
+
+    pending = asyncio.run(scenario())
+    assert any(batch.overflow for batch in pending)
+    assert pending[-1].changes == [('f99.py', 'modified')]
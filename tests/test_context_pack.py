@@ -1,8 +1,11 @@
 """Tests for context pack functionality."""
 
+import os
 import pytest
+import subprocess
 from pathlib import Path
-from src.ctx_ui.models.context_pack import ContextPack, Snippet
+from src.ctx_ui.context.hashing import FileHasher, hash_file
+from src.ctx_ui.models.context_pack import FRESH, MISSING, STALE, ContextPack, Snippet
 
 
 def test_snippet_creation():
@@ -46,3 +49,64 @@ def test_context_pack_save_load(tmp_path):
     assert loaded_pack.task_id == 'test-task'
     assert len(loaded_pack.snippets) == 1
     assert loaded_pack.snippets[0].path == 'test.py'
+
+
+def _write(path, text, mtime=1_000_000_000):
+    path.write_text(text)
+    os.utime(path, (mtime, mtime))
+
+
+class CountingHasher(FileHasher):
+    def __init__(self):
+        super().__init__()
+        self.hashed = []
+
+    def hash_many(self, paths, hash_fn=hash_file):
+        self.hashed.extend(Path(p).name for p in paths)
+        return super().hash_many(paths, hash_fn)
+
+
+def test_verify_hashes_only_files_whose_stat_changed(tmp_path):
+    """Test fresh, stale and missing snippets, with unchanged and resized files not read."""
+    for name in ['same.py', 'grown.py', 'edited.py', 'touched.py', 'gone.py']:
+        _write(tmp_path / name, 'x = 1\n')
+    pack = ContextPack.build_from_paths(tmp_path, ['same.py', 'grown.py', 'edited.py', 'touched.py', 'gone.py'])
+    _write(tmp_path / 'grown.py', 'x = 1\ny = 2\n')
+    _write(tmp_path / 'edited.py', 'x = 2\n', mtime=1_000_000_001)
+    _write(tmp_path / 'touched.py', 'x = 1\n', mtime=1_000_000_001)
+    (tmp_path / 'gone.py').unlink()
+    hasher = CountingHasher()
+
+    statuses = pack.verify(tmp_path, hasher=hasher)
+
+    assert [(s.snippet.path, s.status) for s in statuses] == [
+        ('same.py', FRESH), ('grown.py', STALE), ('edited.py', STALE), ('touched.py', FRESH), ('gone.py', MISSING),
+    ]
+    assert sorted(hasher.hashed) == ['edited.py', 'touched.py']
+    assert [s.snippet.path for s in pack.diff(tmp_path, hasher=hasher)] == ['grown.py', 'edited.py', 'gone.py']
+
+
+def test_verify_against_git_blob_ids(tmp_path):
+    """Test that clean tracked files are settled by one git call without hashing."""
+    def git(*args):
+        subprocess.run(['git', *args], cwd=tmp_path, check=True, capture_output=True)
+
+    git('init', '-q')
+    for name in ['a.py', 'b.py', 'c.py']:
+        _write(tmp_path / name, f'# {name}\n')
+    git('add', '.')
+    git('-c', 'user.name=t', '-c', 'user.email=t@t', 'commit', '-q', '-m', 'init')
+    pack = ContextPack.build_from_paths(tmp_path, ['a.py', 'b.py', 'c.py'], use_git=True)
+    assert all(s.blob for s in pack.snippets)
+
+    # A fresh checkout elsewhere has other mtimes; b.py is changed and committed
+    for name in ['a.py', 'c.py']:
+        os.utime(tmp_path / name, (1_000_000_005, 1_000_000_005))
+    _write(tmp_path / 'b.py', '# B.py\n', mtime=1_000_000_005)
+    git('add', 'b.py')
+    hasher = CountingHasher()
+
+    [statuses, again] = ContextPack.verify_many([pack, pack], tmp_path, hasher=hasher, use_git=True)
+
+    assert [s.status for s in statuses] == [FRESH, STALE, FRESH]
+    assert again == statuses and hasher.hashed == []
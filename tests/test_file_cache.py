@@ -0,0 +1,79 @@
+"""Tests for the rendered file block cache."""
+
+import os
+import time
+import pytest
+from src.ctx_ui.prompts.file_cache import RenderedFileCache
+from src.ctx_ui.prompts.generators import generate_chatgpt_prompt_text
+from src.ctx_ui.watcher.batcher import ChangeBatch
+
+
+def write_old(path, text):
+    """Write a file with an mtime outside the racy window."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    old = time.time() - 60
+    os.utime(path, (old, old))
+
+
+@pytest.fixture
+def repo(tmp_path):
+    write_old(tmp_path / 'a.py', 'API_KEY = "x"\nprint(1)\n')
+    write_old(tmp_path / 'pkg' / 'b.py', '\n'.join(str(i) for i in range(1000)))
+    return tmp_path
+
+
+def test_cached_prompt_matches_uncached(repo):
+    """Test that cached blocks produce the same prompt and are reused."""
+    cache = RenderedFileCache()
+    selected = {'a.py', 'pkg/b.py'}
+
+    expected = generate_chatgpt_prompt_text('q', selected, repo)
+    assert generate_chatgpt_prompt_text('q', selected, repo, file_cache=cache) == expected
+    assert generate_chatgpt_prompt_text('other', selected, repo, file_cache=cache) == expected.replace('q\n', 'other\n', 1)
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+def test_edited_file_misses(repo):
+    """Test that a changed size or mtime is never served from the cache."""
+    cache = RenderedFileCache()
+    generate_chatgpt_prompt_text('q', {'a.py'}, repo, file_cache=cache)
+
+    write_old(repo / 'a.py', 'print(2)\n')
+
+    assert 'print(2)' in generate_chatgpt_prompt_text('q', {'a.py'}, repo, file_cache=cache)
+    assert cache.misses == 2
+
+
+def test_recent_files_are_not_cached(tmp_path):
+    """Test that files inside the racy mtime window are rendered every time."""
+    (tmp_path / 'new.py').write_text('x')
+    cache = RenderedFileCache()
+
+    generate_chatgpt_prompt_text('q', {'new.py'}, tmp_path, file_cache=cache)
+
+    assert len(cache) == 0
+
+
+def test_eviction_by_total_size(repo):
+    """Test that least recently used blocks are evicted over the size limit."""
+    cache = RenderedFileCache()
+    generate_chatgpt_prompt_text('q', {'a.py'}, repo, file_cache=cache)
+    cache.max_bytes = cache.total_bytes + 10
+
+    generate_chatgpt_prompt_text('q', {'pkg/b.py'}, repo, file_cache=cache)
+
+    assert len(cache) == 1
+    assert cache.total_bytes <= cache.max_bytes
+
+
+def test_watcher_batches_invalidate(repo):
+    """Test that changed paths, directories and overflows drop entries."""
+    cache = RenderedFileCache()
+    generate_chatgpt_prompt_text('q', {'a.py', 'pkg/b.py'}, repo, file_cache=cache)
+
+    cache.invalidate_batch(ChangeBatch([('pkg', 'deleted')]))
+    assert len(cache) == 1
+
+    cache.invalidate_batch(ChangeBatch([], overflow=True))
+    assert len(cache) == 0 and cache.total_bytes == 0
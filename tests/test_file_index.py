@@ -0,0 +1,78 @@
+"""Tests for the persistent incremental file index."""
+
+import os
+import pytest
+from pathlib import Path
+from src.ctx_ui.context.file_index import FileIndex
+from src.ctx_ui.context.indexer import list_repo_files
+from src.ctx_ui.storage.store import MetadataStore
+
+INCLUDE = ['*.py', '*.md']
+EXCLUDE = ['node_modules/**']
+
+
+def _age_dirs(*dirs: Path, seconds: int = 60):
+    """Move directory mtimes into the past so they are not treated as racy."""
+    for d in dirs:
+        past = os.stat(d).st_mtime - seconds
+        os.utime(d, (past, past))
+
+
+@pytest.fixture
+def repo(tmp_path):
+    root = tmp_path / 'repo'
+    for rel in ['main.py', 'src/app.py', 'src/util/helpers.py', 'docs/guide.md', 'node_modules/x/index.py']:
+        (root / rel).parent.mkdir(parents=True, exist_ok=True)
+        (root / rel).write_text('x')
+    _age_dirs(*(Path(dirpath) for dirpath, _, _ in os.walk(root)))
+    return root
+
+
+@pytest.fixture
+def scandir_calls(monkeypatch):
+    calls = []
+    real_scandir = os.scandir
+
+    def recording_scandir(path):
+        calls.append(Path(path))
+        return real_scandir(path)
+
+    monkeypatch.setattr(os, 'scandir', recording_scandir)
+    return calls
+
+
+def test_matches_list_repo_files(repo, tmp_path):
+    """Test that the index returns the same paths as a full walk."""
+    index = FileIndex(repo, INCLUDE, EXCLUDE, MetadataStore(tmp_path / 'index.db'))
+    assert index.scan() == list_repo_files(repo, INCLUDE, EXCLUDE)
+
+
+def test_restart_on_unchanged_tree_reads_no_directories(repo, tmp_path, scandir_calls):
+    """Test that a fresh index reuses the persisted snapshot."""
+    db = tmp_path / 'index.db'
+    expected = FileIndex(repo, INCLUDE, EXCLUDE, MetadataStore(db)).scan()
+    scandir_calls.clear()
+
+    restarted = FileIndex(repo, INCLUDE, EXCLUDE, MetadataStore(db))
+    assert restarted.scan() == expected
+    assert scandir_calls == []
+
+
+def test_rescan_reads_only_changed_directories(repo, tmp_path, scandir_calls):
+    """Test that additions and deletions re-read only their directory."""
+    store = MetadataStore(tmp_path / 'index.db')
+    index = FileIndex(repo, INCLUDE, EXCLUDE, store)
+    index.scan()
+    store.index_file('docs/guide.md', 'sha256:guide', 1)
+
+    (repo / 'src' / 'util' / 'new.py').write_text('x')
+    (repo / 'docs' / 'guide.md').unlink()
+    _age_dirs(repo / 'src' / 'util', repo / 'docs')
+    scandir_calls.clear()
+
+    files = FileIndex(repo, INCLUDE, EXCLUDE, store).scan()
+
+    assert Path('src/util/new.py') in files
+    assert Path('docs/guide.md') not in files
+    assert sorted(scandir_calls) == sorted([repo / 'docs', repo / 'src' / 'util'])
+    assert store.get_file('docs/guide.md') is None
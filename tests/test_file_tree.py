@@ -0,0 +1,74 @@
+"""Tests for the file tree model and its diffs."""
+
+from pathlib import Path
+from src.ctx_ui.ui.file_tree import apply_tree_delta, build_file_tree, diff_file_trees, tree_node_at
+
+
+def tree(*paths):
+    return build_file_tree([Path(p) for p in paths])
+
+
+def test_tree_node_at():
+    """Test looking up directory nodes by path."""
+    t = tree('a.py', 'src/app.py', 'src/util/helpers.py')
+
+    assert tree_node_at(t, '') is t
+    assert tree_node_at(t, 'src/util')['_files'] == [Path('src/util/helpers.py')]
+    assert tree_node_at(t, 'src/missing') is None
+
+
+def test_diff_reports_file_changes():
+    """Test that added and removed files are reported with posix paths."""
+    old = tree('a.py', 'src/app.py', 'src/old.py')
+    new = tree('a.py', 'src/app.py', 'src/new.py')
+
+    assert diff_file_trees(old, new) == [
+        ('remove_file', 'src/old.py'),
+        ('add_file', 'src/new.py'),
+    ]
+
+
+def test_diff_reports_directories_once():
+    """Test that whole added or removed directories are not expanded."""
+    old = tree('a.py', 'gone/x.py', 'gone/deep/y.py')
+    new = tree('a.py', 'fresh/x.py', 'fresh/deep/y.py')
+
+    assert diff_file_trees(old, new) == [
+        ('remove_dir', 'gone'),
+        ('add_dir', 'fresh'),
+    ]
+
+
+def test_diff_of_equal_trees_is_empty():
+    """Test that rebuilding an unchanged tree yields no changes."""
+    paths = ('a.py', 'src/app.py', 'src/util/helpers.py')
+
+    assert diff_file_trees(tree(*paths), tree(*paths)) == []
+
+
+def test_delta_updates_tree_in_place():
+    """Test that applying an index delta yields the tree a full rebuild would."""
+    t = tree('a.py', 'src/app.py', 'src/old.py', 'gone/deep/y.py', 'keep/x.py', 'keep/sub/z.py')
+    added = [Path('fresh/deep/y.py'), Path('fresh/x.py'), Path('src/new.py')]
+    removed = [Path('gone/deep/y.py'), Path('keep/sub/z.py'), Path('src/old.py')]
+
+    changes = apply_tree_delta(t, added, removed)
+
+    assert t == tree('a.py', 'fresh/deep/y.py', 'fresh/x.py', 'keep/x.py', 'src/app.py', 'src/new.py')
+    assert changes == [
+        ('remove_dir', 'gone'),
+        ('remove_dir', 'keep/sub'),
+        ('remove_file', 'src/old.py'),
+        ('add_dir', 'fresh'),
+        ('add_file', 'src/new.py'),
+    ]
+
+
+def test_delta_keeps_files_sorted_and_ignores_known_paths():
+    """Test sorted insertion and that repeated or unknown paths are no-ops."""
+    t = tree('src/a.py', 'src/c.py')
+
+    assert apply_tree_delta(t, [Path('src/b.py'), Path('src/a.py')], [Path('src/missing.py'), Path('nope/x.py')]) == [
+        ('add_file', 'src/b.py'),
+    ]
+    assert t['src']['_files'] == [Path('src/a.py'), Path('src/b.py'), Path('src/c.py')]
@@ -0,0 +1,109 @@
+"""Tests for prompt generation."""
+
+import io
+import pytest
+from src.ctx_ui.prompts import generators
+from src.ctx_ui.prompts.budget import allocate_budget
+from src.ctx_ui.prompts.generators import (
+    generate_chatgpt_prompt_text,
+    generate_copilot_prompt_text,
+    iter_chatgpt_prompt,
+    iter_copilot_prompt,
+    write_prompt,
+)
+from src.ctx_ui.prompts.tokens import estimate_tokens
+
+
+@pytest.fixture
+def repo(tmp_path):
+    (tmp_path / 'a.py').write_text('API_KEY = "x"\nprint(1)\n')
+    (tmp_path / 'pkg').mkdir()
+    (tmp_path / 'pkg' / 'b.py').write_text('\n'.join(str(i) for i in range(1000)))
+    return tmp_path
+
+
+def test_concurrent_rendering_is_identical(repo):
+    """Test that the thread pool keeps order, output and per-file errors unchanged."""
+    (repo / 'broken.py').mkdir()
+    selected = {'a.py', 'pkg/b.py', 'broken.py', 'missing.py', 'logo.png'}
+
+    serial = generate_chatgpt_prompt_text('q', selected, repo)
+
+    assert generate_chatgpt_prompt_text('q', selected, repo, workers=4) == serial
+    assert '_Error reading file:' in serial
+
+
+@pytest.mark.parametrize('workers', [0, 4])
+def test_streamed_prompts_match_strings(repo, workers):
+    """Test that chunks written to a sink join to the string prompts."""
+    selected = {'a.py', 'pkg/b.py', 'missing.py'}
+    chatgpt, copilot = io.StringIO(), io.StringIO()
+
+    written = write_prompt(chatgpt, iter_chatgpt_prompt('q', selected, repo, workers=workers))
+    write_prompt(copilot, iter_copilot_prompt('q', selected))
+
+    assert chatgpt.getvalue() == generate_chatgpt_prompt_text('q', selected, repo)
+    assert written == len(chatgpt.getvalue())
+    assert copilot.getvalue() == generate_copilot_prompt_text('q', selected)
+
+
+def test_streaming_reads_files_just_ahead_of_the_consumer(tmp_path, monkeypatch):
+    """Test that the thread pool only renders a bounded window of files ahead."""
+    for i in range(40):
+        (tmp_path / f'f{i:02}.py').write_text(f'x = {i}\n')
+    rendered = []
+    render = generators._render_file_block
+    monkeypatch.setattr(generators, '_render_file_block', lambda fp, full: rendered.append(fp) or render(fp, full))
+
+    chunks = iter_chatgpt_prompt('q', {f'f{i:02}.py' for i in range(40)}, tmp_path, workers=2)
+    first_file = next(chunk for chunk in chunks if 'f00.py' in chunk)
+    chunks.close()
+
+    assert '```py\nx = 0\n' in first_file
+    assert len(rendered) <= 5
+
+
+def test_token_budget_spreads_cuts_over_large_files(repo):
+    """Test that small files stay whole and the prompt stays near the budget."""
+    (repo / 'big.py').write_text(''.join(f'def func_{i}(value):\n    return value * {i}\n' for i in range(2000)))
+    report = []
+
+    prompt = generate_chatgpt_prompt_text(
+        'q', {'a.py', 'pkg/b.py', 'big.py'}, repo, token_budget=3000, budget_report=report
+    )
+
+    assert estimate_tokens(prompt) <= 3000
+    assert [cut.file_path for cut in report] == ['big.py', 'pkg/b.py']
+    assert all(0 < cut.kept_lines < cut.line_count for cut in report)
+    assert '[REDACTED]' in prompt and 'print(1)' in prompt
+    assert '- `big.py`: kept' in prompt
+
+
+def test_token_budget_follows_priorities(repo):
+    """Test that a higher priority buys a file more of the budget."""
+    (repo / 'c.py').write_text('\n'.join(str(i) for i in range(1000)))
+    report = []
+
+    generate_chatgpt_prompt_text(
+        'q', {'pkg/b.py', 'c.py'}, repo, token_budget=2000,
+        priorities={'c.py': 3.0}, budget_report=report
+    )
+
+    kept = {cut.file_path: cut.kept_tokens for cut in report}
+    assert kept['c.py'] > 2 * kept['pkg/b.py']
+
+
+def test_allocate_budget_keeps_small_files_whole():
+    """Test that budget left over by small files goes to the large ones."""
+    allocation = allocate_budget({'small': 10, 'mid': 300, 'large': 5000}, 1000)
+
+    assert allocation == {'small': 10, 'mid': 300, 'large': 690}
+
+
+def test_estimate_tokens_is_additive_enough():
+    """Test that per-line estimates sum to roughly the whole-text estimate."""
+    text = ''.join(f'    result_{i} = compute(value, {i * 37})\n' for i in range(200))
+    per_line = sum(estimate_tokens(line + '\n') for line in text.split('\n')[:-1])
+
+    assert estimate_tokens('') == 0
+    assert abs(per_line - estimate_tokens(text)) <= 0.05 * estimate_tokens(text)
@@ -0,0 +1,86 @@
+"""Tests for the gitignore engine."""
+
+import os
+import shutil
+import subprocess
+import pytest
+from src.ctx_ui.context.gitignore import GitIgnore, git_ls_files
+from src.ctx_ui.context.indexer import list_repo_files
+
+
+@pytest.fixture
+def repo(tmp_path):
+    files = {
+        '.gitignore': '# build output\n*.log\n/dist\ngenerated/\n!keep.log\n',
+        'app.py': 'x',
+        'debug.log': 'x',
+        'keep.log': 'x',
+        'dist/bundle.js': 'x',
+        'src/dist/module.py': 'x',
+        'src/generated/out.py': 'x',
+        'src/.gitignore': 'local_*.py\n!local_ok.py\n',
+        'src/local_tmp.py': 'x',
+        'src/local_ok.py': 'x',
+        'src/main.py': 'x',
+        'src/trace.log': 'x',
+    }
+    for rel, content in files.items():
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text(content)
+    return tmp_path
+
+
+def test_nested_negated_and_anchored_rules(repo):
+    """Test git's precedence rules across nested ignore files."""
+    gitignore = GitIgnore(repo)
+    assert gitignore.is_ignored('debug.log')
+    assert not gitignore.is_ignored('keep.log')
+    assert gitignore.is_ignored('dist/bundle.js')
+    assert not gitignore.is_ignored('src/dist/module.py')
+    assert gitignore.is_ignored('src/generated/out.py')
+    assert gitignore.is_ignored('src/local_tmp.py')
+    assert not gitignore.is_ignored('src/local_ok.py')
+    assert gitignore.is_ignored('src/trace.log')
+    assert not gitignore.is_ignored('src/main.py')
+
+
+def test_list_repo_files_respects_gitignore(repo):
+    """Test that the walker skips ignored files and never enters ignored dirs."""
+    files = list_repo_files(repo, include=[], exclude=[], gitignore=GitIgnore(repo))
+    assert [str(f) for f in files] == [
+        '.gitignore', 'app.py', 'keep.log', 'src/.gitignore', 'src/dist/module.py', 'src/local_ok.py', 'src/main.py'
+    ]
+
+
+def test_rules_are_cached_until_the_file_changes(repo):
+    """Test that ignore files are compiled once and reloaded on mtime change."""
+    gitignore = GitIgnore(repo)
+    assert gitignore.is_ignored('app.py') is False
+    first = gitignore._rules('')
+    assert gitignore._rules('') is first
+    assert gitignore.refresh() is False
+
+    (repo / '.gitignore').write_text('app.py\n')
+    st = os.stat(repo / '.gitignore')
+    os.utime(repo / '.gitignore', ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert gitignore.refresh() is True
+    assert gitignore.is_ignored('app.py')
+
+
+@pytest.mark.skipif(shutil.which('git') is None, reason='git not installed')
+def test_git_ls_files_matches_rule_engine(repo):
+    """Test that the git fast path agrees with the rule engine."""
+    subprocess.run(['git', 'init', '-q'], cwd=repo, check=True)
+    subprocess.run(['git', 'add', 'app.py'], cwd=repo, check=True)
+    subprocess.run(['git', '-c', 'user.name=t', '-c', 'user.email=t@t', 'commit', '-qm', 'init'], cwd=repo, check=True)
+
+    walked = list_repo_files(repo, include=[], exclude=['.git/**'], gitignore=GitIgnore(repo))
+    assert list_repo_files(repo, include=[], exclude=[], use_git=True) == walked
+
+    (repo / 'app.py').unlink()
+    assert 'app.py' not in git_ls_files(repo)
+
+
+def test_git_ls_files_outside_repo(tmp_path):
+    """Test that a non-repository directory falls back to None."""
+    assert git_ls_files(tmp_path) is None
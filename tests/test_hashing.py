@@ -0,0 +1,67 @@
+"""Tests for streaming, stat-cached file hashing."""
+
+import hashlib
+import os
+from src.ctx_ui.context.hashing import FileHasher, hash_file
+from src.ctx_ui.models.context_pack import ContextPack
+from src.ctx_ui.watcher.repo_watcher import compute_file_hash
+
+PAST = 1_000_000_000
+
+
+def write(path, data: bytes, mtime: int = PAST):
+    path.write_bytes(data)
+    os.utime(path, ns=(mtime * 10**9, mtime * 10**9))
+
+
+def test_hash_file_streams_raw_bytes(tmp_path):
+    """Test chunked hashing of raw bytes, CRLF and invalid UTF-8 included."""
+    data = b'line\r\n\xff\xfe' * 1000
+    write(tmp_path / 'a.txt', data)
+
+    expected = 'sha256:' + hashlib.sha256(data).hexdigest()
+    assert hash_file(tmp_path / 'a.txt', chunk_size=7) == expected
+    assert compute_file_hash(tmp_path / 'a.txt') == expected
+
+
+def test_known_hashes_are_reused_until_the_file_changes(tmp_path):
+    """Test that unchanged files are not read again, and changed or racy ones are."""
+    write(tmp_path / 'a.py', b'one')
+    write(tmp_path / 'b.py', b'two')
+    (tmp_path / 'fresh.py').write_bytes(b'new')
+    reads = []
+    hasher = FileHasher(workers=4)
+
+    def counting(path):
+        reads.append(os.path.basename(path))
+        return hash_file(path)
+
+    paths = [tmp_path / 'a.py', tmp_path / 'missing.py', tmp_path / 'b.py', tmp_path / 'fresh.py']
+    first = hasher.hash_many(paths, counting)
+    assert first[1] is None and first[0] == hash_file(tmp_path / 'a.py')
+    assert sorted(reads) == ['a.py', 'b.py', 'fresh.py']
+
+    reads.clear()
+    write(tmp_path / 'b.py', b'changed', mtime=PAST + 1)
+    second = hasher.hash_many(paths, counting)
+    assert sorted(reads) == ['b.py', 'fresh.py']
+    assert second[2] == hash_file(tmp_path / 'b.py') and second[0] == first[0]
+
+
+def test_pack_hashes_match_the_watcher(tmp_path):
+    """Test that pack snippets carry the same hash as compute_file_hash."""
+    write(tmp_path / 'win.py', b'x = 1\r\n')
+
+    pack = ContextPack.build_from_paths(tmp_path, ['win.py', 'gone.py'], hasher=FileHasher())
+
+    assert [s.path for s in pack.snippets] == ['win.py']
+    assert pack.snippets[0].hash == compute_file_hash(tmp_path / 'win.py')
+
+
+def test_unreadable_files_report_why(tmp_path, capsys):
+    """Test that the OSError behind a missing hash is returned and printed."""
+    result = FileHasher().hash_many_with_stats([tmp_path / 'gone.py'])[0]
+    assert result.digest is None and isinstance(result.error, FileNotFoundError)
+
+    ContextPack.build_from_paths(tmp_path, ['gone.py'], hasher=FileHasher())
+    assert 'Could not read gone.py: [Errno 2]' in capsys.readouterr().out
@@ -0,0 +1,103 @@
+"""Tests for the Python import graph."""
+
+import os
+import pytest
+from pathlib import Path
+from src.ctx_ui.context import imports as imports_module
+from src.ctx_ui.context.changes import ChangeBatch
+from src.ctx_ui.context.file_index import FileIndex
+from src.ctx_ui.context.imports import ImportGraph, RawImport, parse_imports
+from src.ctx_ui.context.live_index import LiveIndex
+
+FILES = {
+    'src/app/__init__.py': '',
+    'src/app/config.py': 'import os\n',
+    'src/app/context/__init__.py': '',
+    'src/app/context/indexer.py': 'from ..config import Settings\n',
+    'src/app/ui/__init__.py': '',
+    'src/app/ui/views/__init__.py': '',
+    'src/app/ui/views/main_view.py': (
+        'from nicegui import ui\n'
+        'from ...context.indexer import scan\n'
+        'from ..layout import (\n    header,  # comment\n    footer,\n)\n'
+    ),
+    'src/app/ui/layout.py': '"""Layout."""\nfrom app import config\n',
+    'scripts/run.py': 'import helpers\nimport app.ui.layout\n',
+    'scripts/helpers.py': '',
+}
+
+
+@pytest.fixture
+def live(tmp_path):
+    past = 1_000_000_000
+    for rel, text in FILES.items():
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text(text)
+        os.utime(tmp_path / rel, (past, past))
+    index = LiveIndex(FileIndex(tmp_path, ['*.py'], []))
+    index.rescan()
+    return index
+
+
+def test_parse_imports():
+    """Test relative, multi-line, aliased and continued import statements."""
+    source = 'from a import (b,  # c\n  c as d)\nimport x.y as z, w\nfrom ...m import n, \\\n  o\n    import inner\n'
+
+    assert parse_imports(source) == [
+        RawImport(0, 'a', ('b', 'c')),
+        RawImport(0, 'x.y'),
+        RawImport(0, 'w'),
+        RawImport(3, 'm', ('n', 'o')),
+        RawImport(0, 'inner'),
+    ]
+
+
+def test_imports_resolve_to_repo_files(live):
+    """Test relative imports, package roots such as src, script directories and submodules."""
+    graph = ImportGraph.from_live_index(live)
+
+    assert graph.imports('src/app/ui/views/main_view.py') == [Path('src/app/context/indexer.py'), Path('src/app/ui/layout.py')]
+    assert graph.imports('src/app/ui/layout.py') == [Path('src/app/config.py')]
+    assert graph.imports('scripts/run.py') == [Path('scripts/helpers.py'), Path('src/app/ui/layout.py')]
+    assert graph.imports('src/app/config.py') == []
+
+
+def test_dependencies_follow_hops_nearest_first(live):
+    """Test that each hop adds the next ring of imports, without the starting files."""
+    graph = ImportGraph.from_live_index(live)
+    start = ['src/app/ui/views/main_view.py']
+
+    assert graph.dependencies(start) == [Path('src/app/context/indexer.py'), Path('src/app/ui/layout.py')]
+    assert graph.dependencies(start, hops=3) == [
+        Path('src/app/context/indexer.py'), Path('src/app/ui/layout.py'), Path('src/app/config.py'),
+    ]
+    assert graph.dependencies(start + ['src/app/config.py'], hops=2) == graph.dependencies(start, hops=1)
+
+
+def test_watcher_events_update_edges_incrementally(live, monkeypatch):
+    """Test edits, new and deleted modules, with unchanged content parsed once."""
+    graph = ImportGraph.from_live_index(live)
+    root = live.file_index.root
+    parses = []
+    parse = imports_module.parse_imports
+    monkeypatch.setattr(imports_module, 'parse_imports', lambda s: parses.append(s) or parse(s))
+
+    graph.apply_batch(ChangeBatch([('src/app/config.py', 'modified')]))
+    assert parses == []
+
+    (root / 'src/app/config.py').write_text('from .context import indexer\n')
+    graph.apply_batch(ChangeBatch([('src/app/config.py', 'modified')]))
+    assert graph.imports('src/app/config.py') == [Path('src/app/context/indexer.py')]
+
+    # A new module the layout was already importing by name
+    (root / 'src/app/ui/layout.py').write_text('from . import widgets\n')
+    graph.apply_batch(ChangeBatch([('src/app/ui/layout.py', 'modified')]))
+    assert graph.imports('src/app/ui/layout.py') == [Path('src/app/ui/__init__.py')]
+    (root / 'src/app/ui/widgets.py').write_text('')
+    live.apply('created', 'src/app/ui/widgets.py')
+    assert graph.imports('src/app/ui/layout.py') == [Path('src/app/ui/widgets.py')]
+
+    (root / 'src/app/context/indexer.py').unlink()
+    live.apply('deleted', 'src/app/context/indexer.py')
+    assert graph.imports('src/app/ui/views/main_view.py') == [Path('src/app/ui/layout.py')]
+    assert graph.imports('src/app/context/indexer.py') == []
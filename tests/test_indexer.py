@@ -45,3 +45,71 @@ def test_exclude_patterns(tmp_path):
     
     assert not any('.git' in str(f) for f in files)
     assert any('main.py' in str(f) for f in files)
+
+
+def test_excluded_directories_are_never_visited(tmp_path, monkeypatch):
+    """Test that directory-level excludes prune the walk instead of filtering."""
+    import os
+    (tmp_path / 'src').mkdir()
+    (tmp_path / 'src' / 'main.py').write_text('# main')
+    (tmp_path / 'node_modules' / 'pkg' / 'deep').mkdir(parents=True)
+    (tmp_path / 'node_modules' / 'pkg' / 'deep' / 'index.py').write_text('# dep')
+    (tmp_path / 'build').mkdir()
+    (tmp_path / 'build' / 'out.py').write_text('# out')
+
+    visited = []
+    real_scandir = os.scandir
+
+    def recording_scandir(path):
+        visited.append(Path(path))
+        return real_scandir(path)
+
+    monkeypatch.setattr(os, 'scandir', recording_scandir)
+
+    files = list_repo_files(
+        tmp_path,
+        include=['*.py'],
+        exclude=['node_modules/**', 'build/**']
+    )
+
+    assert files == [Path('src/main.py')]
+    assert tmp_path / 'src' in visited
+    assert not any('node_modules' in p.parts or 'build' in p.parts for p in visited)
+
+
+def test_walker_matches_rglob(tmp_path):
+    """Test that the pruning walker returns the same paths as rglob filtering."""
+    import fnmatch
+    for rel in ['a.py', 'pkg/b.py', 'pkg/c.pyc', 'pkg/sub/d.md', 'dist/e.py', 'x/dist/f.py']:
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text('x')
+    include = ['*.py', '*.md']
+    exclude = ['dist/**', '*.pyc']
+
+    expected = sorted(
+        p.relative_to(tmp_path) for p in tmp_path.rglob('*')
+        if p.is_file()
+        and not any(fnmatch.fnmatch(str(p.relative_to(tmp_path)), ex) for ex in exclude)
+        and any(fnmatch.fnmatch(str(p.relative_to(tmp_path)), inc) for inc in include)
+    )
+
+    assert list_repo_files(tmp_path, include, exclude) == expected
+
+
+def test_parallel_scan_matches_serial(tmp_path):
+    """Test that the threaded walker returns the same sorted paths."""
+    for i in range(6):
+        for j in range(4):
+            d = tmp_path / f'pkg{i}' / f'sub{j}' / 'deep'
+            d.mkdir(parents=True)
+            (d / f'm{i}{j}.py').write_text('x')
+            (d.parent / 'notes.md').write_text('x')
+    (tmp_path / 'node_modules' / 'x').mkdir(parents=True)
+    (tmp_path / 'node_modules' / 'x' / 'y.py').write_text('x')
+
+    include, exclude = ['*.py', '*.md'], ['node_modules/**']
+    serial = list_repo_files(tmp_path, include, exclude)
+    parallel = list_repo_files(tmp_path, include, exclude, workers=4)
+
+    assert parallel == serial
+    assert len(serial) == 48
@@ -0,0 +1,115 @@
+"""Tests for the live in-memory file index."""
+
+import pytest
+from pathlib import Path
+from src.ctx_ui.context.file_index import FileIndex
+from src.ctx_ui.context.indexer import list_repo_files
+from src.ctx_ui.context.live_index import LiveIndex
+
+INCLUDE = ['*.py']
+EXCLUDE = ['node_modules/**']
+
+
+@pytest.fixture
+def repo(tmp_path):
+    for rel in ['main.py', 'src/app.py', 'src/util/helpers.py', 'README.md']:
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_text('x')
+    return tmp_path
+
+
+@pytest.fixture
+def live(repo):
+    index = LiveIndex(FileIndex(repo, INCLUDE, EXCLUDE))
+    index.rescan()
+    return index
+
+
+def test_events_keep_index_equal_to_full_scan(repo, live):
+    """Test that applied events produce the same list as a rescan."""
+    deltas = []
+    live.subscribe(lambda added, removed: deltas.append((added, removed)))
+
+    (repo / 'src' / 'new.py').write_text('x')
+    live.apply('created', 'src/new.py')
+    (repo / 'main.py').rename(repo / 'src' / 'main.py')
+    live.apply('moved', 'main.py', dest='src/main.py')
+    (repo / 'notes.md').write_text('x')
+    live.apply('created', 'notes.md')
+
+    assert live.files() == list_repo_files(repo, INCLUDE, EXCLUDE)
+    assert deltas == [
+        ([Path('src/new.py')], []),
+        ([Path('src/main.py')], [Path('main.py')]),
+    ]
+
+
+def test_directory_events_update_whole_subtrees(repo, live):
+    """Test that directory creation and deletion touch every path below."""
+    (repo / 'pkg' / 'sub').mkdir(parents=True)
+    (repo / 'pkg' / 'sub' / 'a.py').write_text('x')
+    (repo / 'pkg' / 'b.py').write_text('x')
+    live.apply('created', 'pkg')
+    assert Path('pkg/sub/a.py') in live and Path('pkg/b.py') in live
+
+    live.apply('deleted', 'src')
+    assert [str(p) for p in live.files()] == ['main.py', 'pkg/b.py', 'pkg/sub/a.py']
+
+
+def test_overflow_falls_back_to_rescan(repo, live):
+    """Test that only an overflow event triggers a full rescan."""
+    (repo / 'untracked.py').write_text('x')
+    live.apply('modified', 'main.py')
+    assert Path('untracked.py') not in live
+
+    live.apply('overflow', '')
+    assert Path('untracked.py') in live
+    assert live.files() == list_repo_files(repo, INCLUDE, EXCLUDE)
+
+
+def test_subscribe_with_replay_starts_from_the_current_files(repo, live):
+    """Test that a replaying listener sees the indexed files, then later deltas."""
+    deltas = []
+    live.subscribe(lambda added, removed: deltas.append((added, removed)), replay=True)
+
+    assert deltas == [(live.files(), [])]
+    (repo / 'a.py').write_text('x')
+    live.apply('created', 'a.py')
+    assert deltas[1] == ([Path('a.py')], [])
+
+
+def test_apply_batch_notifies_once(repo, live):
+    """Test that a coalesced batch produces a single net delta."""
+    from src.ctx_ui.context.changes import ChangeBatch
+    deltas = []
+    live.subscribe(lambda added, removed: deltas.append((added, removed)))
+
+    (repo / 'a.py').write_text('x')
+    (repo / 'b.py').write_text('x')
+    (repo / 'main.py').unlink()
+    live.apply_batch(ChangeBatch([('a.py', 'created'), ('b.py', 'created'), ('main.py', 'deleted')]))
+
+    assert deltas == [([Path('a.py'), Path('b.py')], [Path('main.py')])]
+
+
+def test_directory_replaced_within_one_batch(repo, live):
+    """Test that ``rm -rf build; mv staging build`` in one window ends with the new tree."""
+    import shutil
+    from src.ctx_ui.watcher.batcher import ChangeBatcher
+    (repo / 'build').mkdir()
+    (repo / 'build' / 'old.py').write_text('x')
+    live.rescan()
+    (repo / 'staging').mkdir()
+    (repo / 'staging' / 'new.py').write_text('x')
+    live.rescan()
+    batcher = ChangeBatcher(on_batch=live.apply_batch)
+
+    shutil.rmtree(repo / 'build')
+    batcher.add('build/old.py', 'deleted')
+    batcher.add('build', 'deleted')
+    (repo / 'staging').rename(repo / 'build')
+    batcher.add_move('staging', 'build')
+    batcher.flush()
+
+    assert Path('build/new.py') in live and Path('build/old.py') not in live
+    assert live.files() == list_repo_files(repo, INCLUDE, EXCLUDE)
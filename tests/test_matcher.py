@@ -0,0 +1,65 @@
+"""Tests for compiled path matching."""
+
+import pytest
+from pathlib import Path
+from src.ctx_ui.context.matcher import PathMatcher, PathFilter
+from src.ctx_ui.reflection.checks import ScopeGuard
+
+
+@pytest.mark.parametrize('pattern,path,expected', [
+    ('*.py', 'main.py', True),
+    ('*.py', 'src/pkg/main.py', True),
+    ('*.py', 'main.pyc', False),
+    ('node_modules/**', 'node_modules/lib/index.js', True),
+    ('node_modules/**', 'web/node_modules/lib.js', False),
+    ('**/node_modules/**', 'web/node_modules/lib.js', True),
+    ('src/*.py', 'src/pkg/main.py', False),
+    ('src/**/*.py', 'src/main.py', True),
+    ('src/**/*.py', 'src/pkg/sub/main.py', True),
+    ('/README.md', 'docs/README.md', False),
+    ('build/', 'build/out.js', True),
+    ('build/', 'pkg/build/x', True),
+    ('/build/', 'pkg/build/x', False),
+    ('file[0-9].txt', 'file7.txt', True),
+    ('file[!0-9].txt', 'file7.txt', False),
+])
+def test_glob_semantics(pattern, path, expected):
+    """Test that patterns use gitignore-style `**` semantics."""
+    assert PathMatcher([pattern]).match(path) is expected
+
+
+def test_trailing_slash_dir_pattern_matches_at_any_depth():
+    """Test that `build/` prunes nested build directories too."""
+    matcher = PathMatcher(['build/'])
+    assert matcher.matches_dir('build')
+    assert matcher.matches_dir('pkg/build')
+    assert not matcher.matches_dir('pkg/builder')
+
+
+def test_first_match_reports_pattern():
+    """Test that the matching pattern is identified in a single pass."""
+    matcher = PathMatcher(['*.md', '**/.git/**', '*.py'])
+    assert matcher.first_match('pkg/.git/config') == '**/.git/**'
+    assert matcher.first_match('pkg/main.py') == '*.py'
+    assert matcher.first_match('pkg/main.rs') is None
+
+
+def test_prunes_whole_tree_excludes_only():
+    """Test that only whole-tree excludes prune directories."""
+    path_filter = PathFilter(['*.py'], ['node_modules/**', 'build/*', '*.pyc'])
+    assert path_filter.prunes_dir('node_modules')
+    assert path_filter.prunes_dir(Path('node_modules'))
+    assert not path_filter.prunes_dir('build')
+    assert not path_filter.prunes_dir('src')
+    assert path_filter.is_included('src/main.py')
+    assert not path_filter.is_included('src/main.pyc')
+
+
+def test_scope_guard_uses_globstar():
+    """Test that ScopeGuard anchors `src/**` at the root."""
+    guard = ScopeGuard(allowed_paths=['src/**'], excluded_paths=['**/__pycache__/**'])
+    assert guard.check_file('src/pkg/deep/main.py')[0]
+    assert not guard.check_file('lib/src/main.py')[0]
+    ok, reason = guard.check_file('src/__pycache__/main.pyc')
+    assert not ok
+    assert '**/__pycache__/**' in reason
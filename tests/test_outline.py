@@ -0,0 +1,116 @@
+"""Tests for outlines of oversized source files."""
+
+from src.ctx_ui.context import symbols as symbols_module
+from src.ctx_ui.context.outline import outline_python
+from src.ctx_ui.context.symbols import SymbolIndex
+from src.ctx_ui.prompts.generators import generate_chatgpt_prompt_text
+
+SOURCE = '''"""Module docstring."""
+import os
+from typing import List
+
+CONSTANT = compute_constant()
+registry = {}
+
+
+class Model(Base):
+    """A model."""
+    name: str = ''
+    tags: List[str] = []
+
+    def save(self, path: str) -> None:
+        """Save it."""
+        data = self.dump()
+        path.write(data)
+
+    def load(self):
+        return 1
+
+
+@cache
+def helper(
+    value: int,
+) -> int:
+    total = value * 2
+    return total
+
+
+if os.name == 'nt':
+    def windows_only():
+        pass
+    FLAG = True
+'''
+
+
+def test_outline_keeps_signatures_docstrings_and_imports():
+    """Test which lines survive and that bodies and top-level code collapse."""
+    assert outline_python(SOURCE) == '''"""Module docstring."""
+import os
+from typing import List
+
+...
+
+
+class Model(Base):
+    """A model."""
+    name: str = ''
+    tags: List[str] = []
+
+    def save(self, path: str) -> None:
+        """Save it."""
+        ...
+
+    def load(self):
+        ...
+
+
+@cache
+def helper(
+    value: int,
+) -> int:
+    ...
+
+
+if os.name == 'nt':
+    def windows_only():
+        ...
+    ...
+'''
+
+
+def test_pinned_bodies_are_kept():
+    """Test that pinned methods and functions keep their full body."""
+    outline = outline_python(SOURCE, pinned={'Model.save', 'helper'})
+
+    assert 'path.write(data)' in outline and 'return total' in outline
+    assert 'return 1' not in outline
+    assert outline_python('def broken(:\n') is None
+
+
+def test_large_files_are_outlined_once(tmp_path, monkeypatch):
+    """Test the outline block, its content-hash cache and small files left alone."""
+    body = ''.join(f'    x{i} = {i}\n' for i in range(900))
+    (tmp_path / 'big.py').write_text(f'import os\n\n\ndef big():\n    """Docs."""\n{body}')
+    (tmp_path / 'small.py').write_text('def f():\n    return 1\n')
+    calls = []
+    outline_source = symbols_module.outline_source
+    monkeypatch.setattr(symbols_module, 'outline_source', lambda *a: calls.append(a) or outline_source(*a))
+    index = SymbolIndex()
+
+    prompt = generate_chatgpt_prompt_text('q', {'big.py', 'small.py'}, tmp_path, symbol_index=index, outline_large_files=True)
+    again = generate_chatgpt_prompt_text('q', {'big.py'}, tmp_path, symbol_index=index, outline_large_files=True)
+
+    assert '`big.py` (906 lines, ' in prompt and 'OUTLINE: bodies collapsed to `...`' in prompt
+    assert '```py\nimport os\n\n\ndef big():\n    """Docs."""\n    ...\n\n```' in prompt
+    assert 'return 1' in prompt
+    assert 'big.py' in again and len(calls) == 1
+
+
+def test_pinned_files_are_outlined_whatever_their_size(tmp_path):
+    """Test that pinning outlines even a small file."""
+    (tmp_path / 'm.py').write_text(SOURCE)
+
+    prompt = generate_chatgpt_prompt_text('q', {'m.py'}, tmp_path, pinned_symbols={'m.py': ['helper']})
+
+    assert 'full bodies of `helper`' in prompt
+    assert 'return total' in prompt and 'path.write(data)' not in prompt
@@ -0,0 +1,73 @@
+"""Tests for the server-side prompt store."""
+
+import pytest
+from src.ctx_ui.prompts.generators import generate_chatgpt_prompt_text, iter_chatgpt_prompt
+from src.ctx_ui.prompts.store import PromptStore, iter_file
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = PromptStore(tmp_path / 'prompts', max_prompts=2, preview_chars=10)
+    yield store
+    store.close()
+
+
+def test_prompts_are_streamed_to_disk_with_a_preview(store, tmp_path):
+    """Test that the stored bytes match the prompt and only a preview stays in memory."""
+    (tmp_path / 'a.py').write_text('print("héllo")\n' * 100)
+
+    record = store.create(iter_chatgpt_prompt('q', {'a.py'}, tmp_path), kind='ChatGPT')
+
+    text = generate_chatgpt_prompt_text('q', {'a.py'}, tmp_path)
+    assert b''.join(store.iter_bytes(record.prompt_id, chunk_size=7)) == text.encode('utf-8')
+    assert record.size == len(text)
+    assert record.preview == text[:10] and record.truncated
+    assert store.get(record.prompt_id) == record
+
+
+def test_oldest_prompts_are_evicted(store):
+    """Test that prompts beyond max_prompts are forgotten and their files removed."""
+    first, second, third = (store.create([f'prompt {i}']) for i in range(3))
+
+    assert store.get(first.prompt_id) is None
+    assert not first.path.exists()
+    assert store.get(second.prompt_id) and store.get(third.prompt_id)
+    assert not third.truncated
+    with pytest.raises(KeyError):
+        next(store.iter_bytes(first.prompt_id))
+
+
+def test_failed_prompt_leaves_no_file(store):
+    """Test that a generator failing partway through does not leak its file."""
+    def failing():
+        yield 'partial prompt'
+        raise OSError('unreadable file')
+
+    with pytest.raises(OSError):
+        store.create(failing())
+
+    assert list(store.directory.iterdir()) == []
+
+
+def test_open_prompt_streams_in_full_after_eviction(store):
+    """Test that a prompt opened before its eviction is still served whole."""
+    record = store.create(['x' * 100_000])
+    f = open(record.path, 'rb')
+
+    store.create(['a'])
+    store.create(['b'])
+
+    assert store.get(record.prompt_id) is None
+    assert b''.join(iter_file(f, chunk_size=4096)) == b'x' * 100_000
+    assert f.closed
+
+
+def test_close_removes_a_temporary_directory():
+    """Test that a store without a directory cleans up after itself."""
+    store = PromptStore()
+    record = store.create(['x'])
+
+    store.close()
+
+    assert not record.path.exists()
+    assert not store.directory.exists()
@@ -0,0 +1,55 @@
+"""Tests for the trigram file search index."""
+
+from pathlib import Path
+from src.ctx_ui.context.file_index import FileIndex
+from src.ctx_ui.context.live_index import LiveIndex
+from src.ctx_ui.context.search import PathSearchIndex
+
+PATHS = [
+    'src/ctx_ui/ui/views/main_view.py',
+    'src/ctx_ui/ui/layout.py',
+    'src/ctx_ui/context/indexer.py',
+    'tests/test_indexer.py',
+    'README.md',
+]
+
+
+def make_index():
+    return PathSearchIndex(Path(p) for p in PATHS)
+
+
+def test_substring_matches_rank_file_names_first():
+    """Test that hits in the file name outrank hits in directories."""
+    results = make_index().search('indexer')
+
+    assert results[:2] == [Path('src/ctx_ui/context/indexer.py'), Path('tests/test_indexer.py')]
+
+
+def test_all_tokens_must_match():
+    """Test that whitespace-separated tokens are combined."""
+    assert make_index().search('tests indexer') == [Path('tests/test_indexer.py')]
+
+
+def test_fuzzy_fallback_tolerates_missing_separators():
+    """Test that trigram similarity finds paths without an exact substring."""
+    assert make_index().search('mainview')[0] == Path('src/ctx_ui/ui/views/main_view.py')
+
+
+def test_short_queries_match_file_name_prefixes():
+    """Test that one- and two-character queries match names, not directories."""
+    assert make_index().search('la') == [Path('src/ctx_ui/ui/layout.py')]
+
+
+def test_follows_live_index(tmp_path):
+    """Test that index deltas are applied incrementally."""
+    (tmp_path / 'old_name.py').write_text('x')
+    live = LiveIndex(FileIndex(tmp_path, ['*.py'], []))
+    live.rescan()
+    search = PathSearchIndex.from_live_index(live)
+
+    (tmp_path / 'old_name.py').rename(tmp_path / 'new_name.py')
+    live.apply('moved', 'old_name.py', 'new_name.py')
+
+    assert search.search('new_name') == [Path('new_name.py')]
+    assert Path('old_name.py') not in search.search('old_name')
+    assert len(search) == 1
@@ -0,0 +1,136 @@
+"""Tests for symbol extraction and symbol-level prompt snippets."""
+
+import os
+import pytest
+from src.ctx_ui.context import symbols as symbols_module
+from src.ctx_ui.context.symbols import Symbol, SymbolIndex, extract_python_symbols, extract_tree_sitter_symbols, merge_ranges
+from src.ctx_ui.context.syntax import tree_sitter_parser
+from src.ctx_ui.models.context_pack import ContextPack
+from src.ctx_ui.prompts.generators import generate_chatgpt_prompt_text, generate_copilot_prompt_text
+
+SOURCE = '''import os
+
+
+def helper(x):
+    def inner():
+        return x
+    return inner
+
+
+@decorator
+class Service:
+    """Does things."""
+
+    def run(self):
+        token = "abcdefghijklmnopqrstuvwxyz123456"
+        return helper(1)
+
+    async def stop(self):
+        pass
+
+
+if os.name == 'nt':
+    def windows_only():
+        pass
+'''
+
+
+@pytest.fixture
+def repo(tmp_path):
+    (tmp_path / 'service.py').write_text(SOURCE)
+    past = 1_000_000_000
+    os.utime(tmp_path / 'service.py', (past, past))
+    return tmp_path
+
+
+def test_extracts_functions_classes_and_methods():
+    """Test names, kinds and line ranges, with decorators and without nested functions."""
+    assert extract_python_symbols(SOURCE) == [
+        Symbol('helper', 'function', 4, 7),
+        Symbol('Service', 'class', 10, 19),
+        Symbol('Service.run', 'method', 14, 16),
+        Symbol('Service.stop', 'method', 18, 19),
+        Symbol('windows_only', 'function', 23, 24),
+    ]
+    assert extract_python_symbols('def broken(:\n') == []
+
+
+C_SOURCE = b'''static int add(int a, int b) {
+    return a + b;
+}
+
+char *name(void) {
+    return "x";
+}
+'''
+
+
+def test_c_functions_are_named_by_their_declarator():
+    """Test that C functions are not named after their return type."""
+    if tree_sitter_parser('c') is None:
+        pytest.skip('no tree-sitter grammar package installed')
+    assert extract_tree_sitter_symbols(C_SOURCE, 'c') == [
+        Symbol('add', 'function', 1, 3),
+        Symbol('name', 'function', 5, 7),
+    ]
+
+
+def test_rust_impl_blocks_are_named_by_their_type():
+    """Test the ``type`` fallback for Rust ``impl`` blocks."""
+    if tree_sitter_parser('rust') is None:
+        pytest.skip('no tree-sitter grammar package installed')
+    source = b'struct Point;\n\nimpl Point {\n    fn origin() -> Point {\n        Point\n    }\n}\n'
+    assert [s.name for s in extract_tree_sitter_symbols(source, 'rust')] == ['Point', 'Point', 'Point.origin']
+
+
+def test_parse_results_are_cached_by_content(repo, monkeypatch):
+    """Test that unchanged files, and copies with the same content, are parsed once."""
+    parses = []
+    extract = symbols_module.extract_symbols
+    monkeypatch.setattr(symbols_module, 'extract_symbols', lambda *a: parses.append(a) or extract(*a))
+    (repo / 'copy.py').write_text(SOURCE)
+    index = SymbolIndex()
+
+    first = index.symbols(repo / 'service.py')
+    assert index.symbols(repo / 'service.py') == first
+    assert index.symbols(repo / 'copy.py') == first
+    assert len(parses) == 1
+
+    (repo / 'service.py').write_text('def changed():\n    pass\n')
+    assert index.symbols(repo / 'service.py') == [Symbol('changed', 'function', 1, 2)]
+    assert len(parses) == 2
+
+
+def test_merge_ranges():
+    """Test that nested and adjacent ranges collapse."""
+    assert merge_ranges([Symbol('a', 'class', 10, 19), Symbol('b', 'method', 14, 16), Symbol('c', 'function', 20, 22)]) == [(10, 22)]
+    assert merge_ranges([Symbol('b', 'function', 5, 6), Symbol('a', 'function', 1, 2)]) == [(1, 2), (5, 6)]
+
+
+def test_prompts_embed_only_selected_symbols(repo):
+    """Test that only the selected ranges are embedded, redacted, with omissions marked."""
+    selection = {'service.py': ['Service.run', 'missing']}
+
+    prompt = generate_chatgpt_prompt_text('q', {'service.py'}, repo, selected_symbols=selection)
+
+    assert 'SYMBOLS: `Service.run` (lines 14-16)' in prompt
+    assert '--- OMITTED lines 1-13 ---' in prompt and '--- OMITTED lines 17-25 ---' in prompt
+    assert 'def run(self):' in prompt and '[REDACTED]' in prompt
+    assert 'def helper' not in prompt
+    assert '- `service.py` (symbols: `Service.run`, `missing`)' in generate_copilot_prompt_text('q', {'service.py'}, selected_symbols=selection)
+
+    # Unknown names fall back to the whole file
+    whole = generate_chatgpt_prompt_text('q', {'service.py'}, repo, selected_symbols={'service.py': ['gone']})
+    assert whole == generate_chatgpt_prompt_text('q', {'service.py'}, repo)
+
+
+def test_context_pack_snippets_carry_symbol_ranges(repo):
+    """Test that symbol snippets fill in start, end and the symbol name."""
+    index = SymbolIndex()
+    run = [s for s in index.symbols(repo / 'service.py') if s.name == 'Service.run']
+
+    pack = ContextPack.build_from_symbols(repo, {'service.py': run})
+
+    snippet = pack.snippets[0]
+    assert (snippet.path, snippet.start, snippet.end, snippet.why) == ('service.py', 14, 16, 'Service.run')
+    assert snippet.hash.startswith('sha256:')